@@ -0,0 +1,23 @@
+from fastapi import APIRouter, HTTPException, Request
+from app.models.blob_models import ManifestRequest, ManifestResponse, BlobUploadResponse
+from app.service.blob_store import blob_store, SHA256_PATTERN
+
+blob_gateway_router = APIRouter()
+
+# Phase one: the client lists its files by hash and gets back the ones to upload
+@blob_gateway_router.post("/manifest", response_model=ManifestResponse)
+async def blob_manifest(request: ManifestRequest):
+    return {"missing": blob_store.missing(request.files.values()), "success": True}
+
+# Phase two: one raw (optionally gzip-encoded) file body per missing hash
+@blob_gateway_router.put("/{sha256}", response_model=BlobUploadResponse)
+async def upload_blob(sha256: str, req: Request):
+    if not SHA256_PATTERN.match(sha256):
+        raise HTTPException(status_code=400, detail="Expected a lowercase hex SHA-256")
+    data = await req.body()
+    blob_store.put(sha256, data)
+    return {"sha256": sha256, "size": len(data), "success": True}
+
+@blob_gateway_router.get("/stats")
+async def blob_stats():
+    return blob_store.stats()
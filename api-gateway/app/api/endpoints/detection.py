@@ -1,5 +1,7 @@
 import httpx
-from fastapi import APIRouter, HTTPException
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from app.models.detection_models import (
     DeadClassRequest,
     DeadClassResponse,
@@ -18,16 +20,77 @@ from app.models.detection_models import (
     LongParameterListResponse,
     UnusedVariablesResponse, 
     InconsistentNamingResponse,
-    DuplicateCodeResponse
+    DuplicateCodeRequest,
+    DuplicateCodeResponse,
+    StructuralCloneRequest,
+    StructuralCloneResponse,
+    AnalyzeAllRequest,
+    AnalyzeAllResponse,
+    BatchAnalyzeRequest,
+    IncrementalAnalysisRequest,
+    IncrementalAnalysisResponse
 )
 
 from app.service.endpoints_url import DETECTION_SERVICE_URL
+from app.service.source_upload import source_body
+from app.service.blob_store import blob_store
 
 detecton_gateway_router = APIRouter()
 
+# Route for running every detector over one parse of the file
+@detecton_gateway_router.post("/analyze-all", response_model=AnalyzeAllResponse)
+async def gateway_analyze_all(request: AnalyzeAllRequest = Depends(source_body(AnalyzeAllRequest))):
+    async with httpx.AsyncClient(timeout=60.0) as client:
+        response = await client.post(f"{DETECTION_SERVICE_URL}/analyze-all", json=request.model_dump())
+    if response.status_code != 200:
+        raise HTTPException(status_code=response.status_code, detail=response.text)
+    return response.json()
+
+# Route for re-running the per-definition detectors on only the edited definitions
+@detecton_gateway_router.post("/analyze-incremental", response_model=IncrementalAnalysisResponse)
+async def gateway_analyze_incremental(request: IncrementalAnalysisRequest = Depends(source_body(IncrementalAnalysisRequest))):
+    async with httpx.AsyncClient(timeout=60.0) as client:
+        response = await client.post(f"{DETECTION_SERVICE_URL}/analyze-incremental", json=request.model_dump())
+    if response.status_code != 200:
+        raise HTTPException(status_code=response.status_code, detail=response.text)
+    return response.json()
+
+# Route for analysing many files at once; relays one NDJSON line per file as it finishes
+@detecton_gateway_router.post("/batch-analyze")
+async def gateway_batch_analyze(request: BatchAnalyzeRequest):
+    # Files listed by hash are read from the blob store; 409 lists any to upload first
+    payload = request.model_dump(exclude={"manifest"})
+    payload["files"] = {**blob_store.resolve(request.manifest), **request.files}
+    client = httpx.AsyncClient(timeout=120.0)
+    try:
+        upstream = await client.send(
+            client.build_request("POST", f"{DETECTION_SERVICE_URL}/batch-analyze", json=payload),
+            stream=True
+        )
+    except BaseException:
+        # Nothing will relay the stream, so nothing else would close the client
+        await client.aclose()
+        raise
+    if upstream.status_code != 200:
+        detail = (await upstream.aread()).decode()
+        await upstream.aclose()
+        await client.aclose()
+        raise HTTPException(status_code=upstream.status_code, detail=detail)
+
+    async def relay():
+        try:
+            async for line in upstream.aiter_lines():
+                if line:
+                    yield line + "\n"
+        finally:
+            await upstream.aclose()
+            await client.aclose()
+
+    return StreamingResponse(relay(), media_type="application/x-ndjson")
+
 # Route for overly complex conditionals detection
 @detecton_gateway_router.post("/overly-complex-conditionals", response_model=ComplexConditonalResponse)
-async def gateway_overly_complex_conditionals(request: AnalysisRequest):
+async def gateway_overly_complex_conditionals(request: AnalysisRequest = Depends(source_body(AnalysisRequest))):
     async with httpx.AsyncClient(timeout=30.0) as client:
         response = await client.post(f"{DETECTION_SERVICE_URL}/overly-complex-conditionals", json=request.model_dump())
     if response.status_code != 200:
@@ -36,7 +99,7 @@ async def gateway_overly_complex_conditionals(request: AnalysisRequest):
 
 # Route for unreachable code detection
 @detecton_gateway_router.post("/unreachable-code", response_model=UnreachableResponse)
-async def gateway_unreachable_code(request: AnalysisRequest):
+async def gateway_unreachable_code(request: AnalysisRequest = Depends(source_body(AnalysisRequest))):
     async with httpx.AsyncClient(timeout=30.0) as client:
         response = await client.post(f"{DETECTION_SERVICE_URL}/unreachable-code", json=request.model_dump())
     if response.status_code != 200:
@@ -45,25 +108,46 @@ async def gateway_unreachable_code(request: AnalysisRequest):
 
 # Route for temporary field detection
 @detecton_gateway_router.post("/temporary-field", response_model=TemporaryVariableResponse)
-async def gateway_temporary_field(request: AnalysisRequest):
+async def gateway_temporary_field(request: AnalysisRequest = Depends(source_body(AnalysisRequest))):
     async with httpx.AsyncClient(timeout=30.0) as client:
         response = await client.post(f"{DETECTION_SERVICE_URL}/temporary-field", json=request.model_dump())
     if response.status_code != 200:
         raise HTTPException(status_code=response.status_code, detail=response.text)
     return response.json()
 
-# Route for AST analysis
+# Route for AST analysis; the tree is relayed as the service streams it
 @detecton_gateway_router.post("/analyze-ast", response_model=CodeResponse)
-async def gateway_analyze_ast(request: CodeRequest):
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        response = await client.post(f"{DETECTION_SERVICE_URL}/analyze-ast", json=request.model_dump())
-    if response.status_code != 200:
-        raise HTTPException(status_code=response.status_code, detail=response.text)
-    return response.json()
+async def gateway_analyze_ast(request: CodeRequest = Depends(source_body(CodeRequest)), fields: Optional[str] = None):
+    client = httpx.AsyncClient(timeout=30.0)
+    params = {"fields": fields} if fields is not None else None
+    try:
+        upstream = await client.send(
+            client.build_request("POST", f"{DETECTION_SERVICE_URL}/analyze-ast", json=request.model_dump(), params=params),
+            stream=True
+        )
+    except BaseException:
+        # Nothing will relay the stream, so nothing else would close the client
+        await client.aclose()
+        raise
+    if upstream.status_code != 200:
+        detail = (await upstream.aread()).decode()
+        await upstream.aclose()
+        await client.aclose()
+        raise HTTPException(status_code=upstream.status_code, detail=detail)
+
+    async def relay():
+        try:
+            async for chunk in upstream.aiter_bytes():
+                yield chunk
+        finally:
+            await upstream.aclose()
+            await client.aclose()
+
+    return StreamingResponse(relay(), media_type="application/json")
 
 # Route for dead code detection
 @detecton_gateway_router.post("/dead-code", response_model=DeadCodeResponse)
-async def gateway_dead_code(request: DeadCodeRequest):
+async def gateway_dead_code(request: DeadCodeRequest = Depends(source_body(DeadCodeRequest))):
     async with httpx.AsyncClient(timeout=30.0) as client:
         response = await client.post(f"{DETECTION_SERVICE_URL}/dead-code", json=request.model_dump())
     if response.status_code != 200:
@@ -72,7 +156,7 @@ async def gateway_dead_code(request: DeadCodeRequest):
 
 # Route for dead class detection
 @detecton_gateway_router.post("/dead-class", response_model=DeadClassResponse)
-async def gateway_dead_class(request: DeadClassRequest):
+async def gateway_dead_class(request: DeadClassRequest = Depends(source_body(DeadClassRequest))):
     async with httpx.AsyncClient(timeout=30.0) as client:
         response = await client.post(f"{DETECTION_SERVICE_URL}/dead-class", json=request.model_dump())
     if response.status_code != 200:
@@ -81,7 +165,7 @@ async def gateway_dead_class(request: DeadClassRequest):
 
 # Route for magic numbers detection
 @detecton_gateway_router.post("/magic-numbers", response_model=MagicNumbersResponse)
-async def gateway_magic_numbers(request: AnalysisRequest):
+async def gateway_magic_numbers(request: AnalysisRequest = Depends(source_body(AnalysisRequest))):
     async with httpx.AsyncClient(timeout=30.0) as client:
         response = await client.post(f"{DETECTION_SERVICE_URL}/magic-numbers", json=request.model_dump())
     if response.status_code != 200:
@@ -90,7 +174,7 @@ async def gateway_magic_numbers(request: AnalysisRequest):
 
 # Route for unused variables detection
 @detecton_gateway_router.post("/unused-variables", response_model=UnusedVariablesResponse)
-async def gateway_unused_variables(request: AnalysisRequest):
+async def gateway_unused_variables(request: AnalysisRequest = Depends(source_body(AnalysisRequest))):
     async with httpx.AsyncClient(timeout=30.0) as client:
         response = await client.post(f"{DETECTION_SERVICE_URL}/unused-variables", json=request.model_dump())
     if response.status_code != 200:
@@ -100,7 +184,7 @@ async def gateway_unused_variables(request: AnalysisRequest):
 
 # Route for naming convention detection
 @detecton_gateway_router.post("/naming-convention", response_model=InconsistentNamingResponse)
-async def gateway_naming_convention(request: AnalysisRequest):
+async def gateway_naming_convention(request: AnalysisRequest = Depends(source_body(AnalysisRequest))):
     async with httpx.AsyncClient(timeout=30.0) as client:
         response = await client.post(f"{DETECTION_SERVICE_URL}/naming-convention", json=request.model_dump())
     if response.status_code != 200:
@@ -109,16 +193,25 @@ async def gateway_naming_convention(request: AnalysisRequest):
 
 # Route for duplicated code detection
 @detecton_gateway_router.post("/duplicated-code", response_model=DuplicateCodeResponse)
-async def gateway_duplicated_code(request: AnalysisRequest):
+async def gateway_duplicated_code(request: DuplicateCodeRequest = Depends(source_body(DuplicateCodeRequest))):
     async with httpx.AsyncClient(timeout=30.0) as client:
         response = await client.post(f"{DETECTION_SERVICE_URL}/duplicated-code", json=request.model_dump())
     if response.status_code != 200:
         raise HTTPException(status_code=response.status_code, detail=response.text)
     return response.json()
 
+# Route for renamed (structural) clone detection
+@detecton_gateway_router.post("/structural-clones", response_model=StructuralCloneResponse)
+async def gateway_structural_clones(request: StructuralCloneRequest = Depends(source_body(StructuralCloneRequest))):
+    async with httpx.AsyncClient(timeout=30.0) as client:
+        response = await client.post(f"{DETECTION_SERVICE_URL}/structural-clones", json=request.model_dump())
+    if response.status_code != 200:
+        raise HTTPException(status_code=response.status_code, detail=response.text)
+    return response.json()
+
 # Route for parameter list detection
 @detecton_gateway_router.post("/parameter-list", response_model=LongParameterListResponse)
-async def gateway_parameter_list(request: AnalysisRequest):
+async def gateway_parameter_list(request: AnalysisRequest = Depends(source_body(AnalysisRequest))):
     async with httpx.AsyncClient(timeout=30.0) as client:
         response = await client.post(f"{DETECTION_SERVICE_URL}/parameter-list", json=request.model_dump())
     if response.status_code != 200:
@@ -126,7 +219,7 @@ async def gateway_parameter_list(request: AnalysisRequest):
     return response.json()
 
 @detecton_gateway_router.post("/global-conflict", response_model=VariableConflictResponse)
-async def gateway_global_conflict(request: VariableConflictRequest):
+async def gateway_global_conflict(request: VariableConflictRequest = Depends(source_body(VariableConflictRequest))):
     async with httpx.AsyncClient(timeout=30.0) as client:
         response = await client.post(f"{DETECTION_SERVICE_URL}/global-conflict", json=request.model_dump())
     if response.status_code != 200:
@@ -5,10 +5,14 @@ from fastapi import APIRouter, HTTPException, Request
 from app.mongo_models.Project import InitProjectRequest, express_respone
 from app.mongo_models.Detection import DetectionData
 from app.mongo_models.Refactor import RefactorData
-from app.mongo_models.DependencyGraph import GraphIn
+from app.mongo_models.DependencyGraph import GraphIn, GraphPatchIn, GraphBuildIn, ImpactQuery, ImpactResponse
 from app.mongo_models.Rulesets import InitRulesetRequest
 from app.mongo_models.Project import UpdateFileDataRequest
-from app.service.endpoints_url import EXPRESS_URL
+from app.service.endpoints_url import EXPRESS_URL, DETECTION_SERVICE_URL
+from app.service.impact_service import (
+    cached_impact_graph, graph_generation, store_impact_graph, invalidate_impact_graph, impact_query
+)
+from app.service.blob_store import blob_store
 
 logging_gateway_router = APIRouter()
 
@@ -41,13 +45,24 @@ async def gateway_update_file_data(request: UpdateFileDataRequest, req: Request)
     else:
         print("No Authorization header")
     try:
+        # Files sent by hash get their code back from the blob store
+        stored_code = blob_store.resolve({
+            file_name: file_data.sha256
+            for file_name, file_data in request.fileData.items()
+            if file_data.code is None and file_data.sha256 is not None
+        })
+
         # Convert to dict for serialization
         serialized_data = {}
         for file_name, file_data in request.fileData.items():
-            serialized_data[file_name] = file_data.model_dump()
+            serialized_data[file_name] = file_data.model_dump(exclude={"sha256"})
+            if file_name in stored_code:
+                serialized_data[file_name]["code"] = stored_code[file_name]
         
         request.fileData = serialized_data
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Serialization error: {str(e)}")
     
@@ -107,6 +122,51 @@ async def create_or_update_graph(graph_in: GraphIn, req: Request):
         response = await client.post(
             f"{EXPRESS_URL}/graph/add-or-update", json=graph_in.model_dump()
         )
+    invalidate_impact_graph(graph_in.projectTitle)
+    if response.status_code not in (200, 201):
+        raise HTTPException(status_code=response.status_code, detail=response.text)
+    return response.json()
+
+# Only the changed files are sent; ast-service patches its copy of the graph and
+# the nodes that changed are merged into the stored one
+@logging_gateway_router.post("/graph/build", response_model=express_respone)
+async def build_graph(graph_build: GraphBuildIn, req: Request):
+    headers = {}
+    if "Authorization" in req.headers:
+        headers["Authorization"] = req.headers["Authorization"]
+    payload = {
+        "project": graph_build.projectTitle,
+        "files": graph_build.files,
+        "removed": graph_build.removed,
+        "full_graph": False,
+        "require_seed": True
+    }
+    async with httpx.AsyncClient(timeout=60.0) as client:
+        response = await client.post(f"{DETECTION_SERVICE_URL}/dependency-graph/files", json=payload)
+        if response.status_code != 200:
+            raise HTTPException(status_code=response.status_code, detail=response.text)
+        result = response.json()
+        if result.get("needs_seed"):
+            # ast-service has no graph for the project (e.g. it restarted); start it from the stored one
+            stored = await client.get(f"{EXPRESS_URL}/graph/get/{graph_build.projectTitle}")
+            if stored.status_code == 200:
+                seed = (stored.json().get("graphData") or {}).get("graphData") or {}
+            elif stored.status_code == 404:
+                seed = {}
+            else:
+                raise HTTPException(status_code=stored.status_code, detail=stored.text)
+            response = await client.post(f"{DETECTION_SERVICE_URL}/dependency-graph/files", json={**payload, "seed": seed})
+            if response.status_code != 200:
+                raise HTTPException(status_code=response.status_code, detail=response.text)
+            result = response.json()
+        if not result.get("success"):
+            raise HTTPException(status_code=400, detail=result.get("error"))
+        graph_patch = GraphPatchIn(projectTitle=graph_build.projectTitle, graphData=result["graph"],
+                                   removed=result.get("removed_files") or [])
+        response = await client.post(
+            f"{EXPRESS_URL}/graph/patch", json=graph_patch.model_dump(), headers=headers
+        )
+    invalidate_impact_graph(graph_build.projectTitle)
     if response.status_code not in (200, 201):
         raise HTTPException(status_code=response.status_code, detail=response.text)
     return response.json()
@@ -119,6 +179,21 @@ async def get_graph(projectTitle: str):
         raise HTTPException(status_code=response.status_code, detail=response.text)
     return response.json()
 
+# Which files a change reaches, answered from a cached compact copy of the stored graph.
+# The copy is fetched once and dropped whenever the graph endpoints above write the project.
+@logging_gateway_router.post("/graph/impact/{projectTitle}", response_model=ImpactResponse)
+async def graph_impact(projectTitle: str, query: ImpactQuery):
+    graph = cached_impact_graph(projectTitle)
+    if graph is None:
+        generation = graph_generation(projectTitle)
+        async with httpx.AsyncClient(timeout=30.0) as client:
+            response = await client.get(f"{EXPRESS_URL}/graph/get/{projectTitle}")
+        if response.status_code != 200:
+            raise HTTPException(status_code=response.status_code, detail=response.text)
+        graph_document = response.json().get("graphData") or {}
+        graph = store_impact_graph(projectTitle, graph_document.get("graphData") or {}, generation)
+    return impact_query(graph, query.files, query.query, query.max_depth)
+
 @logging_gateway_router.delete("/graph/delete/{projectTitle}")
 async def delete_graph(projectTitle: str, req: Request):
     headers = {}
@@ -126,6 +201,7 @@ async def delete_graph(projectTitle: str, req: Request):
         headers["Authorization"] = req.headers["Authorization"]
     async with httpx.AsyncClient(timeout=30.0) as client:
         response = await client.delete(f"{EXPRESS_URL}/graph/delete/{projectTitle}", headers=headers)
+    invalidate_impact_graph(projectTitle)
     if response.status_code != 200:
         raise HTTPException(status_code=response.status_code, detail=response.text)
     return response.json()
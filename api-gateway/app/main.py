@@ -5,15 +5,23 @@ load_dotenv()
 
 from fastapi import FastAPI
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi import FastAPI, Request
 import logging
 from app.api.endpoints.detection import detecton_gateway_router
 from app.api.endpoints.refactor import refactor_gateway_router
 from app.api.endpoints.websockets import websocket_gateway_router, lifespan   #Sockets Code For Iteration 2
 from app.api.endpoints.mongo import logging_gateway_router
+from app.api.endpoints.blobs import blob_gateway_router
+from app.service.metrics import registry, MetricsMiddleware
+from app.service.source_upload import GzipRequestMiddleware, GZIP_MIN_RESPONSE_BYTES
 
 app = FastAPI(lifespan=lifespan) #  #Sockets Code For Iteration 2
+app.add_middleware(GZipMiddleware, minimum_size=GZIP_MIN_RESPONSE_BYTES, compresslevel=5)
+app.add_middleware(GzipRequestMiddleware)
+# Outermost, so sizes are measured as sent over the wire
+app.add_middleware(MetricsMiddleware)
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     body = await request.body()
@@ -27,10 +35,16 @@ app.include_router(detecton_gateway_router, prefix="/detection")
 app.include_router(refactor_gateway_router, prefix="/refactor")
 app.include_router(websocket_gateway_router, prefix="/websockets")    #Sockets Code For Iteration 2
 app.include_router(logging_gateway_router, prefix="/logs")
+app.include_router(blob_gateway_router, prefix="/blobs")
 @app.get("/")
 def health_check():
     return {"status": "ok"}
 
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    # Prometheus text format; every proxied route is timed by the middleware
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
         
 if __name__ == "__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=int(os.getenv("PORT", 8000)), reload=True)
\ No newline at end of file
@@ -0,0 +1,19 @@
+from pydantic import BaseModel, StringConstraints
+from typing import List, Dict, Optional, Annotated
+
+# Lowercase hex SHA-256 of a file's UTF-8 bytes
+Sha256 = Annotated[str, StringConstraints(pattern=r'^[0-9a-f]{64}$')]
+
+class ManifestRequest(BaseModel):
+    files: Dict[str, Sha256]  # file path -> sha256
+
+class ManifestResponse(BaseModel):
+    missing: List[str] = []  # Hashes to upload with PUT /blobs/{sha256}
+    success: bool = True
+    error: Optional[str] = None
+
+class BlobUploadResponse(BaseModel):
+    sha256: str
+    size: int
+    success: bool = True
+    error: Optional[str] = None
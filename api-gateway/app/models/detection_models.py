@@ -3,6 +3,9 @@ from typing import List, Dict, Union, Optional, Any, Tuple
 
 class CodeRequest(BaseModel):
     code: str
+    include_ast: bool = True
+    include_positions: bool = False  # Add lineno/col_offset/end_lineno/end_col_offset to every node
+    fields: Optional[List[str]] = None  # Only compute and return these CodeResponse fields
 
 class GlobalVariable(BaseModel):
     variable_name: str
@@ -16,13 +19,13 @@ class Import(BaseModel):
     module: Optional[str] = None
 
 class CodeResponse(BaseModel):
-    ast: Optional[str]
-    function_names: Optional[List[str]]
-    class_details: Optional[List[Dict[str, Union[str, List[str]]]]]
-    global_variables: Optional[List[GlobalVariable]]
-    is_main_block_present: Optional[bool]
-    imports: Optional[Dict[str, List[Import]]]
-    is_standalone_file: Optional[bool]
+    ast: Optional[Any] = None  # The tree as a JSON object, streamed when include_ast is set
+    function_names: Optional[List[str]] = None
+    class_details: Optional[List[Dict[str, Union[str, List[str]]]]] = None
+    global_variables: Optional[List[GlobalVariable]] = None
+    is_main_block_present: Optional[bool] = None
+    imports: Optional[Dict[str, List[Import]]] = None
+    is_standalone_file: Optional[bool] = None
     success: bool = True
     error: Optional[str] = None
     
@@ -30,6 +33,8 @@ class DeadCodeRequest(BaseModel):
     code: str
     function_names: List[str]
     global_variables: List[str]
+    project: Optional[str] = None
+    file_path: Optional[str] = None
     
 class DeadCodeResponse(BaseModel):
     function_names: Optional[List[str]] = []
@@ -106,11 +111,34 @@ class DuplicateCodeDetails(BaseModel):
     duplicates: List[Duplicates]
     duplicate_count: int
 
+class DuplicateCodeRequest(BaseModel):
+    code: str
+    vectorized: Optional[bool] = None  # NumPy scan; None picks it for very large files
+
 class DuplicateCodeResponse(BaseModel):
     duplicate_code: Optional[List[DuplicateCodeDetails]] = None
     success: bool
     error: Optional[str] = None
 
+class StructuralCloneRequest(BaseModel):
+    code: str
+    min_nodes: int = 12
+
+class CloneLocation(BaseModel):
+    start_line: int
+    end_line: int
+
+class StructuralCloneDetails(BaseModel):
+    node_type: str
+    node_count: int
+    clones: List[CloneLocation]
+    clone_count: int
+
+class StructuralCloneResponse(BaseModel):
+    structural_clones: Optional[List[StructuralCloneDetails]] = None
+    success: bool
+    error: Optional[str] = None
+
 
 class DeadClassRequest(BaseModel):
     code: str
@@ -162,5 +190,62 @@ class ComplexConditonalResponse(BaseModel):
     conditionals: Optional[List[ConditionDetails]] = []
     success: bool = True
     error: Optional[str] = None
-    
-    
\ No newline at end of file
+
+class AnalyzeAllRequest(BaseModel):
+    code: str
+    detectors: Optional[List[str]] = None
+    function_names: List[str] = []
+    global_variables: List[str] = []
+    tolerant: bool = False  # Analyse what still parses when the code has syntax errors
+
+class SubDetectionResponse(BaseModel):
+    success: bool
+    error: Optional[str] = None
+    data: Optional[Any] = None
+
+class SyntaxErrorDetails(BaseModel):
+    start_line: int
+    end_line: int
+    line_number: Optional[int] = None
+    error: str
+
+class AnalyzeAllResponse(BaseModel):
+    magic_numbers: Optional[SubDetectionResponse] = None
+    duplicated_code: Optional[SubDetectionResponse] = None
+    unused_variables: Optional[SubDetectionResponse] = None
+    long_parameter_list: Optional[SubDetectionResponse] = None
+    naming_convention: Optional[SubDetectionResponse] = None
+    dead_code: Optional[SubDetectionResponse] = None
+    unreachable_code: Optional[SubDetectionResponse] = None
+    temporary_field: Optional[SubDetectionResponse] = None
+    overly_complex_condition: Optional[SubDetectionResponse] = None
+    global_conflict: Optional[SubDetectionResponse] = None
+    syntax_errors: Optional[List[SyntaxErrorDetails]] = None
+    success: bool = True
+    error: Optional[str] = None
+
+class IncrementalAnalysisRequest(BaseModel):
+    file_path: str
+    code: str
+    detectors: Optional[List[str]] = None
+    tolerant: bool = False
+
+class IncrementalAnalysisResponse(BaseModel):
+    magic_numbers: Optional[SubDetectionResponse] = None
+    long_parameter_list: Optional[SubDetectionResponse] = None
+    unreachable_code: Optional[SubDetectionResponse] = None
+    temporary_field: Optional[SubDetectionResponse] = None
+    overly_complex_condition: Optional[SubDetectionResponse] = None
+    analyzed_segments: Optional[int] = None
+    reused_segments: Optional[int] = None
+    syntax_errors: Optional[List[SyntaxErrorDetails]] = None
+    success: bool = True
+    error: Optional[str] = None
+
+class BatchAnalyzeRequest(BaseModel):
+    files: Dict[str, str] = {}  # file path -> code
+    manifest: Dict[str, str] = {}  # file path -> sha256 of a blob uploaded to /blobs
+    detectors: Optional[List[str]] = None
+    function_names: List[str] = []
+    global_variables: List[str] = []
+    tolerant: bool = False
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Literal
 from datetime import datetime
 from enum import Enum
 
@@ -29,4 +29,30 @@ class DependencyGraph(BaseModel):
 # Input model for API calls, using projectTitle to find or create the project.
 class GraphIn(BaseModel):
     projectTitle: str
-    graphData: Dict[str, FileNode] = Field(default_factory=dict)
\ No newline at end of file
+    graphData: Dict[str, FileNode] = Field(default_factory=dict)
+
+# Changed nodes merged into the stored graph, and the files to drop from it.
+class GraphPatchIn(BaseModel):
+    projectTitle: str
+    graphData: Dict[str, FileNode] = Field(default_factory=dict)
+    removed: List[str] = Field(default_factory=list)
+
+# Input model for building the graph in ast-service from the changed files.
+class GraphBuildIn(BaseModel):
+    projectTitle: str
+    files: Dict[str, str] = Field(default_factory=dict)  # file path -> code, added or replaced
+    removed: List[str] = Field(default_factory=list)
+
+
+class ImpactQuery(BaseModel):
+    files: List[str]
+    # dependents / dependencies are transitive unless max_depth is set;
+    # rescan lists the files whose detection results the change makes stale
+    query: Literal['dependents', 'dependencies', 'rescan'] = 'rescan'
+    max_depth: Optional[int] = None
+
+class ImpactResponse(BaseModel):
+    files: List[str] = Field(default_factory=list)
+    unknown_files: List[str] = Field(default_factory=list)
+    total_files: int = 0
+    total_edges: int = 0
@@ -1,4 +1,5 @@
-from pydantic import BaseModel
+import json
+from pydantic import BaseModel, field_validator
 from typing import List, Dict, Union, Optional, Any, Tuple 
 
 class InitProjectRequest(BaseModel):
@@ -14,6 +15,15 @@ class express_respone(BaseModel):
 class FileData(BaseModel):
     code: Optional[str] = None
     ast: Optional[str] = None
+    sha256: Optional[str] = None  # Sent instead of code once the file is in the blob store
+
+    @field_validator('ast', mode='before')
+    @classmethod
+    def ast_as_string(cls, value):
+        # /analyze-ast returns the tree as a JSON object; Express stores it as a string
+        if isinstance(value, (dict, list)):
+            return json.dumps(value, separators=(',', ':'))
+        return value
 
 class UpdateFileDataRequest(BaseModel):
     title: str
@@ -0,0 +1,109 @@
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+from fastapi import HTTPException
+
+# Upper bound for the source held in the blob store, in bytes of UTF-8
+BLOB_STORE_MAX_BYTES = int(os.getenv('BLOB_STORE_MAX_BYTES', 256 * 1024 * 1024))
+
+SHA256_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+
+
+class BlobStore:
+    """
+    LRU store of uploaded source files keyed by the SHA-256 of their bytes.
+
+    Clients send a manifest of hashes first and upload only the blobs the
+    store is missing. Entries are evicted oldest first once the stored
+    source goes over ``max_bytes``; a hash that was evicted is simply
+    reported missing again, and the client uploads it again.
+
+    The store lives in the memory of one gateway process, so the gateway
+    must run as a single worker: with several, a manifest, its uploads and
+    the analysis that reads them can land on workers holding different
+    blobs.
+    """
+
+    def __init__(self, max_bytes: int = BLOB_STORE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def missing(self, digests) -> list:
+        """The given hashes the store does not hold, each once, in order."""
+        absent = []
+        with self.lock:
+            for digest in dict.fromkeys(digests):
+                if digest in self.entries:
+                    # A file named in a manifest is about to be analysed
+                    self.entries.move_to_end(digest)
+                else:
+                    absent.append(digest)
+        return absent
+
+    def put(self, digest: str, data: bytes) -> str:
+        """Stores ``data`` under ``digest``, which must be its SHA-256."""
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise HTTPException(status_code=400, detail="Body does not match its SHA-256")
+        if len(data) > self.max_bytes:
+            raise HTTPException(status_code=413, detail=f"Blob is larger than the store's {self.max_bytes} bytes")
+        try:
+            code = data.decode('utf-8')
+        except UnicodeDecodeError:
+            raise HTTPException(status_code=400, detail="Source must be UTF-8")
+        with self.lock:
+            if digest not in self.entries:
+                self.entries[digest] = (code, len(data))
+                self.total_bytes += len(data)
+                while self.total_bytes > self.max_bytes:
+                    _, (_, evicted_size) = self.entries.popitem(last=False)
+                    self.total_bytes -= evicted_size
+            else:
+                self.entries.move_to_end(digest)
+        return digest
+
+    def get(self, digest: str):
+        with self.lock:
+            entry = self.entries.get(digest)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(digest)
+            self.hits += 1
+            return entry[0]
+
+    def resolve(self, manifest: dict) -> dict:
+        """
+        ``{path: source}`` for a ``{path: sha256}`` manifest. Raises 409 with
+        the hashes to upload when any of them is not stored; the response
+        body is ``{"detail": {"missing": [...]}}``.
+        """
+        files = {}
+        missing = []
+        for path, digest in manifest.items():
+            code = self.get(digest)
+            if code is None:
+                missing.append(digest)
+            else:
+                files[path] = code
+        if missing:
+            raise HTTPException(status_code=409, detail={'missing': list(dict.fromkeys(missing))})
+        return files
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'entries': len(self.entries),
+                'bytes': self.total_bytes,
+                'max_bytes': self.max_bytes
+            }
+
+
+blob_store = BlobStore()
@@ -0,0 +1,143 @@
+from array import array
+
+
+class ImpactGraph:
+    """
+    A project's dependency graph as compact integer adjacency arrays (CSR):
+    the neighbours of file ``i`` are ``targets[offsets[i]:offsets[i + 1]]``.
+    Both directions are kept, so dependents and dependencies are each a
+    breadth-first walk over flat arrays.
+
+    Built from the stored ``graphData`` (file path -> FileNode). An edge
+    A -> B means A imports B; it is read from A's "Importing" weights or from
+    B's "Exporting" weights, whichever the graph carries. Invalid
+    (unresolved) dependencies are not files and are left out.
+    """
+
+    def __init__(self, graph_data: dict):
+        names = set(graph_data)
+        edges = set()
+        for file_name, node in graph_data.items():
+            for dependency in node.get('dependencies', []):
+                if not dependency.get('valid'):
+                    continue
+                other = dependency['name']
+                names.add(other)
+                for entity in dependency.get('weight', []):
+                    if entity.get('source') == 'Importing':
+                        edges.add((file_name, other))
+                    elif entity.get('source') == 'Exporting':
+                        edges.add((other, file_name))
+
+        self.files = sorted(names)
+        self.index = {name: i for i, name in enumerate(self.files)}
+        pairs = [(self.index[a], self.index[b]) for a, b in edges if a != b]
+        self.dep_offsets, self.dep_targets = self._csr(pairs)
+        self.rev_offsets, self.rev_targets = self._csr([(b, a) for a, b in pairs])
+
+    def _csr(self, pairs):
+        counts = [0] * (len(self.files) + 1)
+        for source, _ in pairs:
+            counts[source + 1] += 1
+        for i in range(len(self.files)):
+            counts[i + 1] += counts[i]
+        offsets = array('I', counts)
+        targets = array('I', bytes(4 * len(pairs)))
+        fill = counts[:-1]
+        for source, target in pairs:
+            targets[fill[source]] = target
+            fill[source] += 1
+        return offsets, targets
+
+    def _walk(self, offsets, targets, starts, max_depth=None):
+        seen = bytearray(len(self.files))
+        for start in starts:
+            seen[start] = 1
+        frontier = list(starts)
+        found = []
+        depth = 0
+        while frontier and (max_depth is None or depth < max_depth):
+            next_frontier = []
+            for node in frontier:
+                for target in targets[offsets[node]:offsets[node + 1]]:
+                    if not seen[target]:
+                        seen[target] = 1
+                        next_frontier.append(target)
+            found.extend(next_frontier)
+            frontier = next_frontier
+            depth += 1
+        return found
+
+    def _indexes(self, file_names):
+        return [self.index[name] for name in file_names if name in self.index]
+
+    def dependents(self, file_names, max_depth=None) -> list:
+        """Files that import the given files, directly or through other files."""
+        found = self._walk(self.rev_offsets, self.rev_targets, self._indexes(file_names), max_depth)
+        return sorted(self.files[i] for i in found)
+
+    def dependencies(self, file_names, max_depth=None) -> list:
+        """Files the given files import, directly or through other files."""
+        found = self._walk(self.dep_offsets, self.dep_targets, self._indexes(file_names), max_depth)
+        return sorted(self.files[i] for i in found)
+
+    def rescan(self, file_names) -> list:
+        """
+        Files whose detection results may be stale after the given files
+        change: the files themselves, everything that depends on them
+        (global conflicts and naming cascades travel along imports) and the
+        files they import directly (whose dead code depends on what the
+        changed files still use).
+        """
+        starts = self._indexes(file_names)
+        found = set(starts)
+        found.update(self._walk(self.rev_offsets, self.rev_targets, starts))
+        found.update(self._walk(self.dep_offsets, self.dep_targets, starts, max_depth=1))
+        return sorted(self.files[i] for i in found)
+
+    def stats(self) -> dict:
+        return {
+            'total_files': len(self.files),
+            'total_edges': len(self.dep_targets)
+        }
+
+
+# projectTitle -> ImpactGraph, kept until the gateway writes that project's graph
+impact_graphs = {}
+# projectTitle -> number of graph writes seen, so a read that raced a write is not kept
+graph_writes = {}
+
+
+def cached_impact_graph(project_title: str):
+    return impact_graphs.get(project_title)
+
+
+def graph_generation(project_title: str) -> int:
+    return graph_writes.get(project_title, 0)
+
+
+def store_impact_graph(project_title: str, graph_data: dict, generation: int) -> ImpactGraph:
+    """Build the graph read at ``generation``; it is cached only if no write has happened since."""
+    graph = ImpactGraph(graph_data)
+    if graph_generation(project_title) == generation:
+        impact_graphs[project_title] = graph
+    return graph
+
+
+def invalidate_impact_graph(project_title: str):
+    graph_writes[project_title] = graph_generation(project_title) + 1
+    impact_graphs.pop(project_title, None)
+
+
+def impact_query(graph: ImpactGraph, files: list, query: str, max_depth: int = None) -> dict:
+    if query == 'dependents':
+        result = graph.dependents(files, max_depth)
+    elif query == 'dependencies':
+        result = graph.dependencies(files, max_depth)
+    else:
+        result = graph.rescan(files)
+    return {
+        'files': result,
+        'unknown_files': [name for name in files if name not in graph.index],
+        **graph.stats()
+    }
@@ -0,0 +1,201 @@
+import bisect
+import threading
+import time
+
+# Upper bounds of the latency buckets, in seconds
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# Upper bounds of the size buckets, in bytes
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names, values, extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _number(value) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class Counter:
+    kind = 'counter'
+
+    def __init__(self, name: str, documentation: str, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def inc(self, *label_values, amount: float = 1):
+        with self.lock:
+            self.values[label_values] = self.values.get(label_values, 0) + amount
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            return dict(self.values)
+
+    @staticmethod
+    def merge(total: dict, values: dict):
+        for key, value in values.items():
+            total[key] = total.get(key, 0) + value
+
+    def render(self, values: dict) -> list:
+        return [f"{self.name}{_labels(self.labels, key)} {_number(value)}" for key, value in sorted(values.items())]
+
+
+class Histogram:
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        # Per label set: a count per bucket (the last one is +Inf), then the sum
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def observe(self, value: float, *label_values):
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            entry = self.values.get(label_values)
+            if entry is None:
+                entry = self.values[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+            entry[index] += 1
+            entry[-1] += value
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            return {key: list(entry) for key, entry in self.values.items()}
+
+    @staticmethod
+    def merge(total: dict, values: dict):
+        for key, entry in values.items():
+            current = total.get(key)
+            total[key] = list(entry) if current is None else [a + b for a, b in zip(current, entry)]
+
+    def render(self, values: dict) -> list:
+        lines = []
+        for key, entry in sorted(values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), entry):
+                cumulative += count
+                le = f'le="{_number(bound)}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labels, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labels, key)} {_number(entry[-1])}")
+            lines.append(f"{self.name}_count{_labels(self.labels, key)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Counters and fixed-bucket histograms for one process. Recording is a
+    dictionary update under a lock, so it is cheap enough to leave on.
+    ``render`` also takes snapshots from other processes to add in.
+    """
+
+    def __init__(self):
+        self.metrics = {}
+
+    def _register(self, metric):
+        return self.metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, documentation: str, labels=()) -> Counter:
+        return self._register(Counter(name, documentation, labels))
+
+    def histogram(self, name: str, documentation: str, labels=(), buckets=LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labels, buckets))
+
+    def snapshot(self) -> dict:
+        return {name: metric.snapshot() for name, metric in self.metrics.items()}
+
+    def merge(self, *snapshots) -> dict:
+        total = {name: {} for name in self.metrics}
+        for snapshot in snapshots:
+            for name, values in (snapshot or {}).items():
+                if name in self.metrics:
+                    self.metrics[name].merge(total[name], values)
+        return total
+
+    def render(self, *snapshots) -> str:
+        """Prometheus text for this process plus any worker snapshots."""
+        merged = self.merge(self.snapshot(), *snapshots)
+        lines = []
+        for name, metric in self.metrics.items():
+            lines.append(f"# HELP {name} {metric.documentation}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            lines.extend(metric.render(merged[name]))
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+http_request_seconds = registry.histogram(
+    'http_request_duration_seconds', 'Time to answer an HTTP request.', ('method', 'route', 'status'))
+http_request_bytes = registry.histogram(
+    'http_request_size_bytes', 'Size of HTTP request bodies.', ('method', 'route'), SIZE_BUCKETS)
+http_response_bytes = registry.histogram(
+    'http_response_size_bytes', 'Size of HTTP response bodies.', ('method', 'route'), SIZE_BUCKETS)
+
+
+def _route_template(scope) -> str:
+    route = scope.get('route')
+    if route is None:
+        return 'unmatched'
+    # The route's own path includes its router's prefix, except where FastAPI
+    # keeps included routers as they were declared and records the full path
+    # of the matched route beside them
+    effective = scope.get('fastapi', {}).get('effective_route_context')
+    return getattr(effective, 'path', None) or route.path
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware timing every HTTP request and measuring its body and
+    response sizes. Requests are labelled with the route template rather
+    than the raw path so path parameters do not create new series.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+        sizes = [0, 0]
+
+        async def counting_receive():
+            message = await receive()
+            if message['type'] == 'http.request':
+                sizes[0] += len(message.get('body', b''))
+            return message
+
+        async def counting_send(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            elif message['type'] == 'http.response.body':
+                sizes[1] += len(message.get('body', b''))
+            await send(message)
+
+        try:
+            await self.app(scope, counting_receive, counting_send)
+        finally:
+            route = _route_template(scope)
+            method = scope['method']
+            http_request_seconds.observe(time.perf_counter() - start, method, route, str(status))
+            http_request_bytes.observe(sizes[0], method, route)
+            http_response_bytes.observe(sizes[1], method, route)
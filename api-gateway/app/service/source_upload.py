@@ -0,0 +1,141 @@
+import os
+import types
+import zlib
+from typing import Union, get_args, get_origin
+from fastapi import HTTPException, Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
+from pydantic_core import from_json
+from app.service.blob_store import blob_store
+
+RAW_SOURCE_TYPE = 'text/x-python'
+# Most bytes handed to the app per message while inflating a gzip body
+INFLATE_CHUNK_BYTES = 64 * 1024
+# Largest request body accepted once a gzip-encoded upload is inflated
+MAX_INFLATED_REQUEST_BYTES = int(os.getenv('MAX_INFLATED_REQUEST_BYTES', 64 * 1024 * 1024))
+# Responses at least this large are gzipped for clients that accept it
+GZIP_MIN_RESPONSE_BYTES = int(os.getenv('GZIP_MIN_RESPONSE_BYTES', 1024))
+
+
+class GzipRequestMiddleware:
+    """
+    Inflates ``Content-Encoding: gzip`` request bodies as they arrive, one
+    bounded chunk at a time, so the app sees the plain body. Bodies that
+    inflate past ``max_size`` are refused with 413 before they are buffered.
+    """
+
+    def __init__(self, app, max_size: int = MAX_INFLATED_REQUEST_BYTES):
+        self.app = app
+        self.max_size = max_size
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope['headers'])
+        if headers.get(b'content-encoding', b'').strip().lower() != b'gzip':
+            await self.app(scope, receive, send)
+            return
+
+        # The app must not see the encoding or the compressed length
+        scope = dict(scope, headers=[
+            (name, value) for name, value in scope['headers']
+            if name not in (b'content-encoding', b'content-length')
+        ])
+        inflater = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        state = {'inflated': 0, 'more_body': True, 'done': False}
+        max_size = self.max_size
+
+        async def inflated_receive():
+            if state['done']:
+                return await receive()
+            while True:
+                if inflater.unconsumed_tail:
+                    data = inflater.unconsumed_tail
+                elif state['more_body']:
+                    message = await receive()
+                    if message['type'] != 'http.request':
+                        return message
+                    data = message.get('body', b'')
+                    state['more_body'] = message.get('more_body', False)
+                else:
+                    data = b''
+                try:
+                    body = inflater.decompress(data, INFLATE_CHUNK_BYTES)
+                except zlib.error:
+                    raise HTTPException(status_code=400, detail="Request body is not valid gzip")
+                state['inflated'] += len(body)
+                if state['inflated'] > max_size:
+                    raise HTTPException(status_code=413, detail=f"Request body inflates to more than {max_size} bytes")
+                finished = not state['more_body'] and not inflater.unconsumed_tail
+                if finished and not inflater.eof:
+                    raise HTTPException(status_code=400, detail="Request body is truncated gzip")
+                if body or finished:
+                    state['done'] = finished
+                    return {'type': 'http.request', 'body': body, 'more_body': not finished}
+
+        await self.app(scope, inflated_receive, send)
+
+
+def _is_list(annotation) -> bool:
+    origin = get_origin(annotation)
+    if origin in (Union, types.UnionType):
+        return any(_is_list(arg) for arg in get_args(annotation))
+    return origin is list or annotation is list
+
+
+def _query_fields(model, request: Request, code: str) -> dict:
+    data = {'code': code}
+    for name, field in model.model_fields.items():
+        if name == 'code':
+            continue
+        if _is_list(field.annotation):
+            # Lists repeat the parameter; a query string cannot spell an empty one
+            if name in request.query_params or field.is_required():
+                data[name] = request.query_params.getlist(name)
+        elif name in request.query_params:
+            data[name] = request.query_params[name]
+    return data
+
+
+def source_body(model):
+    """
+    Dependency that reads ``model`` from a JSON body, or from a raw
+    ``text/x-python`` body holding the code with the other fields in the
+    query string, list fields as repeated parameters. Either way the body
+    skips FastAPI's generic JSON decoding.
+
+    With ``?blob=<sha256>`` the code is taken from the blob store instead,
+    and the other fields come from a JSON body if there is one. A hash the
+    store does not hold gets 409 ``{"detail": {"missing": [sha256]}}``.
+    """
+
+    async def dependency(request: Request):
+        body = await request.body()
+        content_type = request.headers.get('content-type', '').partition(';')[0].strip().lower()
+        blob = request.query_params.get('blob')
+        try:
+            if blob is not None:
+                code = blob_store.get(blob)
+                if code is None:
+                    raise HTTPException(status_code=409, detail={'missing': [blob]})
+                if not body:
+                    return model.model_validate(_query_fields(model, request, code))
+                data = from_json(body)
+                if isinstance(data, dict):
+                    data['code'] = code
+                return model.model_validate(data)
+            if content_type != RAW_SOURCE_TYPE:
+                return model.model_validate_json(body)
+            try:
+                code = body.decode('utf-8')
+            except UnicodeDecodeError:
+                raise HTTPException(status_code=400, detail="Source must be UTF-8")
+            return model.model_validate(_query_fields(model, request, code))
+        except ValidationError as e:
+            raise RequestValidationError(e.errors(include_url=False), body=body)
+        except ValueError as e:
+            # from_json's error for a body that is not JSON at all
+            raise RequestValidationError([{'type': 'json_invalid', 'loc': ('body',), 'msg': str(e), 'input': {}}], body=body)
+
+    return dependency
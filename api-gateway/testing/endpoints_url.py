@@ -0,0 +1 @@
+BASE_URL = "http://127.0.0.1:8000"
\ No newline at end of file
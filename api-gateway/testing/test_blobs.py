@@ -0,0 +1,96 @@
+import gzip
+import hashlib
+import json
+import uuid
+import pytest
+from endpoints_url import BASE_URL
+from fastapi import HTTPException
+import httpx
+from app.service.blob_store import BlobStore
+
+# The gateway's event loop can be held up to 10 s by its SQS poll
+TIMEOUT = 30.0
+
+def sha256(code: str) -> str:
+    return hashlib.sha256(code.encode()).hexdigest()
+
+
+@pytest.fixture
+def sample_code():
+    # Unique per run so the blob is not already stored
+    return f"""# {uuid.uuid4()}
+def area(radius):
+    unused = 1
+    return 3.14159 * radius * radius
+"""
+
+
+@pytest.mark.asyncio
+async def test_manifest_then_upload(sample_code):
+    digest = sha256(sample_code)
+    async with httpx.AsyncClient(timeout=TIMEOUT) as client:
+        first = await client.post(f"{BASE_URL}/blobs/manifest", json={"files": {"area.py": digest, "copy.py": digest}})
+        mismatch = await client.put(f"{BASE_URL}/blobs/{digest}", content=b"something else")
+        upload = await client.put(f"{BASE_URL}/blobs/{digest}", content=gzip.compress(sample_code.encode()),
+                                  headers={"Content-Encoding": "gzip"})
+        second = await client.post(f"{BASE_URL}/blobs/manifest", json={"files": {"area.py": digest}})
+
+    assert first.status_code == 200
+    assert first.json()["missing"] == [digest]
+    assert mismatch.status_code == 400
+    assert upload.status_code == 200
+    assert upload.json()["size"] == len(sample_code.encode())
+    assert second.json()["missing"] == []
+
+
+@pytest.mark.asyncio
+async def test_detector_reads_blob(sample_code):
+    digest = sha256(sample_code)
+    async with httpx.AsyncClient(timeout=TIMEOUT) as client:
+        await client.put(f"{BASE_URL}/blobs/{digest}", content=sample_code.encode())
+        response = await client.post(f"{BASE_URL}/detection/unused-variables", params={"blob": digest})
+
+    assert response.status_code == 200
+    assert [entry["variable_name"] for entry in response.json()["unused_variables"]] == ["unused"]
+
+
+@pytest.mark.asyncio
+async def test_batch_analyze_reads_manifest(sample_code):
+    digest = sha256(sample_code)
+    async with httpx.AsyncClient(timeout=TIMEOUT) as client:
+        await client.put(f"{BASE_URL}/blobs/{digest}", content=sample_code.encode())
+        response = await client.post(f"{BASE_URL}/detection/batch-analyze", json={
+            "manifest": {"area.py": digest},
+            "detectors": ["unused_variables"]
+        })
+
+    assert response.status_code == 200
+    result = json.loads(response.text.splitlines()[0])
+    assert result["file_path"] == "area.py"
+    assert [entry["variable_name"] for entry in result["unused_variables"]["data"]["unused_variables"]] == ["unused"]
+
+
+@pytest.mark.asyncio
+async def test_unknown_blob_is_reported_missing(sample_code):
+    digest = sha256(sample_code)
+    async with httpx.AsyncClient(timeout=TIMEOUT) as client:
+        single = await client.post(f"{BASE_URL}/detection/unused-variables", params={"blob": digest})
+        batch = await client.post(f"{BASE_URL}/detection/batch-analyze", json={"manifest": {"area.py": digest}})
+
+    assert single.status_code == 409
+    assert single.json() == {"detail": {"missing": [digest]}}
+    assert batch.status_code == 409
+    assert batch.json() == {"detail": {"missing": [digest]}}
+
+
+def test_evicted_blob_is_reported_missing():
+    store = BlobStore(max_bytes=10)
+    first, second = b"a = 1\n", b"b = 2\n"
+    store.put(hashlib.sha256(first).hexdigest(), first)
+    store.put(hashlib.sha256(second).hexdigest(), second)
+
+    with pytest.raises(HTTPException) as error:
+        store.resolve({"a.py": hashlib.sha256(first).hexdigest(), "b.py": hashlib.sha256(second).hexdigest()})
+    assert error.value.status_code == 409
+    assert error.value.detail == {"missing": [hashlib.sha256(first).hexdigest()]}
+    assert store.missing([hashlib.sha256(first).hexdigest()]) == [hashlib.sha256(first).hexdigest()]
@@ -0,0 +1,103 @@
+import pytest
+from app.service import impact_service
+from app.service.impact_service import (
+    ImpactGraph, cached_impact_graph, graph_generation, store_impact_graph, invalidate_impact_graph, impact_query
+)
+
+
+def imports(*names):
+    return {"dependencies": [
+        {"name": name, "valid": True, "weight": [{"name": "x", "type": "function", "source": "Importing"}]}
+        for name in names
+    ]}
+
+
+@pytest.fixture
+def graph_data():
+    # app.py -> service.py -> models.py -> base.py, and cli.py -> service.py
+    return {
+        "app.py": imports("service.py"),
+        "cli.py": imports("service.py"),
+        "service.py": imports("models.py"),
+        "models.py": imports("base.py"),
+        "base.py": {"dependencies": [{"name": "requests", "valid": False, "weight": []}]},
+    }
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    impact_service.impact_graphs.clear()
+    impact_service.graph_writes.clear()
+    yield
+    impact_service.impact_graphs.clear()
+    impact_service.graph_writes.clear()
+
+
+def test_dependents(graph_data):
+    graph = ImpactGraph(graph_data)
+    assert graph.dependents(["models.py"]) == ["app.py", "cli.py", "service.py"]
+    assert graph.dependents(["app.py"]) == []
+
+
+def test_dependencies(graph_data):
+    graph = ImpactGraph(graph_data)
+    assert graph.dependencies(["app.py"]) == ["base.py", "models.py", "service.py"]
+    # Unresolved imports are not files
+    assert graph.dependencies(["base.py"]) == []
+
+
+def test_exporting_weights_give_the_same_edge():
+    graph = ImpactGraph({
+        "lib.py": {"dependencies": [
+            {"name": "main.py", "valid": True, "weight": [{"name": "f", "type": "function", "source": "Exporting"}]}
+        ]},
+        "main.py": {"dependencies": []},
+    })
+    assert graph.dependents(["lib.py"]) == ["main.py"]
+    assert graph.dependencies(["main.py"]) == ["lib.py"]
+
+
+def test_max_depth(graph_data):
+    graph = ImpactGraph(graph_data)
+    assert graph.dependents(["base.py"], max_depth=1) == ["models.py"]
+    assert graph.dependents(["base.py"], max_depth=2) == ["models.py", "service.py"]
+    assert graph.dependencies(["app.py"], max_depth=1) == ["service.py"]
+    assert graph.dependencies(["app.py"], max_depth=0) == []
+
+
+def test_unknown_files(graph_data):
+    result = impact_query(ImpactGraph(graph_data), ["models.py", "missing.py"], "dependents")
+    assert result == {
+        "files": ["app.py", "cli.py", "service.py"],
+        "unknown_files": ["missing.py"],
+        "total_files": 5,
+        "total_edges": 4,
+    }
+
+
+def test_rescan(graph_data):
+    # The file, everything depending on it and what it imports directly
+    result = impact_query(ImpactGraph(graph_data), ["service.py"], "rescan")
+    assert result["files"] == ["app.py", "cli.py", "models.py", "service.py"]
+
+
+def test_cached_until_the_graph_is_written(graph_data):
+    graph = store_impact_graph("demo", graph_data, graph_generation("demo"))
+    assert cached_impact_graph("demo") is graph
+
+    invalidate_impact_graph("demo")
+    assert cached_impact_graph("demo") is None
+
+    graph_data["tools.py"] = imports("base.py")
+    rebuilt = store_impact_graph("demo", graph_data, graph_generation("demo"))
+    assert cached_impact_graph("demo") is rebuilt
+    assert rebuilt.dependents(["base.py"], max_depth=1) == ["models.py", "tools.py"]
+
+
+def test_read_racing_a_write_is_not_cached(graph_data):
+    generation = graph_generation("demo")
+    invalidate_impact_graph("demo")
+    # The graph read before the write is still answered from, but not kept
+    graph = store_impact_graph("demo", graph_data, generation)
+    assert graph.dependents(["base.py"], max_depth=1) == ["models.py"]
+    assert cached_impact_graph("demo") is None
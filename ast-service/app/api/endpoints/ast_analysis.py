@@ -1,4 +1,5 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from app.models.ast_models import (
     DeadCodeRequest, 
     DeadCodeResponse, 
@@ -14,7 +15,15 @@ from app.models.ast_models import (
     LongParameterListResponse,
     UnusedVariablesResponse,
     InconsistentNamingResponse,
-    DuplicateCodeResponse
+    DuplicateCodeRequest,
+    DuplicateCodeResponse,
+    StructuralCloneRequest,
+    StructuralCloneResponse,
+    AnalyzeAllRequest,
+    AnalyzeAllResponse,
+    BatchAnalyzeRequest,
+    IncrementalAnalysisRequest,
+    IncrementalAnalysisResponse
 )
 
 from app.service.ast_service import (
@@ -23,19 +32,52 @@ from app.service.ast_service import (
     unused_variables_analysis,
     naming_convention_analysis,
     duplicated_code_analysis,
+    structural_clone_analysis,
     parameter_list_analysis,
     dead_class_analysis,
     global_variable_analysis,
     overly_complex_conditionals_analysis,
     unreachable_code_check,
-    check_temporary_field
+    check_temporary_field,
+    analyze_all
 )
+from app.service.executor import run_analysis
+from app.utils.source_upload import source_body
+from app.service.batch_service import stream_batch_analysis
+from app.service.incremental_service import incremental_analysis
+from app.service.symbol_service import extract_file_symbols, index_symbols, filter_project_dead_code
 
 analysis_router = APIRouter()
 
+@analysis_router.post("/analyze-all", response_model=AnalyzeAllResponse)
+async def analyze_all_detectors(request: AnalyzeAllRequest = Depends(source_body(AnalyzeAllRequest))):
+    result = await run_analysis(analyze_all, request.code, request.detectors, request.function_names, request.global_variables, request.tolerant, key=request.code)
+    if result is None:
+        raise HTTPException(status_code=400, detail="Invalid code")
+    elif result.get('success') is False:
+        print(result.get('error'))
+    return result
+
+@analysis_router.post("/analyze-incremental", response_model=IncrementalAnalysisResponse)
+async def analyze_incremental(request: IncrementalAnalysisRequest = Depends(source_body(IncrementalAnalysisRequest))):
+    result = await incremental_analysis(request.file_path, request.code, request.detectors, request.tolerant)
+    if result is None:
+        raise HTTPException(status_code=400, detail="Invalid code")
+    elif result.get('success') is False:
+        print(result.get('error'))
+    return result
+
+@analysis_router.post("/batch-analyze")
+async def batch_analyze(request: BatchAnalyzeRequest):
+    # One BatchFileResult per line, written as soon as each file is done
+    return StreamingResponse(
+        stream_batch_analysis(request.files, request.detectors, request.function_names, request.global_variables, request.tolerant),
+        media_type="application/x-ndjson"
+    )
+
 @analysis_router.post("/overly-complex-conditionals", response_model=ComplexConditonalResponse)
-async def overly_complex_conditionals(request: AnalysisRequest):
-    result = overly_complex_conditionals_analysis(request.code)
+async def overly_complex_conditionals(request: AnalysisRequest = Depends(source_body(AnalysisRequest))):
+    result = await run_analysis(overly_complex_conditionals_analysis, request.code, key=request.code)
     if result is None:
         raise HTTPException(status_code=400, detail="Invalid code")
     elif result.get('success') is False:
@@ -43,8 +85,8 @@ async def overly_complex_conditionals(request: AnalysisRequest):
     return result
 
 @analysis_router.post("/unreachable-code", response_model=UnreachableResponse)
-async def unreachable_code(request: AnalysisRequest):
-    result = unreachable_code_check(request.code)
+async def unreachable_code(request: AnalysisRequest = Depends(source_body(AnalysisRequest))):
+    result = await run_analysis(unreachable_code_check, request.code, key=request.code)
     if result is None:
         raise HTTPException(status_code=400, detail="Invalid code")
     elif result.get('success') is False:
@@ -52,8 +94,8 @@ async def unreachable_code(request: AnalysisRequest):
     return result
 
 @analysis_router.post("/temporary-field", response_model=TemporaryVariableResponse)
-async def temporary_field(request: AnalysisRequest):
-    result = check_temporary_field(request.code)
+async def temporary_field(request: AnalysisRequest = Depends(source_body(AnalysisRequest))):
+    result = await run_analysis(check_temporary_field, request.code, key=request.code)
     if result is None:
         raise HTTPException(status_code=400, detail="Invalid code")
     elif result.get('success') is False:
@@ -61,8 +103,14 @@ async def temporary_field(request: AnalysisRequest):
     return result
 
 @analysis_router.post("/dead-code", response_model=DeadCodeResponse)
-async def dead_code(request: DeadCodeRequest):
-    result = deadcode_analysis(request.code, request.function_names, request.global_variables)
+async def dead_code(request: DeadCodeRequest = Depends(source_body(DeadCodeRequest))):
+    result = await run_analysis(deadcode_analysis, request.code, request.function_names, request.global_variables, key=request.code)
+    if request.project is not None and result is not None and result.get('success'):
+        if request.file_path is not None:
+            symbols = await run_analysis(extract_file_symbols, {request.file_path: request.code}, key=request.code)
+            if symbols.get('success'):
+                index_symbols(request.project, symbols['symbols'])
+        result = filter_project_dead_code(request.project, request.file_path, result)
     print('result',result)
     if result is None:
         raise HTTPException(status_code=400, detail="Invalid code")
@@ -71,8 +119,8 @@ async def dead_code(request: DeadCodeRequest):
     return result   
 
 @analysis_router.post("/dead-class", response_model=DeadClassResponse)
-async def dead_class(request: DeadClassRequest):
-    result = dead_class_analysis(request.code, request.class_name)
+async def dead_class(request: DeadClassRequest = Depends(source_body(DeadClassRequest))):
+    result = await run_analysis(dead_class_analysis, request.code, request.class_name, key=request.code)
     if result is None:
         raise HTTPException(status_code=400, detail="Invalid code")
     elif result.get('success') is False:
@@ -81,8 +129,8 @@ async def dead_class(request: DeadClassRequest):
     
 
 @analysis_router.post("/magic-numbers", response_model=MagicNumbersResponse)
-async def magic_numbers(request: AnalysisRequest):
-    result = magic_num_analysis(request.code)
+async def magic_numbers(request: AnalysisRequest = Depends(source_body(AnalysisRequest))):
+    result = await run_analysis(magic_num_analysis, request.code, key=request.code)
     if result is None:
         raise HTTPException(status_code=400, detail="Invalid code")
     elif result.get('success') is False:
@@ -91,8 +139,8 @@ async def magic_numbers(request: AnalysisRequest):
     return result
     
 @analysis_router.post("/unused-variables", response_model=UnusedVariablesResponse)
-async def unused_variables(request: AnalysisRequest):
-    result = unused_variables_analysis(request.code)  
+async def unused_variables(request: AnalysisRequest = Depends(source_body(AnalysisRequest))):
+    result = await run_analysis(unused_variables_analysis, request.code, key=request.code)
     
     if result is None:
         raise HTTPException(status_code=400, detail="Invalid code")
@@ -103,8 +151,8 @@ async def unused_variables(request: AnalysisRequest):
 
 
 @analysis_router.post("/naming-convention", response_model=InconsistentNamingResponse)
-async def naming_convention(request: AnalysisRequest):
-    result = naming_convention_analysis(request.code)
+async def naming_convention(request: AnalysisRequest = Depends(source_body(AnalysisRequest))):
+    result = await run_analysis(naming_convention_analysis, request.code, key=request.code)
     if result is None:
         raise HTTPException(status_code=400, detail="Invalid code")
     elif result.get('success') is False:
@@ -112,8 +160,17 @@ async def naming_convention(request: AnalysisRequest):
     return result
 
 @analysis_router.post("/duplicated-code", response_model=DuplicateCodeResponse)
-async def duplicated_code(request: AnalysisRequest):
-    result = duplicated_code_analysis(request.code)
+async def duplicated_code(request: DuplicateCodeRequest = Depends(source_body(DuplicateCodeRequest))):
+    result = await run_analysis(duplicated_code_analysis, request.code, request.vectorized, key=request.code)
+    if result is None:
+        raise HTTPException(status_code=400, detail="Invalid code")
+    elif result.get('success') is False:
+        print(result.get('error'))
+    return result
+
+@analysis_router.post("/structural-clones", response_model=StructuralCloneResponse)
+async def structural_clones(request: StructuralCloneRequest = Depends(source_body(StructuralCloneRequest))):
+    result = await run_analysis(structural_clone_analysis, request.code, request.min_nodes, key=request.code)
     if result is None:
         raise HTTPException(status_code=400, detail="Invalid code")
     elif result.get('success') is False:
@@ -121,8 +178,8 @@ async def duplicated_code(request: AnalysisRequest):
     return result
 
 @analysis_router.post("/parameter-list", response_model=LongParameterListResponse)
-async def parameter_list(request: AnalysisRequest):
-    result = parameter_list_analysis(request.code)
+async def parameter_list(request: AnalysisRequest = Depends(source_body(AnalysisRequest))):
+    result = await run_analysis(parameter_list_analysis, request.code, key=request.code)
     if result is None:
         raise HTTPException(status_code=400, detail="Invalid code")
     elif result.get('success') is False:
@@ -130,9 +187,9 @@ async def parameter_list(request: AnalysisRequest):
     return result
 
 @analysis_router.post("/global-conflict", response_model=VariableConflictResponse)
-async def global_conflict(request: VariableConflictRequest):
+async def global_conflict(request: VariableConflictRequest = Depends(source_body(VariableConflictRequest))):
     
-    result = global_variable_analysis(request.code, request.global_variables)
+    result = await run_analysis(global_variable_analysis, request.code, request.global_variables, key=request.code)
     print("result",result)
     if result is None:
         raise HTTPException(status_code=400, detail="Invalid code")
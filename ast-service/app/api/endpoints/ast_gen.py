@@ -1,16 +1,66 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import JSONResponse, StreamingResponse
+from typing import Optional
 from app.models.ast_models import CodeRequest, CodeResponse
-from app.service.ast_service import generate_ast
+from app.service.ast_service import generate_ast, ast_json_batch, ast_envelope
+from app.utils.ast_cache import ast_cache
+from app.utils.result_store import result_store
+from app.utils.analysis.control_flow import cfg_cache
+from app.service.executor import analysis_executor, run_analysis
+from app.utils.source_upload import source_body
 
 gen_router = APIRouter()
 
 @gen_router.post("/analyze-ast", response_model=CodeResponse)
-async def analyze_ast(request: CodeRequest):
-    result = generate_ast(request.code)
+async def analyze_ast(request: CodeRequest = Depends(source_body(CodeRequest)), fields: Optional[str] = None):
+    # ?fields=function_names,imports takes precedence over the body's list
+    selected = fields.split(',') if fields is not None else request.fields
+    if selected is not None:
+        selected = sorted({field.strip() for field in selected if field.strip()})
+    result = await run_analysis(generate_ast, request.code, selected, key=request.code)
     if result is None:
         raise HTTPException(status_code=400, detail="Invalid code")
     elif result.get('success') is False:
         print(result.get('error'))
+    elif request.include_ast if selected is None else 'ast' in selected:
+        batch = await run_analysis(ast_json_batch, request.code, request.include_positions, key=request.code)
+        if not batch.get('success'):
+            print(batch.get('error'))
+            return batch
+        # Same fields, with the tree as a JSON object streamed in after them
+        return StreamingResponse(
+            stream_ast(request, result, batch),
+            media_type="application/json"
+        )
+    elif selected is not None:
+        # Fields that were not asked for are left out rather than sent as null
+        return JSONResponse(result)
     return result
 
+async def stream_ast(request: CodeRequest, result: dict, batch: dict):
+    # One batch is encoded at a time, and the next only once this one is sent
+    head, tail = ast_envelope(result)
+    yield head
+    yield batch['json']
+    while batch['next'] is not None:
+        batch = await run_analysis(ast_json_batch, request.code, request.include_positions,
+                                   batch['next'], key=request.code)
+        if not batch.get('success'):
+            raise RuntimeError(batch.get('error'))
+        yield batch['json']
+    yield tail
 
+@gen_router.get("/ast-cache/stats")
+async def ast_cache_stats():
+    return analysis_executor.cache_stats('ast_cache', ast_cache.stats())
+
+@gen_router.get("/cfg-cache/stats")
+async def cfg_cache_stats():
+    return analysis_executor.cache_stats('cfg_cache', cfg_cache.stats())
+
+@gen_router.get("/result-store/stats")
+async def result_store_stats():
+    return {
+        **analysis_executor.cache_stats('result_store', result_store.stats()),
+        **result_store.size_stats()
+    }
@@ -0,0 +1,51 @@
+from fastapi import APIRouter
+from app.models.clone_models import (
+    CloneIndexFilesRequest,
+    CloneIndexRemoveRequest,
+    CloneQueryRequest,
+    CloneIndexResponse,
+    CloneQueryResponse
+)
+from app.service.clone_service import (
+    fingerprint_files,
+    index_files,
+    remove_files,
+    find_clones,
+    clone_index_stats
+)
+from app.service.executor import run_analysis
+
+clone_router = APIRouter()
+
+@clone_router.post("/clone-index/files", response_model=CloneIndexResponse)
+async def clone_index_files(request: CloneIndexFilesRequest):
+    result = await run_analysis(fingerprint_files, request.files)
+    if result.get('success'):
+        result = index_files(request.project, result['fingerprints'])
+    if result.get('success') is False:
+        print(result.get('error'))
+    return result
+
+@clone_router.post("/clone-index/remove", response_model=CloneIndexResponse)
+async def clone_index_remove(request: CloneIndexRemoveRequest):
+    result = remove_files(request.project, request.file_paths)
+    if result.get('success') is False:
+        print(result.get('error'))
+    return result
+
+@clone_router.post("/clone-index/query", response_model=CloneQueryResponse)
+async def clone_index_query(request: CloneQueryRequest):
+    result = {'success': True}
+    if request.code is not None:
+        result = await run_analysis(fingerprint_files, {request.file_path: request.code}, key=request.code)
+        if result.get('success'):
+            result = index_files(request.project, result['fingerprints'])
+    if result.get('success'):
+        result = find_clones(request.project, request.file_path)
+    if result.get('success') is False:
+        print(result.get('error'))
+    return result
+
+@clone_router.get("/clone-index/stats/{project}", response_model=CloneIndexResponse)
+async def clone_index_project_stats(project: str):
+    return clone_index_stats(project)
@@ -0,0 +1,19 @@
+from fastapi import APIRouter
+from app.models.dependency_models import DependencyGraphRequest, DependencyGraphResponse
+from app.service.dependency_service import update_dependency_graph, dependency_graph_data
+
+dependency_router = APIRouter()
+
+@dependency_router.post("/dependency-graph/files", response_model=DependencyGraphResponse)
+async def dependency_graph_files(request: DependencyGraphRequest):
+    seed = {file_path: node.model_dump(mode='json') for file_path, node in request.seed.items()} \
+        if request.seed is not None else None
+    result = await update_dependency_graph(request.project, request.files, request.removed, request.full_graph,
+                                           seed, request.require_seed)
+    if result.get('success') is False and not result.get('needs_seed'):
+        print(result.get('error'))
+    return result
+
+@dependency_router.get("/dependency-graph/{project}", response_model=DependencyGraphResponse)
+async def dependency_graph_get(project: str):
+    return dependency_graph_data(project)
@@ -0,0 +1,40 @@
+from fastapi import APIRouter
+from app.models.symbol_models import (
+    SymbolIndexFilesRequest,
+    SymbolIndexRemoveRequest,
+    SymbolUsageRequest,
+    SymbolIndexResponse,
+    SymbolUsageResponse
+)
+from app.service.symbol_service import (
+    extract_file_symbols,
+    index_symbols,
+    remove_symbols,
+    find_symbol_usages
+)
+from app.service.executor import run_analysis
+
+symbol_router = APIRouter()
+
+@symbol_router.post("/symbol-index/files", response_model=SymbolIndexResponse)
+async def symbol_index_files(request: SymbolIndexFilesRequest):
+    result = await run_analysis(extract_file_symbols, request.files)
+    if result.get('success'):
+        result = index_symbols(request.project, result['symbols'])
+    if result.get('success') is False:
+        print(result.get('error'))
+    return result
+
+@symbol_router.post("/symbol-index/remove", response_model=SymbolIndexResponse)
+async def symbol_index_remove(request: SymbolIndexRemoveRequest):
+    result = remove_symbols(request.project, request.file_paths)
+    if result.get('success') is False:
+        print(result.get('error'))
+    return result
+
+@symbol_router.post("/symbol-index/usages", response_model=SymbolUsageResponse)
+async def symbol_index_usages(request: SymbolUsageRequest):
+    result = find_symbol_usages(request.project, request.name)
+    if result.get('success') is False:
+        print(result.get('error'))
+    return result
@@ -0,0 +1,38 @@
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+
+class CloneIndexFilesRequest(BaseModel):
+    project: str
+    files: Dict[str, str]  # file path -> code, added or replaced in the index
+
+class CloneIndexRemoveRequest(BaseModel):
+    project: str
+    file_paths: List[str]
+
+class CloneQueryRequest(BaseModel):
+    project: str
+    file_path: str
+    code: Optional[str] = None  # Indexes (or re-indexes) the file before querying
+
+class CloneIndexResponse(BaseModel):
+    indexed_files: Optional[int] = None
+    fingerprints: Optional[int] = None
+    success: bool
+    error: Optional[str] = None
+
+class CloneMatch(BaseModel):
+    start_line: int
+    end_line: int
+    other_start_line: int
+    other_end_line: int
+
+class FileClones(BaseModel):
+    file_path: str
+    shared_fingerprints: int
+    matches: List[CloneMatch]
+
+class CloneQueryResponse(BaseModel):
+    file_path: Optional[str] = None
+    clones: Optional[List[FileClones]] = None
+    success: bool
+    error: Optional[str] = None
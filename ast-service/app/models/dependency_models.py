@@ -0,0 +1,42 @@
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
+from enum import Enum
+
+class SourceEnum(str, Enum):
+    Exporting = "Exporting"
+    Importing = "Importing"
+
+class UtilizedEntity(BaseModel):
+    name: str
+    type: str
+    alias: Optional[str] = None
+    source: SourceEnum
+
+class DependentNode(BaseModel):
+    name: str
+    alias: Optional[str] = None
+    valid: bool
+    weight: List[UtilizedEntity] = Field(default_factory=list)
+
+class FileNode(BaseModel):
+    name: str
+    dependencies: List[DependentNode] = Field(default_factory=list)
+
+class DependencyGraphRequest(BaseModel):
+    project: str
+    files: Dict[str, str] = Field(default_factory=dict)  # file path -> code, added or replaced in the graph
+    removed: List[str] = Field(default_factory=list)
+    full_graph: bool = False  # True returns every node rather than only the ones this update changed
+    # Stored graph to start from when the service holds none for the project
+    seed: Optional[Dict[str, FileNode]] = None
+    # With no seed, answer needs_seed instead of starting an empty graph
+    require_seed: bool = False
+
+class DependencyGraphResponse(BaseModel):
+    graph: Optional[Dict[str, FileNode]] = None
+    updated_files: Optional[List[str]] = None
+    removed_files: Optional[List[str]] = None
+    errors: Optional[Dict[str, str]] = None  # file path -> parse error
+    needs_seed: Optional[bool] = None
+    success: bool
+    error: Optional[str] = None
@@ -0,0 +1,38 @@
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+
+class SymbolIndexFilesRequest(BaseModel):
+    project: str
+    files: Dict[str, str]  # file path -> code, added or replaced in the index
+
+class SymbolIndexRemoveRequest(BaseModel):
+    project: str
+    file_paths: List[str]
+
+class SymbolUsageRequest(BaseModel):
+    project: str
+    name: str  # Methods are named Class.method
+
+class SymbolIndexResponse(BaseModel):
+    indexed_files: Optional[int] = None
+    definitions: Optional[int] = None
+    names: Optional[int] = None
+    success: bool
+    error: Optional[str] = None
+
+class SymbolDefinition(BaseModel):
+    file_path: str
+    name: str
+    kind: str
+    line_number: int
+
+class SymbolUsage(BaseModel):
+    file_path: str
+    count: int
+
+class SymbolUsageResponse(BaseModel):
+    name: Optional[str] = None
+    definitions: Optional[List[SymbolDefinition]] = None
+    usages: Optional[List[SymbolUsage]] = None
+    success: bool
+    error: Optional[str] = None
@@ -1,23 +1,21 @@
-import ast
 import json
 from typing import List
-from app.utils.ast_encoder import ASTEncoder
+from app.utils.ast_encoder import iter_module_json
+from app.utils.ast_cache import parse_code
+from app.utils.tolerant_parse import parse_tolerant
+from app.utils.result_store import cached_result
+from app.utils.metrics import instrumented
+from app.service.settings import AST_STREAM_BATCH_CHARS
 
 from app.utils.analysis.long_parameters import get_parameter_list 
 from app.utils.analysis.duplicate_code import get_duplicated_code
+from app.utils.analysis.structural_clones import find_structural_clones
 from app.utils.analysis.naming_convention import get_naming_convention
 from app.utils.analysis.magic_number import get_magic_numbers 
 from app.utils.analysis.unused_variables import get_unused_variables
 
 
-from app.utils.ast_process import (
-    get_function_names_from_ast,
-    get_class_details_from_ast,
-    get_global_variables_from_ast,
-    check_main_block_in_ast,
-    get_imports_from_ast,
-    check_standalone_file
-)
+from app.utils.ast_process import METADATA_FIELDS, extract_module_metadata
 
 from app.utils.analysis.dead_code import (
     get_unutilized_functions,
@@ -35,9 +33,61 @@ from app.utils.analysis.unreachable import unreachable_code_analysis
 
 from app.utils.analysis.temporary_field import analyze_temporary_fields
 
+from app.utils.analysis.combined_analysis import DETECTORS, run_detectors, detector_result
+
+# Fields /analyze-ast can be asked for
+AST_FIELDS = ('ast',) + METADATA_FIELDS
+
+@instrumented('analyze_all')
+@cached_result('analyze_all', version=6)
+def analyze_all(code: str,
+                detectors: List[str] = None,
+                function_names: List[str] = None,
+                global_variables: list = None,
+                tolerant: bool = False) -> dict:
+    detectors = list(detectors) if detectors else list(DETECTORS)
+    unknown = [name for name in detectors if name not in DETECTORS]
+    if unknown:
+        return {
+            'success': False,
+            'error': f"Unknown detectors: {', '.join(unknown)}"
+        }
+
+    syntax_errors = None
+    try:
+        if tolerant:
+            # Analyse the chunks that parse and report the broken ones
+            parsed_ast, syntax_errors = parse_tolerant(code)
+        else:
+            parsed_ast = parse_code(code)
+    except Exception as e:
+        # The duplicate scan is line based and still works on broken code
+        results = {name: detector_result(error=e) for name in detectors if name != 'duplicated_code'}
+        if 'duplicated_code' in detectors:
+            results.update(run_detectors(None, code, ['duplicated_code'], [], []))
+        return {
+            **results,
+            'success': False,
+            'error': str(e)
+        }
+
+    try:
+        return {
+            **run_detectors(parsed_ast, code, detectors, function_names or [], global_variables or []),
+            'syntax_errors': syntax_errors,
+            'success': True
+        }
+    except Exception as e:
+        return {
+            'success': False,
+            'error': str(e)
+        }
+
+@instrumented('temporary_field')
+@cached_result('temporary_field')
 def check_temporary_field(code: str) -> dict:
     try:
-        parsed_ast = ast.parse(code)    
+        parsed_ast = parse_code(code)    
         return {
             'temporary_fields': analyze_temporary_fields(parsed_ast),
             'success': True
@@ -49,6 +99,8 @@ def check_temporary_field(code: str) -> dict:
             'error': str(e)
         }
 
+@instrumented('unreachable_code')
+@cached_result('unreachable_code', version=4)
 def unreachable_code_check(code: str) -> dict:
     try:
         return {
@@ -62,6 +114,8 @@ def unreachable_code_check(code: str) -> dict:
             'error': str(e)
         }
 
+@instrumented('overly_complex_condition')
+@cached_result('overly_complex_condition', version=2)
 def overly_complex_conditionals_analysis(code: str) -> dict:
     try:
         return {
@@ -75,9 +129,11 @@ def overly_complex_conditionals_analysis(code: str) -> dict:
             'error': str(e)
         }
 
+@instrumented('global_conflict')
+@cached_result('global_conflict', version=2)
 def global_variable_analysis(code: str, global_variables: list) -> dict:
     try:
-        parsed_ast = ast.parse(code)
+        parsed_ast = parse_code(code)
         return {
             'conflicts_report': global_variable_conflicts(parsed_ast, global_variables),
             'success': True
@@ -89,9 +145,11 @@ def global_variable_analysis(code: str, global_variables: list) -> dict:
             'error': str(e)
         }
 
+@instrumented('dead_class')
+@cached_result('dead_class')
 def dead_class_analysis(code: str, class_name: str) -> dict:
     try:
-        parsed_ast = ast.parse(code)
+        parsed_ast = parse_code(code)
         return {
             'class_details': get_class_utiliztion_details(parsed_ast, class_name),
             'success': True
@@ -103,11 +161,13 @@ def dead_class_analysis(code: str, class_name: str) -> dict:
             'error': str(e)
         }
 
+@instrumented('dead_code')
+@cached_result('dead_code')
 def deadcode_analysis(code: str, 
                       function_names: List[str], 
                       global_variables: list) -> dict:
     try:
-        parsed_ast = ast.parse(code)
+        parsed_ast = parse_code(code)
         return {
             'function_names': get_unutilized_functions(parsed_ast, function_names),
             'class_details': get_unutilized_classes(parsed_ast),
@@ -126,9 +186,11 @@ def deadcode_analysis(code: str,
         }
     
     
+@instrumented('magic_numbers')
+@cached_result('magic_numbers')
 def magic_num_analysis(code: str):
     try:
-        parsed_ast = ast.parse(code)
+        parsed_ast = parse_code(code)
         magic_nums = get_magic_numbers(parsed_ast)
         print("Magic Number", magic_nums)
         return {
@@ -141,9 +203,11 @@ def magic_num_analysis(code: str):
             'error': str(e)
         }
 
+@instrumented('unused_variables')
+@cached_result('unused_variables', version=2)
 def unused_variables_analysis(code: str):
     try:
-        parsed_ast = ast.parse(code)
+        parsed_ast = parse_code(code)
         unused_variables = get_unused_variables(parsed_ast)
         return {
             'unused_variables': unused_variables,
@@ -155,9 +219,11 @@ def unused_variables_analysis(code: str):
             'error': str(e)
         }
 
+@instrumented('naming_convention')
+@cached_result('naming_convention', version=2)
 def naming_convention_analysis(code: str):
     try:
-        parsed_ast = ast.parse(code)
+        parsed_ast = parse_code(code)
         naming_convention = get_naming_convention(parsed_ast)
         return {
             'inconsistent_naming': naming_convention,
@@ -170,9 +236,11 @@ def naming_convention_analysis(code: str):
             'error': str(e)
         }
 
-def duplicated_code_analysis(code: str):
+@instrumented('duplicated_code')
+@cached_result('duplicated_code')
+def duplicated_code_analysis(code: str, vectorized: bool = None):
     try:
-        duplicated_code = get_duplicated_code(code)
+        duplicated_code = get_duplicated_code(code, vectorized)
         print(duplicated_code)
         return {
             'duplicate_code': duplicated_code,
@@ -184,9 +252,27 @@ def duplicated_code_analysis(code: str):
             'error': str(e)
         }
 
+@instrumented('structural_clones')
+@cached_result('structural_clones')
+def structural_clone_analysis(code: str, min_nodes: int):
+    try:
+        parsed_ast = parse_code(code)
+        structural_clones = find_structural_clones(parsed_ast, min_nodes)
+        return {
+            'structural_clones': structural_clones,
+            'success': True
+        }
+    except Exception as e:
+        return {
+            'success': False,
+            'error': str(e)
+        }
+
+@instrumented('long_parameter_list')
+@cached_result('long_parameter_list')
 def parameter_list_analysis(code: str):
     try:
-        parsed_ast = ast.parse(code)
+        parsed_ast = parse_code(code)
         parameter_list = get_parameter_list(parsed_ast)
         return {
             'long_parameter_list': parameter_list,
@@ -199,18 +285,61 @@ def parameter_list_analysis(code: str):
         }
 
 
-def generate_ast(code: str) -> dict:
+@instrumented('analyze_ast')
+@cached_result('analyze_ast', version=2)
+def generate_ast(code: str, fields: List[str] = None) -> dict:
+    if fields is not None:
+        unknown = [field for field in fields if field not in AST_FIELDS]
+        if unknown:
+            return {
+                'success': False,
+                'error': f"Unknown fields: {', '.join(unknown)}"
+            }
     try: 
-        parsed_ast = ast.parse(code)
-        ast_json = json.dumps(parsed_ast, cls=ASTEncoder, indent=4)
-        return {
-            'ast': ast_json,
-            'function_names': get_function_names_from_ast(ast_json),
-            'class_details': get_class_details_from_ast(ast_json),
-            'global_variables': get_global_variables_from_ast(ast_json),
-            'is_main_block_present': check_main_block_in_ast(ast_json),
-            'imports': get_imports_from_ast(ast_json),
-            'is_standalone_file': not check_standalone_file(ast_json),
+        parsed_ast = parse_code(code)
+        if fields is not None:
+            # Sparse response: only what was asked for is computed
+            return {
+                **extract_module_metadata(parsed_ast, fields),
+                'success': True
+            }
+        # The tree itself is streamed in batches by ast_json_batch, not kept in the result
+        return {
+            'ast': None,
+            **extract_module_metadata(parsed_ast),
+            'success': True
+        }
+    except Exception as e:
+        return {
+            'success': False,
+            'error': str(e)
+        }
+
+
+def ast_json_batch(code: str, include_positions: bool = False, start: int = 0) -> dict:
+    """
+    Encode the module's statements from ``start`` until about
+    AST_STREAM_BATCH_CHARS characters are written. ``next`` is the statement
+    to continue from, or None once the document is complete.
+    """
+    try:
+        parsed_ast = parse_code(code)
+        pieces = []
+        size = 0
+        index = start
+        while True:
+            for chunk in iter_module_json(parsed_ast, index, index + 1, include_positions):
+                pieces.append(chunk)
+                size += len(chunk)
+            index += 1
+            if index >= len(parsed_ast.body):
+                index = None
+                break
+            if size >= AST_STREAM_BATCH_CHARS:
+                break
+        return {
+            'json': ''.join(pieces),
+            'next': index,
             'success': True
         }
     except Exception as e:
@@ -218,4 +347,9 @@ def generate_ast(code: str) -> dict:
             'success': False,
             'error': str(e)
         }
-    
\ No newline at end of file
+
+
+def ast_envelope(result: dict) -> tuple:
+    """The text around the encoded tree that makes the /analyze-ast result one JSON document."""
+    metadata = {key: value for key, value in result.items() if key != 'ast'}
+    return json.dumps(metadata, separators=(',', ':'))[:-1] + ',"ast":', '}'
@@ -0,0 +1,37 @@
+import asyncio
+import json
+from fastapi.encoders import jsonable_encoder
+from app.service.ast_service import analyze_all
+from app.models.ast_models import AnalyzeAllResponse
+from app.service.executor import analysis_executor, run_analysis
+
+
+async def stream_batch_analysis(files: dict,
+                                detectors: list = None,
+                                function_names: list = None,
+                                global_variables: list = None,
+                                tolerant: bool = False):
+    """
+    Run analyze_all over every file in parallel and yield one NDJSON line per
+    file, in the order the files finish.
+    """
+    # One file per worker at a time, so a large batch neither fills the
+    # executor's queue nor crowds out other requests
+    limit = asyncio.Semaphore(max(analysis_executor.workers, 1))
+
+    async def analyze_file(file_path, code):
+        async with limit:
+            result = await run_analysis(analyze_all, code, detectors, function_names, global_variables, tolerant, key=code)
+        return file_path, result
+
+    tasks = [asyncio.ensure_future(analyze_file(file_path, code)) for file_path, code in files.items()]
+    try:
+        for finished in asyncio.as_completed(tasks):
+            file_path, result = await finished
+            # Through the /analyze-all response model, which formats the findings
+            result = AnalyzeAllResponse.model_validate(result).model_dump(exclude_unset=True)
+            yield json.dumps(jsonable_encoder({'file_path': file_path, **result})) + '\n'
+    finally:
+        # The client may disconnect mid-stream; drop whatever is still queued
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,63 @@
+from app.utils.analysis.clone_index import CloneIndex, fingerprint_code
+
+# One clone index per project, kept in memory for the life of the service.
+# Fingerprinting is pure and runs in the analysis workers; the indexes
+# themselves are only touched from the main process.
+clone_indexes = {}
+
+
+def get_clone_index(project: str, create: bool = False):
+    index = clone_indexes.get(project)
+    if index is None and create:
+        index = clone_indexes[project] = CloneIndex()
+    return index
+
+def fingerprint_files(files: dict):
+    try:
+        return {
+            'fingerprints': {file_path: fingerprint_code(code) for file_path, code in files.items()},
+            'success': True
+        }
+    except Exception as e:
+        return {'success': False, 'error': str(e)}
+
+def index_files(project: str, fingerprints: dict):
+    try:
+        index = get_clone_index(project, create=True)
+        for file_path, file_fingerprints in fingerprints.items():
+            index.add_fingerprints(file_path, file_fingerprints)
+        return {**index.stats(), 'success': True}
+    except Exception as e:
+        return {'success': False, 'error': str(e)}
+
+def remove_files(project: str, file_paths: list):
+    try:
+        index = get_clone_index(project)
+        if index is None:
+            return {'success': False, 'error': f"Unknown project: {project}"}
+        for file_path in file_paths:
+            index.remove_file(file_path)
+        return {**index.stats(), 'success': True}
+    except Exception as e:
+        return {'success': False, 'error': str(e)}
+
+def find_clones(project: str, file_path: str):
+    try:
+        index = get_clone_index(project)
+        if index is None:
+            return {'success': False, 'error': f"Unknown project: {project}"}
+        if file_path not in index.files:
+            return {'success': False, 'error': f"File not indexed: {file_path}"}
+        return {
+            'file_path': file_path,
+            'clones': index.find_clones(file_path),
+            'success': True
+        }
+    except Exception as e:
+        return {'success': False, 'error': str(e)}
+
+def clone_index_stats(project: str):
+    index = get_clone_index(project)
+    if index is None:
+        return {'success': False, 'error': f"Unknown project: {project}"}
+    return {**index.stats(), 'success': True}
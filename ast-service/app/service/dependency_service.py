@@ -0,0 +1,67 @@
+import asyncio
+from app.service.executor import analysis_executor, run_analysis
+from app.utils.analysis.dependency_graph import DependencyGraph, extract_imports, normalize_path
+
+# One dependency graph per project, kept in memory for the life of the
+# service. Import extraction is spread over the analysis workers; the graphs
+# are only touched from the main process.
+dependency_graphs = {}
+
+
+def get_dependency_graph(project: str, create: bool = False):
+    graph = dependency_graphs.get(project)
+    if graph is None and create:
+        graph = dependency_graphs[project] = DependencyGraph()
+    return graph
+
+async def extract_project_imports(files: dict) -> dict:
+    items = list(files.items())
+    chunks = max(1, min(analysis_executor.workers, len(items)))
+    results = await asyncio.gather(*(
+        run_analysis(extract_imports, dict(items[i::chunks])) for i in range(chunks)
+    ))
+    imports = {}
+    errors = {}
+    for result in results:
+        if not result.get('success'):
+            return result
+        imports.update(result['imports'])
+        errors.update(result['errors'])
+    return {'imports': imports, 'errors': errors, 'success': True}
+
+async def update_dependency_graph(project: str, files: dict, removed: list = None, full_graph: bool = False,
+                                  seed: dict = None, require_seed: bool = False) -> dict:
+    if require_seed and seed is None and get_dependency_graph(project) is None:
+        # The caller holds the stored graph; patching an empty one would lose it
+        return {
+            'needs_seed': True,
+            'success': False,
+            'error': f"No graph held for project: {project}"
+        }
+    extracted = await extract_project_imports(files) if files else {'imports': {}, 'errors': {}, 'success': True}
+    if not extracted.get('success'):
+        return extracted
+    try:
+        graph = get_dependency_graph(project)
+        if graph is None:
+            graph = get_dependency_graph(project, create=True)
+            if seed:
+                graph.seed(seed)
+        gone = {normalize_path(file_path) for file_path in removed or []} & graph.imports.keys()
+        updated = graph.remove_files(removed or [])
+        updated |= graph.update_files(extracted['imports'])
+        return {
+            'graph': graph.to_graph(None if full_graph else updated),
+            'updated_files': sorted(file_path for file_path in updated if file_path in graph.imports),
+            'removed_files': sorted(gone),
+            'errors': extracted['errors'],
+            'success': True
+        }
+    except Exception as e:
+        return {'success': False, 'error': str(e)}
+
+def dependency_graph_data(project: str) -> dict:
+    graph = get_dependency_graph(project)
+    if graph is None:
+        return {'success': False, 'error': f"Unknown project: {project}"}
+    return {'graph': graph.to_graph(), 'success': True}
@@ -0,0 +1,103 @@
+import asyncio
+import threading
+import weakref
+from collections import OrderedDict
+from app.service.settings import INCREMENTAL_MAX_FILES
+from app.service.executor import run_analysis
+from app.utils.analysis.combined_analysis import detector_result
+from app.utils.analysis.incremental import LOCAL_DETECTORS, scan_segments, merge_segments
+
+
+class IncrementalStore:
+    """
+    Per-file segment state for incremental analysis, kept in the main
+    process so it survives whichever worker handles the next request.
+    Each file maps segment hash -> detector name -> partial state. Only the
+    segments present in the latest version of a file are kept, and the
+    least recently analysed files are dropped past ``max_files``.
+    Requests for the same file are serialised with ``file_lock`` so the
+    hashes a scan skips are still stored when its result is saved.
+    """
+
+    def __init__(self, max_files: int = INCREMENTAL_MAX_FILES):
+        self.max_files = max_files
+        self.files = OrderedDict()
+        self.lock = threading.Lock()
+        self.file_locks = weakref.WeakValueDictionary()
+
+    def file_lock(self, file_path: str) -> asyncio.Lock:
+        with self.lock:
+            lock = self.file_locks.get(file_path)
+            if lock is None:
+                lock = self.file_locks[file_path] = asyncio.Lock()
+            return lock
+
+    def known_hashes(self, file_path: str, detectors: list) -> set:
+        with self.lock:
+            segments = self.files.get(file_path, {})
+            return {key for key, partial in segments.items() if all(name in partial for name in detectors)}
+
+    def update(self, file_path: str, segments: list, detectors: list) -> tuple:
+        """
+        Store the latest segments of a file and return their (offset, partial)
+        pairs, with the hashes of skipped segments whose state is no longer
+        stored, e.g. because the file was evicted during the scan.
+        """
+        with self.lock:
+            previous = self.files.pop(file_path, {})
+            current = {}
+            merged = []
+            missing = set()
+            for key, offset, partial in segments:
+                stored = current.get(key) or previous.get(key) or {}
+                if partial is not None:
+                    stored = {**stored, **partial}
+                elif not all(name in stored for name in detectors):
+                    missing.add(key)
+                current[key] = stored
+                merged.append((offset, stored))
+            self.files[file_path] = current
+            while len(self.files) > self.max_files:
+                self.files.popitem(last=False)
+            return merged, missing
+
+    def forget(self, file_path: str):
+        with self.lock:
+            self.files.pop(file_path, None)
+
+
+incremental_store = IncrementalStore()
+
+
+async def incremental_analysis(file_path: str, code: str, detectors: list = None, tolerant: bool = False) -> dict:
+    detectors = list(detectors) if detectors else list(LOCAL_DETECTORS)
+    unknown = [name for name in detectors if name not in LOCAL_DETECTORS]
+    if unknown:
+        return {
+            'success': False,
+            'error': f"Not available incrementally: {', '.join(unknown)}"
+        }
+
+    async with incremental_store.file_lock(file_path):
+        known = incremental_store.known_hashes(file_path, detectors)
+        while True:
+            scanned = await run_analysis(scan_segments, code, known, detectors, tolerant, key=file_path)
+            if not scanned.get('success'):
+                return scanned
+            segments, missing = incremental_store.update(file_path, scanned['segments'], detectors)
+            if not missing:
+                break
+            # Analyse the segments whose stored state went away again
+            known -= missing
+
+    results = {}
+    for name, (data, error) in merge_segments(segments, detectors).items():
+        results[name] = detector_result(data) if error is None else detector_result(error=error)
+    analyzed = sum(1 for _, _, partial in scanned['segments'] if partial is not None)
+    return {
+        **results,
+        'analyzed_segments': analyzed,
+        'reused_segments': len(segments) - analyzed,
+        'syntax_errors': scanned.get('syntax_errors'),
+        'success': True
+    }
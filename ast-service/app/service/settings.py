@@ -0,0 +1,36 @@
+import os
+
+# Upper bound for the parsed-AST cache, estimated from the source size
+AST_CACHE_MAX_BYTES = int(os.getenv('AST_CACHE_MAX_BYTES', 256 * 1024 * 1024))
+
+# Worker processes for CPU-bound analysis; 0 runs everything on the event loop
+ANALYSIS_WORKERS = int(os.getenv('ANALYSIS_WORKERS', os.cpu_count() or 1))
+# Seconds a single analysis task may run before its worker is replaced
+ANALYSIS_TASK_TIMEOUT = float(os.getenv('ANALYSIS_TASK_TIMEOUT', 60))
+# Tasks that may wait for a busy worker; further tasks are refused rather than queued
+ANALYSIS_MAX_QUEUED = int(os.getenv('ANALYSIS_MAX_QUEUED', 256))
+
+# /analyze-ast encodes the tree in tasks of about this many characters each
+AST_STREAM_BATCH_CHARS = int(os.getenv('AST_STREAM_BATCH_CHARS', 1024 * 1024))
+
+# Files whose per-definition results are kept for /analyze-incremental
+INCREMENTAL_MAX_FILES = int(os.getenv('INCREMENTAL_MAX_FILES', 1024))
+
+# SQLite file holding detector results across restarts; empty disables it
+RESULT_STORE_PATH = os.getenv(
+    'RESULT_STORE_PATH',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), '.cache', 'results.sqlite3')
+)
+# Results are evicted least recently used first once the file holds more than this
+RESULT_STORE_MAX_BYTES = int(os.getenv('RESULT_STORE_MAX_BYTES', 512 * 1024 * 1024))
+
+# Functions whose unreachable-code findings are kept, keyed by a hash of their source
+CFG_CACHE_MAX_FUNCTIONS = int(os.getenv('CFG_CACHE_MAX_FUNCTIONS', 4096))
+
+# Files with at least this many lines use the NumPy duplicate scan when NumPy is installed
+DUPLICATE_VECTORIZED_MIN_LINES = int(os.getenv('DUPLICATE_VECTORIZED_MIN_LINES', 20000))
+
+# Largest request body accepted once a gzip-encoded upload is inflated
+MAX_INFLATED_REQUEST_BYTES = int(os.getenv('MAX_INFLATED_REQUEST_BYTES', 64 * 1024 * 1024))
+# Responses at least this large are gzipped for clients that accept it
+GZIP_MIN_RESPONSE_BYTES = int(os.getenv('GZIP_MIN_RESPONSE_BYTES', 1024))
@@ -0,0 +1,85 @@
+from app.utils.ast_cache import parse_code
+from app.utils.analysis.symbol_index import SymbolIndex, extract_symbols
+
+# One symbol index per project, kept in memory for the life of the service.
+# Symbol extraction runs in the analysis workers; the indexes themselves are
+# only touched from the main process.
+symbol_indexes = {}
+
+
+def get_symbol_index(project: str, create: bool = False):
+    index = symbol_indexes.get(project)
+    if index is None and create:
+        index = symbol_indexes[project] = SymbolIndex()
+    return index
+
+def extract_file_symbols(files: dict):
+    try:
+        return {
+            'symbols': {file_path: extract_symbols(parse_code(code)) for file_path, code in files.items()},
+            'success': True
+        }
+    except Exception as e:
+        return {'success': False, 'error': str(e)}
+
+def index_symbols(project: str, symbols: dict):
+    try:
+        index = get_symbol_index(project, create=True)
+        for file_path, file_symbols in symbols.items():
+            index.update_file(file_path, file_symbols)
+        return {**index.stats(), 'success': True}
+    except Exception as e:
+        return {'success': False, 'error': str(e)}
+
+def remove_symbols(project: str, file_paths: list):
+    try:
+        index = get_symbol_index(project)
+        if index is None:
+            return {'success': False, 'error': f"Unknown project: {project}"}
+        for file_path in file_paths:
+            index.remove_file(file_path)
+        return {**index.stats(), 'success': True}
+    except Exception as e:
+        return {'success': False, 'error': str(e)}
+
+def find_symbol_usages(project: str, name: str):
+    index = get_symbol_index(project)
+    if index is None:
+        return {'success': False, 'error': f"Unknown project: {project}"}
+    return {
+        'name': name,
+        'definitions': [
+            {'file_path': file_path, **definition}
+            for file_path, definition in sorted(index.definitions.get(name, {}).items())
+        ],
+        'usages': index.usages(name),
+        'success': True
+    }
+
+def filter_project_dead_code(project: str, file_path: str, result: dict):
+    """
+    Drop dead code findings for names that other files of the project use.
+    Each check is one lookup in the project's usage index.
+    """
+    index = get_symbol_index(project)
+    if index is None or not result.get('success'):
+        return result
+
+    def used(name):
+        return index.used_outside(name, file_path)
+
+    class_details = []
+    for details in result.get('class_details', []):
+        class_name = details['class_name']
+        class_details.append({
+            **details,
+            'unutilized_functions': [fn for fn in details['unutilized_functions'] if not used(fn)],
+            'unutilized_variables': [var for var in details['unutilized_variables'] if not used(var)],
+            'has_instance': details['has_instance'] or used(class_name)
+        })
+    return {
+        **result,
+        'function_names': [fn for fn in result.get('function_names', []) if not used(fn)],
+        'class_details': class_details,
+        'global_variables': [var for var in result.get('global_variables', []) if not used(var)]
+    }
@@ -0,0 +1,166 @@
+import io
+import keyword
+import tokenize
+import zlib
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+# Token k-grams; any shared run of at least K_GRAM + WINDOW - 1 tokens is caught
+K_GRAM = 12
+WINDOW = 8
+# Fingerprints shared by more files than this are boilerplate and not reported
+MAX_POSTINGS = 64
+
+HASH_BASE = 1000003
+HASH_MOD = (1 << 61) - 1
+
+SKIPPED_TOKENS = {
+    tokenize.COMMENT, tokenize.NL, tokenize.NEWLINE, tokenize.INDENT,
+    tokenize.DEDENT, tokenize.ENCODING, tokenize.ENDMARKER
+}
+
+
+def normalize_tokens(code: str) -> List[Tuple[str, int]]:
+    """
+    Tokenize source and replace identifiers and literals with placeholders,
+    so renamed copies produce the same token stream. Returns (token, line).
+    """
+    tokens = []
+    try:
+        for tok in tokenize.generate_tokens(io.StringIO(code).readline):
+            if tok.type in SKIPPED_TOKENS:
+                continue
+            if tok.type == tokenize.NAME and not keyword.iskeyword(tok.string):
+                text = 'ID'
+            elif tok.type == tokenize.NUMBER:
+                text = 'NUM'
+            elif tok.type == tokenize.STRING:
+                text = 'STR'
+            else:
+                text = tok.string
+            tokens.append((text, tok.start[0]))
+    except (tokenize.TokenError, IndentationError, SyntaxError):
+        # Keep the tokens read before the broken part of the file
+        pass
+    return tokens
+
+
+def fingerprint_code(code: str, k: int = K_GRAM, window: int = WINDOW) -> List[Tuple[int, int, int]]:
+    """
+    Winnow the k-gram hashes of a file.
+
+    Returns (hash, start_line, end_line) for every selected k-gram. Hashes
+    are built from crc32 of the token text so they are stable across
+    processes and restarts.
+    """
+    tokens = normalize_tokens(code)
+    if len(tokens) < k:
+        return []
+
+    token_hashes = [zlib.crc32(text.encode()) for text, _ in tokens]
+    top = pow(HASH_BASE, k - 1, HASH_MOD)
+    grams = []
+    h = 0
+    for i, token_hash in enumerate(token_hashes):
+        if i >= k:
+            h = (h - token_hashes[i - k] * top) % HASH_MOD
+        h = (h * HASH_BASE + token_hash) % HASH_MOD
+        if i >= k - 1:
+            grams.append(h)
+
+    fingerprints = []
+    last_selected = -1
+    window = min(window, len(grams))
+    for start in range(len(grams) - window + 1):
+        # Rightmost minimum, so a shifted window keeps the same pick
+        best = start
+        for idx in range(start + 1, start + window):
+            if grams[idx] <= grams[best]:
+                best = idx
+        if best != last_selected:
+            fingerprints.append((grams[best], tokens[best][1], tokens[best + k - 1][1]))
+            last_selected = best
+    return fingerprints
+
+
+class CloneIndex:
+    """
+    Inverted index from winnowed fingerprints to the files that contain them.
+
+    Files are added, replaced and removed one at a time. A query only looks
+    at the fingerprints of the queried file, so its cost does not grow with
+    the number of files in the project.
+    """
+
+    def __init__(self):
+        self.files: Dict[str, List[Tuple[int, int, int]]] = {}
+        self.postings: Dict[int, Dict[str, List[Tuple[int, int]]]] = defaultdict(dict)
+
+    def add_file(self, file_path: str, code: str):
+        self.add_fingerprints(file_path, fingerprint_code(code))
+
+    def add_fingerprints(self, file_path: str, fingerprints: List[Tuple[int, int, int]]):
+        self.remove_file(file_path)
+        self.files[file_path] = fingerprints
+        for h, start_line, end_line in fingerprints:
+            self.postings[h].setdefault(file_path, []).append((start_line, end_line))
+
+    def remove_file(self, file_path: str):
+        fingerprints = self.files.pop(file_path, None)
+        if not fingerprints:
+            return
+        for h, _, _ in fingerprints:
+            files = self.postings.get(h)
+            if files is None:
+                continue
+            files.pop(file_path, None)
+            if not files:
+                del self.postings[h]
+
+    def find_clones(self, file_path: str) -> List[dict]:
+        pairs = defaultdict(list)
+        for h, start_line, end_line in self.files.get(file_path, []):
+            files = self.postings.get(h, {})
+            if len(files) > MAX_POSTINGS:
+                continue
+            for other_path, ranges in files.items():
+                if other_path == file_path:
+                    continue
+                for other_start, other_end in ranges:
+                    pairs[other_path].append((start_line, end_line, other_start, other_end))
+
+        clones = []
+        for other_path, matches in pairs.items():
+            clones.append({
+                'file_path': other_path,
+                'shared_fingerprints': len(matches),
+                'matches': merge_matches(matches)
+            })
+        clones.sort(key=lambda clone: (-clone['shared_fingerprints'], clone['file_path']))
+        return clones
+
+    def stats(self) -> dict:
+        return {
+            'indexed_files': len(self.files),
+            'fingerprints': len(self.postings)
+        }
+
+
+def merge_matches(matches: List[Tuple[int, int, int, int]]) -> List[dict]:
+    """Join overlapping or adjacent line ranges that line up in both files."""
+    merged = []
+    for start, end, other_start, other_end in sorted(matches):
+        if merged:
+            last = merged[-1]
+            if (start <= last['end_line'] + 1 and
+                    last['other_start_line'] <= other_start <= last['other_end_line'] + 1):
+                last['end_line'] = max(last['end_line'], end)
+                last['other_end_line'] = max(last['other_end_line'], other_end)
+                continue
+        merged.append({
+            'start_line': start,
+            'end_line': end,
+            'other_start_line': other_start,
+            'other_end_line': other_end
+        })
+    return merged
@@ -0,0 +1,134 @@
+import time
+from typing import Dict, List, Any
+from app.utils.ast_cache import source_lines
+from app.utils.metrics import visitor_seconds
+from app.utils.visitors.fused_visitor import FusedVisitor
+from app.utils.visitors.function_visitor import FunctionVisitor
+from app.utils.visitors.class_visitor import ClassVisitor
+from app.utils.visitors.import_visitor import ImportVisitor
+from app.utils.visitors.conditional_visitor import ConditionComplexityAnalyzer
+from app.utils.visitors.global_visitor import GlobalVariableVisitor, MagicNumGlobalVisitor
+from app.utils.visitors.unreachable_visitor import UnreachableCodeAnalyzer
+from app.utils.analysis.dead_code import find_unutilized_functions
+from app.utils.analysis.duplicate_code import get_duplicated_code
+from app.utils.analysis.global_conflict import global_variable_conflicts
+from app.utils.analysis.naming_convention import get_naming_convention
+from app.utils.analysis.unused_variables import get_unused_variables
+from app.utils.analysis.temporary_field import analyze_temporary_fields
+
+# Keys follow DetectionResponse so the combined payload can be stored as is
+DETECTORS = (
+    'magic_numbers',
+    'duplicated_code',
+    'unused_variables',
+    'long_parameter_list',
+    'naming_convention',
+    'dead_code',
+    'unreachable_code',
+    'temporary_field',
+    'overly_complex_condition',
+    'global_conflict',
+)
+
+
+def detector_result(data: Dict[str, Any] = None, error: Exception = None) -> Dict[str, Any]:
+    if error is not None:
+        return {'success': False, 'error': str(error), 'data': None}
+    return {'success': True, 'error': None, 'data': data}
+
+
+def run_detectors(parsed_ast, code: str, detectors: List[str],
+                  function_names: list, global_variables: list) -> Dict[str, Dict[str, Any]]:
+    selected = set(detectors)
+    results = {}
+
+    # Detectors that only act on the way down share one walk of the tree
+    function_visitor = FunctionVisitor()
+    fused = {}
+    if selected & {'long_parameter_list', 'dead_code'}:
+        fused['function'] = function_visitor
+    if 'magic_numbers' in selected:
+        fused['magic_numbers'] = MagicNumGlobalVisitor()
+    lines = source_lines(code) if selected & {'overly_complex_condition', 'unreachable_code'} else None
+    if 'overly_complex_condition' in selected:
+        fused['overly_complex_condition'] = ConditionComplexityAnalyzer(lines)
+    if 'unreachable_code' in selected:
+        fused['unreachable_code'] = UnreachableCodeAnalyzer(lines)
+    if 'dead_code' in selected:
+        fused['dead_class'] = ClassVisitor()
+        fused['dead_globals'] = GlobalVariableVisitor(global_variables)
+        fused['dead_imports'] = ImportVisitor()
+
+    walker = FusedVisitor(fused.values())
+    if fused:
+        start = time.perf_counter()
+        walker.visit(parsed_ast)
+        visitor_seconds.observe(time.perf_counter() - start, 'fused')
+
+    def finish(name, visitor_key, build):
+        error = walker.errors.get(fused.get(visitor_key))
+        if error is not None:
+            results[name] = detector_result(error=error)
+            return
+        start = time.perf_counter()
+        try:
+            results[name] = detector_result(build())
+        except Exception as e:
+            results[name] = detector_result(error=e)
+        visitor_seconds.observe(time.perf_counter() - start, name)
+
+    if 'long_parameter_list' in selected:
+        finish('long_parameter_list', 'function', lambda: {
+            'long_parameter_list': function_visitor.get_function_arguments()
+        })
+    if 'magic_numbers' in selected:
+        finish('magic_numbers', 'magic_numbers', lambda: {
+            'magic_numbers': fused['magic_numbers'].get_magic_numbers()
+        })
+    if 'overly_complex_condition' in selected:
+        finish('overly_complex_condition', 'overly_complex_condition', lambda: {
+            'conditionals': fused['overly_complex_condition'].analyze()
+        })
+    if 'unreachable_code' in selected:
+        finish('unreachable_code', 'unreachable_code', lambda: {
+            'unreachable_code': fused['unreachable_code'].get_unreachable_blocks()
+        })
+    if 'dead_code' in selected:
+        def build_dead_code():
+            for key in ('function', 'dead_class', 'dead_globals', 'dead_imports'):
+                if fused[key] in walker.errors:
+                    raise walker.errors[fused[key]]
+            imports = fused['dead_imports']
+            return {
+                'function_names': find_unutilized_functions(function_visitor.used_functions, function_names),
+                'class_details': fused['dead_class'].find_unutilized_members(),
+                'global_variables': list(fused['dead_globals'].get_unused_globals()),
+                'imports': {"dead_imports": imports.get_dead_imports(), "unused_imports": imports.get_used_imports()}
+            }
+        finish('dead_code', None, build_dead_code)
+
+    # Scope-aware analyses share one def-use table built from the tree
+    if 'unused_variables' in selected:
+        finish('unused_variables', None, lambda: {
+            'unused_variables': get_unused_variables(parsed_ast)
+        })
+    if 'global_conflict' in selected:
+        finish('global_conflict', None, lambda: {
+            'conflicts_report': global_variable_conflicts(parsed_ast, global_variables)
+        })
+    if 'naming_convention' in selected:
+        finish('naming_convention', None, lambda: {
+            'inconsistent_naming': get_naming_convention(parsed_ast)
+        })
+
+    # This keeps scope state across a node's children, so it walks on its own
+    if 'temporary_field' in selected:
+        finish('temporary_field', None, lambda: {
+            'temporary_fields': analyze_temporary_fields(parsed_ast)
+        })
+    if 'duplicated_code' in selected:
+        finish('duplicated_code', None, lambda: {
+            'duplicate_code': get_duplicated_code(code)
+        })
+
+    return results
@@ -1,10 +1,10 @@
-import ast
+from app.utils.ast_cache import parse_code, source_lines
 from app.utils.visitors.conditional_visitor import ConditionComplexityAnalyzer
 
 def analyze_condition_complexity(code) -> list:
     try:
-        lines = code.splitlines(keepends=True)
-        tree = ast.parse(code)
+        lines = source_lines(code)
+        tree = parse_code(code)
 
         analyzer = ConditionComplexityAnalyzer(lines)
         analyzer.visit(tree)
@@ -0,0 +1,340 @@
+import ast
+import hashlib
+import threading
+from collections import OrderedDict
+from app.service.settings import CFG_CACHE_MAX_FUNCTIONS
+
+TRY_TYPES = (ast.Try, ast.TryStar) if hasattr(ast, 'TryStar') else (ast.Try,)
+SCOPE_TYPES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+
+BLOCK_KINDS = {
+    ast.If: 'if',
+    ast.For: 'for',
+    ast.AsyncFor: 'for',
+    ast.While: 'while',
+    **{try_type: 'try' for try_type in TRY_TYPES}
+}
+
+
+class ControlFlowGraph:
+    """
+    Statement-level control flow graph of one function body.
+
+    Node 0 is the entry and node 1 the exit; every other node is a statement
+    (a compound statement stands for its header). A ``finally`` body is laid
+    out once per way of leaving its ``try``, so one statement can own several
+    nodes and is reachable when any of them is.
+    """
+
+    ENTRY = 0
+    EXIT = 1
+
+    def __init__(self):
+        self.statements = [None, None]
+        self.successors = [[], []]
+
+    def add(self, statement) -> int:
+        self.statements.append(statement)
+        self.successors.append([])
+        return len(self.statements) - 1
+
+    def link(self, source: int, target):
+        if target is not None:
+            self.successors[source].append(target)
+
+    def reachable_statements(self) -> set:
+        seen = bytearray(len(self.statements))
+        seen[self.ENTRY] = 1
+        stack = [self.ENTRY]
+        while stack:
+            for target in self.successors[stack.pop()]:
+                if not seen[target]:
+                    seen[target] = 1
+                    stack.append(target)
+        return {self.statements[i] for i in range(2, len(seen)) if seen[i]}
+
+
+class _Frame:
+    __slots__ = ('kind', 'targets', 'finalbody', 'copies')
+
+    def __init__(self, kind, targets=None, finalbody=None):
+        self.kind = kind  # loop, handlers or finally
+        self.targets = targets
+        self.finalbody = finalbody
+        self.copies = {}
+
+
+def _constant_test(test):
+    if isinstance(test, ast.Constant):
+        return bool(test.value)
+    return None
+
+
+def _empty_literal(node) -> bool:
+    return isinstance(node, (ast.List, ast.Tuple, ast.Set, ast.Dict)) and not getattr(node, 'elts', getattr(node, 'keys', None))
+
+
+def _irrefutable(pattern) -> bool:
+    if isinstance(pattern, ast.MatchAs):
+        return pattern.pattern is None or _irrefutable(pattern.pattern)
+    if isinstance(pattern, ast.MatchOr):
+        return any(_irrefutable(alternative) for alternative in pattern.patterns)
+    return False
+
+
+class CFGBuilder:
+    """
+    Lays a function body out as a ``ControlFlowGraph``. Statements are
+    processed last to first, so each one is linked to the node that follows
+    it as soon as it is created. Loops, ``try`` handlers and ``finally``
+    bodies are kept on a frame stack that ``return``, ``raise``, ``break``
+    and ``continue`` are resolved against.
+    """
+
+    def __init__(self):
+        self.graph = ControlFlowGraph()
+        self.frames = []
+
+    def build(self, function) -> ControlFlowGraph:
+        self.graph.link(ControlFlowGraph.ENTRY, self._sequence(function.body, ControlFlowGraph.EXIT))
+        return self.graph
+
+    def _sequence(self, body, successor):
+        for statement in reversed(body):
+            successor = self._statement(statement, successor)
+        return successor
+
+    def _statement(self, statement, successor) -> int:
+        node = self.graph.add(statement)
+        method = getattr(self, '_' + type(statement).__name__, None)
+        if method is None:
+            self.graph.link(node, successor)
+        else:
+            method(node, statement, successor)
+        return node
+
+    # -- jumps -------------------------------------------------------------
+
+    def _jump(self, kind):
+        for index in range(len(self.frames) - 1, -1, -1):
+            frame = self.frames[index]
+            if frame.kind == 'loop' and kind in frame.targets:
+                return frame.targets[kind]
+            if frame.kind == 'handlers' and kind == 'raise':
+                # The try header already links to its handlers
+                return None
+            if frame.kind == 'finally':
+                return self._finally_copy(index, kind)
+        return ControlFlowGraph.EXIT
+
+    def _finally_copy(self, index, kind):
+        frame = self.frames[index]
+        if kind not in frame.copies:
+            frames = self.frames
+            self.frames = frames[:index]
+            try:
+                frame.copies[kind] = self._sequence(frame.finalbody, self._jump(kind))
+            finally:
+                self.frames = frames
+        return frame.copies[kind]
+
+    def _Return(self, node, statement, successor):
+        self.graph.link(node, self._jump('return'))
+
+    def _Raise(self, node, statement, successor):
+        self.graph.link(node, self._jump('raise'))
+
+    def _Break(self, node, statement, successor):
+        self.graph.link(node, self._jump('break'))
+
+    def _Continue(self, node, statement, successor):
+        self.graph.link(node, self._jump('continue'))
+
+    # -- compound statements -----------------------------------------------
+
+    def _If(self, node, statement, successor):
+        test = _constant_test(statement.test)
+        body = self._sequence(statement.body, successor)
+        orelse = self._sequence(statement.orelse, successor)
+        if test is not False:
+            self.graph.link(node, body)
+        if test is not True:
+            self.graph.link(node, orelse)
+
+    def _loop_body(self, node, statement, successor):
+        self.frames.append(_Frame('loop', {'break': successor, 'continue': node}))
+        try:
+            return self._sequence(statement.body, node)
+        finally:
+            self.frames.pop()
+
+    def _While(self, node, statement, successor):
+        test = _constant_test(statement.test)
+        orelse = self._sequence(statement.orelse, successor)
+        body = self._loop_body(node, statement, successor)
+        if test is not False:
+            self.graph.link(node, body)
+        if test is not True:
+            self.graph.link(node, orelse)
+
+    def _For(self, node, statement, successor):
+        orelse = self._sequence(statement.orelse, successor)
+        body = self._loop_body(node, statement, successor)
+        if not _empty_literal(statement.iter):
+            self.graph.link(node, body)
+        self.graph.link(node, orelse)
+
+    _AsyncFor = _For
+
+    def _With(self, node, statement, successor):
+        self.graph.link(node, self._sequence(statement.body, successor))
+        # A context manager can swallow the exception that ends its body
+        self.graph.link(node, successor)
+
+    _AsyncWith = _With
+
+    def _Try(self, node, statement, successor):
+        after = self._sequence(statement.finalbody, successor)
+        if statement.finalbody:
+            self.frames.append(_Frame('finally', finalbody=statement.finalbody))
+        try:
+            handlers = [self._sequence(handler.body, after) for handler in statement.handlers]
+            orelse = self._sequence(statement.orelse, after)
+            if handlers:
+                self.frames.append(_Frame('handlers'))
+            try:
+                body = self._sequence(statement.body, orelse)
+            finally:
+                if handlers:
+                    self.frames.pop()
+            self.graph.link(node, body)
+            # An exception can leave the body anywhere: into a handler, or
+            # through ``finally`` when no handler matches
+            for handler in handlers:
+                self.graph.link(node, handler)
+            if statement.finalbody:
+                self.graph.link(node, self._jump('raise'))
+        finally:
+            if statement.finalbody:
+                self.frames.pop()
+
+    _TryStar = _Try
+
+    def _Match(self, node, statement, successor):
+        for case in statement.cases:
+            self.graph.link(node, self._sequence(case.body, successor))
+        last = statement.cases[-1] if statement.cases else None
+        if last is None or last.guard is not None or not _irrefutable(last.pattern):
+            self.graph.link(node, successor)
+
+
+def _is_elif(statement, parent) -> bool:
+    return (isinstance(parent, ast.If) and len(parent.orelse) == 1 and parent.orelse[0] is statement and
+            isinstance(statement, ast.If) and statement.col_offset == parent.col_offset)
+
+
+def _branch_record(kind, body):
+    return (kind, body[0].lineno, body[-1].end_lineno)
+
+
+def _collect(body, reached, records, parent=None):
+    # One record per dead statement or branch; nothing inside it is reported again
+    for statement in body:
+        if statement not in reached:
+            kind = 'elif' if _is_elif(statement, parent) else BLOCK_KINDS.get(type(statement), 'code')
+            records.append((kind, statement.lineno, statement.end_lineno))
+            continue
+        if isinstance(statement, SCOPE_TYPES):
+            # Live nested functions get their own graph; class bodies are not analysed
+            continue
+
+        for field in ('body', 'orelse', 'finalbody'):
+            block = getattr(statement, field, None)
+            if not block or not isinstance(block, list):
+                continue
+            if block[0] in reached:
+                _collect(block, reached, records, statement)
+            elif field == 'body':
+                # ``if False:``, ``while False:``, ``for x in []:``
+                records.append((BLOCK_KINDS.get(type(statement), 'code'), statement.lineno, block[-1].end_lineno))
+            elif field == 'finalbody':
+                records.append(_branch_record('finally', block))
+            elif _is_elif(block[0], statement):
+                records.append(('elif', block[0].lineno, block[0].end_lineno))
+            else:
+                records.append(_branch_record('else', block))
+        for handler in getattr(statement, 'handlers', []):
+            if handler.body[0] in reached:
+                _collect(handler.body, reached, records)
+            else:
+                records.append(('except', handler.lineno, handler.end_lineno))
+        for case in getattr(statement, 'cases', []):
+            _collect(case.body, reached, records)
+
+
+def find_unreachable(function) -> list:
+    """
+    Unreachable code in one function as ``(kind, start_line, end_line)``
+    records, where kind is ``code`` for a plain statement or the block
+    (``if``, ``elif``, ``else``, ``for``, ``while``, ``try``, ``except``,
+    ``finally``) that can never run. Nested functions are left to their own
+    graph unless the ``def`` itself is unreachable.
+    """
+    reached = CFGBuilder().build(function).reachable_statements()
+    records = []
+    _collect(function.body, reached, records)
+    return records
+
+
+class CFGCache:
+    """
+    LRU cache of per-function findings keyed by a hash of the function's
+    source, with lines kept relative to the ``def`` so a function that only
+    moved within its file is still a hit.
+    """
+
+    def __init__(self, max_entries: int = CFG_CACHE_MAX_FUNCTIONS):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def unreachable(self, function, lines: list) -> list:
+        first = function.lineno
+        source = ''.join(lines[first - 1:function.end_lineno])
+        key = hashlib.sha256(source.encode('utf-8', 'surrogatepass')).hexdigest()
+        with self.lock:
+            relative = self.entries.get(key)
+            if relative is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if relative is None:
+            relative = tuple(
+                (kind, start - first, end - first)
+                for kind, start, end in find_unreachable(function)
+            )
+            with self.lock:
+                self.entries[key] = relative
+                while len(self.entries) > self.max_entries:
+                    self.entries.popitem(last=False)
+        return [(kind, start + first, end + first) for kind, start, end in relative]
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'entries': len(self.entries),
+                'max_entries': self.max_entries
+            }
+
+
+cfg_cache = CFGCache()
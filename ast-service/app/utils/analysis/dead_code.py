@@ -6,6 +6,7 @@ from app.utils.visitors.class_visitor import (
 )
 from app.utils.visitors.global_visitor import GlobalVariableVisitor
 from app.utils.visitors.import_visitor import ImportVisitor
+from app.utils.name_trie import DottedNameTrie
 
 
 def get_class_utiliztion_details(parsed_ast: str, class_name : str) -> List[Dict[str, Union[str, List[str]]]]:
@@ -22,12 +23,16 @@ def get_unutilized_functions(parsed_ast: str, function_names: list) -> list:
     try:
         visitor = FunctionVisitor()
         visitor.visit(parsed_ast)
-        unutilized_functions = [fn for fn in function_names if all(fn != used_fn and not used_fn.startswith(fn + '.') for used_fn in visitor.used_functions)]
-        return unutilized_functions
+        return find_unutilized_functions(visitor.used_functions, function_names)
     except Exception as e:
         print(str(e))
         return []
 
+def find_unutilized_functions(used_functions: set, function_names: list) -> list:
+    # A function counts as used when it is called directly or something under it is (fn.attr)
+    used = DottedNameTrie(used_functions)
+    return [fn for fn in function_names if not used.has_name_or_child(fn)]
+
 def get_unutilized_classes(parsed_ast: str) -> List[Dict[str, Union[str, List[str]]]]:
     try:
         visitor = ClassVisitor()
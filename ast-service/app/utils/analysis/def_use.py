@@ -0,0 +1,323 @@
+import ast
+from collections import Counter
+from app.utils.ast_cache import ast_cache
+
+
+class Scope:
+    __slots__ = ('kind', 'name', 'node', 'parent', 'symbols', 'globals', 'nonlocals')
+
+    def __init__(self, kind: str, name: str, node, parent=None):
+        self.kind = kind  # module, class, function, lambda or comprehension
+        self.name = name
+        self.node = node
+        self.parent = parent
+        self.symbols = {}
+        self.globals = set()
+        self.nonlocals = set()
+
+    @property
+    def function(self):
+        """The innermost function scope enclosing (or being) this scope."""
+        scope = self
+        while scope is not None and scope.kind != 'function':
+            scope = scope.parent
+        return scope
+
+
+class Symbol:
+    __slots__ = ('name', 'scope', 'bindings', 'uses')
+
+    def __init__(self, name: str, scope: Scope):
+        self.name = name
+        self.scope = scope
+        self.bindings = []
+        self.uses = []
+
+
+class Binding:
+    __slots__ = ('name', 'kind', 'node', 'lineno', 'origin', 'symbol')
+
+    def __init__(self, name: str, kind: str, node, origin: Scope):
+        self.name = name
+        self.kind = kind
+        self.node = node
+        self.lineno = node.lineno
+        # The scope the binding statement sits in; ``symbol.scope`` is where it lands
+        self.origin = origin
+        self.symbol = None
+
+
+class Use:
+    __slots__ = ('name', 'node', 'lineno', 'origin', 'symbol')
+
+    def __init__(self, name: str, node, origin: Scope):
+        self.name = name
+        self.node = node
+        self.lineno = node.lineno
+        self.origin = origin
+        # None for builtins and names bound nowhere in the module
+        self.symbol = None
+
+
+class DefUseTable:
+    """
+    Scopes, symbols and their bindings and uses for one module.
+
+    Bindings are kept in the order a post-order walk meets them (a function
+    or class name after its body). Every use is resolved with Python's
+    scoping rules: local, then enclosing functions (class bodies are
+    skipped), then module, honouring ``global`` and ``nonlocal``.
+    """
+
+    def __init__(self):
+        self.module = None
+        self.scopes = []
+        self.bindings = []
+        self.uses = []
+        # (name, function scope, line) for every ``global`` statement inside a function
+        self.global_declarations = []
+        # Attribute names read anywhere in the module (self.x, cls.x)
+        self.attribute_loads = Counter()
+
+    def resolve(self, scope: Scope, name: str):
+        if name in scope.globals:
+            return self.module.symbols.get(name)
+        if name not in scope.nonlocals and name in scope.symbols:
+            return scope.symbols[name]
+        current = scope.parent
+        while current is not None:
+            if current.kind == 'class':
+                current = current.parent
+                continue
+            if name in current.globals:
+                return self.module.symbols.get(name)
+            if name not in current.nonlocals and name in current.symbols:
+                return current.symbols[name]
+            current = current.parent
+        return None
+
+
+class DefUseBuilder(ast.NodeVisitor):
+    def __init__(self):
+        self.table = DefUseTable()
+        self.scope = None
+
+    def build(self, parsed_ast) -> DefUseTable:
+        self.visit(parsed_ast)
+        self._link()
+        return self.table
+
+    # -- recording ---------------------------------------------------------
+
+    def _push(self, kind, name, node):
+        self.scope = Scope(kind, name, node, self.scope)
+        self.table.scopes.append(self.scope)
+        return self.scope
+
+    def _pop(self):
+        self.scope = self.scope.parent
+
+    def _bind(self, name, kind, node, scope=None):
+        binding = Binding(name, kind, node, scope or self.scope)
+        self.table.bindings.append(binding)
+
+    def _use(self, name, node):
+        self.table.uses.append(Use(name, node, self.scope))
+
+    def _link(self):
+        # Symbols only exist once every binding is known, since a name is
+        # local to a function no matter where in it the binding sits.
+        # Bindings through ``nonlocal`` go last, once the enclosing locals exist.
+        bindings = self.table.bindings
+        for binding in [b for b in bindings if b.name not in b.origin.nonlocals] + \
+                [b for b in bindings if b.name in b.origin.nonlocals]:
+            target = self._binding_scope(binding.origin, binding.name)
+            symbol = target.symbols.get(binding.name)
+            if symbol is None:
+                symbol = target.symbols[binding.name] = Symbol(binding.name, target)
+            symbol.bindings.append(binding)
+            binding.symbol = symbol
+        for use in self.table.uses:
+            use.symbol = self.table.resolve(use.origin, use.name)
+            if use.symbol is not None:
+                use.symbol.uses.append(use)
+
+    def _binding_scope(self, scope, name):
+        if name in scope.globals:
+            return self.table.module
+        if name in scope.nonlocals:
+            current = scope.parent
+            while current is not None and current.kind != 'module':
+                if current.kind != 'class' and name not in current.nonlocals and name in current.symbols:
+                    return current
+                current = current.parent
+        return scope
+
+    # -- scopes ------------------------------------------------------------
+
+    def visit_Module(self, node):
+        self.table.module = self._push('module', '<module>', node)
+        self.generic_visit(node)
+
+    def _visit_arguments(self, args):
+        for default in args.defaults + [d for d in args.kw_defaults if d is not None]:
+            self.visit(default)
+
+    def _visit_annotations(self, args):
+        for arg in args.posonlyargs + args.args + args.kwonlyargs + [args.vararg, args.kwarg]:
+            if arg is not None and arg.annotation is not None:
+                self.visit(arg.annotation)
+
+    def _bind_parameters(self, args):
+        for arg in args.posonlyargs + args.args + args.kwonlyargs + [args.vararg, args.kwarg]:
+            if arg is not None:
+                self._bind(arg.arg, 'parameter', arg)
+
+    def visit_FunctionDef(self, node):
+        for decorator in node.decorator_list:
+            self.visit(decorator)
+        self._visit_arguments(node.args)
+        self._visit_annotations(node.args)
+        if node.returns is not None:
+            self.visit(node.returns)
+        self._push('function', node.name, node)
+        self._bind_parameters(node.args)
+        for statement in node.body:
+            self.visit(statement)
+        self._pop()
+        self._bind(node.name, 'function', node)
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_Lambda(self, node):
+        self._visit_arguments(node.args)
+        self._push('lambda', '<lambda>', node)
+        self._bind_parameters(node.args)
+        self.visit(node.body)
+        self._pop()
+
+    def visit_ClassDef(self, node):
+        for child in node.decorator_list + node.bases + node.keywords:
+            self.visit(child)
+        self._push('class', node.name, node)
+        for statement in node.body:
+            self.visit(statement)
+        self._pop()
+        self._bind(node.name, 'class', node)
+
+    def _visit_comprehension(self, node, *results):
+        # The first iterable is evaluated in the enclosing scope
+        self.visit(node.generators[0].iter)
+        self._push('comprehension', f"<{type(node).__name__.lower()}>", node)
+        for i, generator in enumerate(node.generators):
+            self.visit(generator.target)
+            if i:
+                self.visit(generator.iter)
+            for condition in generator.ifs:
+                self.visit(condition)
+        for result in results:
+            self.visit(result)
+        self._pop()
+
+    def visit_ListComp(self, node):
+        self._visit_comprehension(node, node.elt)
+
+    visit_SetComp = visit_ListComp
+    visit_GeneratorExp = visit_ListComp
+
+    def visit_DictComp(self, node):
+        self._visit_comprehension(node, node.key, node.value)
+
+    # -- bindings and uses -------------------------------------------------
+
+    def visit_Name(self, node):
+        if isinstance(node.ctx, ast.Store):
+            self._bind(node.id, 'store', node)
+        else:
+            self._use(node.id, node)
+
+    def visit_Assign(self, node):
+        for target in node.targets:
+            if isinstance(target, ast.Name):
+                self._bind(target.id, 'assign', target)
+            else:
+                self.visit(target)
+        self.visit(node.value)
+
+    def visit_AugAssign(self, node):
+        if isinstance(node.target, ast.Name):
+            # x += 1 reads x before rebinding it
+            self._use(node.target.id, node.target)
+            self._bind(node.target.id, 'augassign', node.target)
+        else:
+            self.visit(node.target)
+        self.visit(node.value)
+
+    def visit_AnnAssign(self, node):
+        if isinstance(node.target, ast.Name):
+            self._bind(node.target.id, 'annassign' if node.value is not None else 'annotation', node.target)
+        else:
+            self.visit(node.target)
+        self.visit(node.annotation)
+        if node.value is not None:
+            self.visit(node.value)
+
+    def visit_NamedExpr(self, node):
+        # Assignment expressions bind in the nearest non-comprehension scope
+        scope = self.scope
+        while scope.kind == 'comprehension':
+            scope = scope.parent
+        self._bind(node.target.id, 'named_expr', node.target, scope)
+        self.visit(node.value)
+
+    def visit_Import(self, node):
+        for alias in node.names:
+            self._bind(alias.asname or alias.name.split('.')[0], 'import', node)
+
+    def visit_ImportFrom(self, node):
+        for alias in node.names:
+            if alias.name != '*':
+                self._bind(alias.asname or alias.name, 'import', node)
+
+    def visit_ExceptHandler(self, node):
+        if node.type is not None:
+            self.visit(node.type)
+        if node.name:
+            self._bind(node.name, 'except', node)
+        for statement in node.body:
+            self.visit(statement)
+
+    def visit_MatchAs(self, node):
+        if node.pattern is not None:
+            self.visit(node.pattern)
+        if node.name:
+            self._bind(node.name, 'match', node)
+
+    def visit_MatchStar(self, node):
+        if node.name:
+            self._bind(node.name, 'match', node)
+
+    def visit_MatchMapping(self, node):
+        self.generic_visit(node)
+        if node.rest:
+            self._bind(node.rest, 'match', node)
+
+    def visit_Global(self, node):
+        self.scope.globals.update(node.names)
+        if self.scope.kind == 'function':
+            for name in node.names:
+                self.table.global_declarations.append((name, self.scope, node.lineno))
+
+    def visit_Nonlocal(self, node):
+        self.scope.nonlocals.update(node.names)
+
+    def visit_Attribute(self, node):
+        if isinstance(node.ctx, ast.Load):
+            self.table.attribute_loads[node.attr] += 1
+        self.visit(node.value)
+
+
+def get_def_use(parsed_ast) -> DefUseTable:
+    """Build (once per parsed module) the def-use table the variable analyses share."""
+    # Kept in the tree's parse-cache entry, so it is evicted along with the tree
+    return ast_cache.derived(parsed_ast, 'def_use', lambda tree: DefUseBuilder().build(tree))
@@ -0,0 +1,238 @@
+import posixpath
+from collections import defaultdict
+from app.utils.ast_cache import parse_code
+from app.utils.ast_process import get_imports_from_ast
+
+
+def extract_imports(files: dict) -> dict:
+    """Import metadata for each file; files that fail to parse are reported in ``errors``."""
+    imports = {}
+    errors = {}
+    for file_path, code in files.items():
+        try:
+            imports[file_path] = get_imports_from_ast(parse_code(code))
+        except Exception as e:
+            errors[file_path] = str(e)
+    return {
+        'imports': imports,
+        'errors': errors,
+        'success': True
+    }
+
+
+def normalize_path(file_path: str) -> str:
+    return posixpath.normpath(file_path.replace('\\', '/')).lstrip('/')
+
+
+def module_candidates(base: str, module: str) -> list:
+    parts = [part for part in module.split('.') if part]
+    path = posixpath.join(base, *parts) if parts else base
+    candidates = [posixpath.join(path, '__init__.py')]
+    if parts:
+        candidates.insert(0, path + '.py')
+    return [posixpath.normpath(candidate).lstrip('/') for candidate in candidates]
+
+
+def source_roots(file_path: str) -> list:
+    # The workspace root first, then each enclosing directory (src/ layouts)
+    directory = posixpath.dirname(file_path)
+    roots = ['']
+    parts = directory.split('/') if directory else []
+    for i in range(1, len(parts) + 1):
+        roots.append('/'.join(parts[:i]))
+    return roots
+
+
+def module_stem(file_path: str):
+    # The last module name part an import must end with to land on this file
+    name = posixpath.basename(file_path)
+    if name == '__init__.py':
+        return posixpath.basename(posixpath.dirname(file_path))
+    return name[:-3] if name.endswith('.py') else None
+
+
+class DependencyGraph:
+    """
+    Import dependency graph of a project's files, in the shape the gateway's
+    ``FileNode`` / ``DependentNode`` models store.
+
+    Each file keeps its parsed imports and the edges they resolve to. A file
+    that changes only has its own edges re-resolved and patched into the
+    nodes it points at. Adding or removing a file re-resolves, without
+    re-parsing, only the files with an import whose last name part matches
+    the file's module name, since those are the only ones it can affect.
+
+    Files taken from a stored graph with ``seed`` have no parsed imports;
+    they keep their stored edges until they are sent again, except that an
+    edge to a file that is removed stops being valid.
+    """
+
+    def __init__(self):
+        self.imports = {}
+        # file -> target -> DependentNode data for the modules it imports
+        self.outgoing = {}
+        # target file -> importing file -> entities it imports from the target
+        self.incoming = defaultdict(dict)
+        # seeded file -> its stored outgoing edges
+        self.seeded = {}
+        # module stem -> files with an import that could resolve to it
+        self.lookups = defaultdict(set)
+        self.lookup_keys = {}
+
+    def seed(self, nodes: dict) -> set:
+        """Start from stored ``FileNode`` data, e.g. after a restart."""
+        for file_path, node in nodes.items():
+            file_path = normalize_path(file_path)
+            edges = {}
+            for dependency in node.get('dependencies', []):
+                weight = [
+                    {key: value for key, value in entity.items() if key != 'source'}
+                    for entity in dependency.get('weight', []) if entity.get('source') == 'Importing'
+                ]
+                if weight:
+                    edges[dependency['name']] = {
+                        'name': dependency['name'],
+                        'alias': dependency.get('alias'),
+                        'valid': dependency['valid'],
+                        'weight': weight
+                    }
+            self.imports[file_path] = None
+            self.seeded[file_path] = edges
+        return self._relink(list(self.seeded))
+
+    def update_files(self, imports: dict) -> set:
+        imports = {normalize_path(file_path): data for file_path, data in imports.items()}
+        new_files = imports.keys() - self.imports.keys()
+        self.imports.update(imports)
+        affected = set(imports)
+        for file_path in imports:
+            self.seeded.pop(file_path, None)
+        for file_path in new_files:
+            affected |= self.lookups.get(module_stem(file_path), set())
+        # A new file is a new node even when it has no edges
+        return self._relink(affected) | new_files
+
+    def remove_files(self, file_paths: list) -> set:
+        removed = {normalize_path(file_path) for file_path in file_paths} & self.imports.keys()
+        changed = set()
+        affected = set()
+        for file_path in removed:
+            changed |= self._unlink(file_path)
+            del self.imports[file_path]
+            self.incoming.pop(file_path, None)
+            self.seeded.pop(file_path, None)
+            self._set_lookups(file_path, set())
+        for file_path in removed:
+            affected |= self.lookups.get(module_stem(file_path), set())
+        changed |= self._relink(affected)
+        return changed - removed
+
+    def _set_lookups(self, file_path: str, keys: set):
+        for key in self.lookup_keys.pop(file_path, ()):
+            self.lookups[key].discard(file_path)
+            if not self.lookups[key]:
+                del self.lookups[key]
+        if keys:
+            self.lookup_keys[file_path] = keys
+            for key in keys:
+                self.lookups[key].add(file_path)
+
+    def _relink(self, file_paths) -> set:
+        changed = set()
+        for file_path in sorted(file_paths):
+            keys = set()
+            edges = self._resolve(file_path, keys)
+            keys.discard(None)
+            self._set_lookups(file_path, keys)
+            previous = self.outgoing.get(file_path, {})
+            # Compared in order, so reordered imports are picked up too
+            if list(edges.items()) == list(previous.items()):
+                continue
+            changed.add(file_path)
+            for target in previous.keys() | edges.keys():
+                if previous.get(target) != edges.get(target):
+                    changed.add(target)
+            self._unlink(file_path)
+            self.outgoing[file_path] = edges
+            for target, node in edges.items():
+                if node['valid']:
+                    self.incoming[target][file_path] = node['weight']
+        return changed
+
+    def _unlink(self, file_path: str) -> set:
+        changed = {file_path}
+        for target, node in self.outgoing.pop(file_path, {}).items():
+            if node['valid'] and target in self.incoming:
+                self.incoming[target].pop(file_path, None)
+                changed.add(target)
+        return changed
+
+    def resolve_module(self, file_path: str, module: str, keys: set = None):
+        level = len(module) - len(module.lstrip('.'))
+        if level:
+            base = posixpath.dirname(file_path)
+            for _ in range(level - 1):
+                base = posixpath.dirname(base)
+            bases = [base]
+        else:
+            bases = source_roots(file_path)
+        if keys is not None:
+            keys.add(module.split('.')[-1] if module[level:] else posixpath.basename(bases[0]))
+        for base in bases:
+            for candidate in module_candidates(base, module[level:]):
+                if candidate in self.imports:
+                    return candidate
+        return None
+
+    def _resolve(self, file_path: str, keys: set = None) -> dict:
+        if file_path in self.seeded:
+            edges = {}
+            for target, node in self.seeded[file_path].items():
+                if node['valid'] and keys is not None:
+                    keys.add(module_stem(target))
+                edges[target] = {**node, 'valid': node['valid'] and target in self.imports}
+            return edges
+
+        edges = {}
+
+        def add(target, valid, alias, entity):
+            node = edges.setdefault(target, {'name': target, 'alias': None, 'valid': valid, 'weight': []})
+            if alias and node['alias'] is None:
+                node['alias'] = alias
+            node['weight'].append(entity)
+
+        imports = self.imports.get(file_path) or {}
+        for item in imports.get('imports', []):
+            target = self.resolve_module(file_path, item['name'], keys)
+            add(target or item['name'], target is not None, item['alias'],
+                {'name': item['name'], 'type': item['type'], 'alias': item['alias']})
+        for item in imports.get('from', []):
+            module = item['module']
+            # ``from package import module`` depends on the submodule itself
+            separator = '' if module.endswith('.') else '.'
+            target = (item['name'] != '*' and self.resolve_module(file_path, f"{module}{separator}{item['name']}", keys)) or \
+                self.resolve_module(file_path, module, keys)
+            add(target or module, target is not None, None,
+                {'name': item['name'], 'type': item['type'], 'alias': item['alias']})
+        return edges
+
+    def file_node(self, file_path: str) -> dict:
+        dependencies = {}
+        for target, node in self.outgoing.get(file_path, {}).items():
+            dependencies[target] = {
+                **node,
+                'weight': [{**entity, 'source': 'Importing'} for entity in node['weight']]
+            }
+        for source in sorted(self.incoming.get(file_path, {})):
+            node = dependencies.setdefault(source, {'name': source, 'alias': None, 'valid': True, 'weight': []})
+            node['weight'] = node['weight'] + [
+                {**entity, 'source': 'Exporting'} for entity in self.incoming[file_path][source]
+            ]
+        return {
+            'name': file_path,
+            'dependencies': list(dependencies.values())
+        }
+
+    def to_graph(self, file_paths=None) -> dict:
+        file_paths = self.imports if file_paths is None else file_paths
+        return {file_path: self.file_node(file_path) for file_path in sorted(file_paths) if file_path in self.imports}
@@ -1,60 +1,277 @@
-import json
-from collections import defaultdict
-from app.models.ast_models import Duplicates, DuplicateCodeDetails
+import heapq
+from bisect import bisect_right, insort
+from app.service.settings import DUPLICATE_VECTORIZED_MIN_LINES
 
+try:
+    import numpy as np
+except ImportError:  # Optional: only used to speed up very large files
+    np = None
 
-def get_duplicated_code(source_code: str) -> str:
-    duplicates = []
-    lines = source_code.split('\n')
-    #print(lines)
-    normalized_lines = [line.strip() for line in lines]
-    line_count = len(normalized_lines)
-    min_sequence_length = 2  
-    max_sequence_length = 10  
+MIN_SEQUENCE_LENGTH = 2
+# Multiplier of the rolling window hash (wraps around in uint64)
+WINDOW_HASH_BASE = 1000003
+
+
+def build_suffix_array(seq: list) -> list:
+    """Sort suffixes of an integer sequence by prefix doubling."""
+    n = len(seq)
+    rank = list(seq)
+    sa = list(range(n))
+    step = 1
+    while n:
+        width = max(rank) + 2
+        keys = [
+            rank[i] * width + (rank[i + step] + 1 if i + step < n else 0)
+            for i in range(n)
+        ]
+        sa.sort(key=keys.__getitem__)
+        new_rank = [0] * n
+        for idx in range(1, n):
+            new_rank[sa[idx]] = new_rank[sa[idx - 1]] + (keys[sa[idx]] != keys[sa[idx - 1]])
+        rank = new_rank
+        if rank[sa[-1]] == n - 1 or step >= n:
+            break
+        step <<= 1
+    return sa
+
+
+def build_lcp_array(seq: list, sa: list) -> list:
+    """lcp[i] is the common prefix length of suffixes sa[i - 1] and sa[i] (Kasai)."""
+    n = len(seq)
+    rank = [0] * n
+    for idx, pos in enumerate(sa):
+        rank[pos] = idx
+    lcp = [0] * n
+    h = 0
+    for pos in range(n):
+        if rank[pos] > 0:
+            prev = sa[rank[pos] - 1]
+            while pos + h < n and prev + h < n and seq[pos + h] == seq[prev + h]:
+                h += 1
+            lcp[rank[pos]] = h
+            if h:
+                h -= 1
+        else:
+            h = 0
+    return lcp
+
+
+def find_repeated_groups(sa: list, lcp: list, min_length: int) -> list:
+    """
+    Enumerate the lcp-intervals of the suffix array.
 
-    # Map from sequence representation to list of starting line numbers
-    sequence_map = defaultdict(list)
+    Each interval is a set of start lines whose next ``length`` lines are
+    identical and that is not shared by a longer repeat. Returns tuples of
+    (length, first_line, lb, rb, parent_length) where sa[lb..rb] are the
+    start lines and parent_length is the length of the enclosing interval.
+    """
+    n = len(sa)
+    groups = []
+    if n == 0:
+        return groups
 
-    # Build sequences
-    for seq_length in range(min_sequence_length, max_sequence_length + 1):
-        for i in range(line_count - seq_length + 1):
-            seq = normalized_lines[i:i+seq_length]
-            seq_repr = tuple(seq)
-            sequence_map[seq_repr].append(i + 1)  # Line numbers are 1-based
+    # Stack entries are [length, lb, first_line]
+    stack = [[0, 0, sa[0]]]
+    for i in range(1, n + 1):
+        current = lcp[i] if i < n else -1
+        lb = i - 1
+        child_first = sa[i - 1]
+        while stack and current < stack[-1][0]:
+            length, lb, first = stack.pop()
+            parent_length = max(current, stack[-1][0] if stack else 0, 0)
+            if length >= min_length:
+                groups.append((length, first, lb, i - 1, parent_length))
+            if stack and stack[-1][0] >= current:
+                stack[-1][2] = min(stack[-1][2], first)
+            child_first = first
+        if i == n:
+            break
+        if not stack or current > stack[-1][0]:
+            stack.append([current, lb, min(child_first, sa[i])])
+        else:
+            stack[-1][2] = min(stack[-1][2], sa[i])
+    return groups
 
-    # Find sequences that occur more than once
-    duplicated_sequences = {seq: positions for seq, positions in sequence_map.items() if len(positions) > 1}
 
-    # Filter out overlapping sequences
-    sorted_sequences = sorted(duplicated_sequences.items(), key=lambda x: -len(x[0]))
+def select_duplicates(sa: list, groups: list, line_count: int, min_length: int) -> list:
+    """
+    Pick non-overlapping occurrences, longest repeats first.
 
-    covered_positions = set()
-    unique_duplicates = []
+    Ties go to the repeat that occurs first in the file. Within a repeat,
+    occurrences are taken top to bottom and skipped when they touch lines
+    already claimed. A repeat whose occurrences were blocked is retried at
+    the longest length that still fits, which gives the same result as
+    checking every window length from longest to shortest.
+    """
+    rank_of = [0] * line_count
+    for idx, pos in enumerate(sa):
+        rank_of[pos] = idx
 
-    for seq, positions in sorted_sequences:
-        new_positions = []
+    # Union-find over suffix ranks that skips lines which are already covered
+    next_alive = list(range(line_count + 1))
+
+    def find(rank):
+        root = rank
+        while next_alive[root] != root:
+            root = next_alive[root]
+        while next_alive[rank] != root:
+            next_alive[rank], rank = root, next_alive[rank]
+        return root
+
+    covered = bytearray(line_count)
+    cover_starts = []
+
+    def cover(start, end):
+        for line in range(start, end):
+            covered[line] = 1
+            next_alive[rank_of[line]] = rank_of[line] + 1
+        insort(cover_starts, start)
+
+    def free_run(pos):
+        idx = bisect_right(cover_starts, pos)
+        return (cover_starts[idx] if idx < len(cover_starts) else line_count) - pos
+
+    heap = [(-length, first, lb, rb, parent) for length, first, lb, rb, parent in groups]
+    heapq.heapify(heap)
+
+    selected = []
+    while heap:
+        neg_length, first, lb, rb, parent = heapq.heappop(heap)
+        length = -neg_length
+
+        positions = []
+        rank = find(lb)
+        while rank <= rb:
+            positions.append(sa[rank])
+            rank = find(rank + 1)
+        positions.sort()
+
+        accepted = []
+        retry_length = 0
         for pos in positions:
-            overlapping = any((pos + offset) in covered_positions for offset in range(len(seq)))
-            if not overlapping:
-                new_positions.append(pos)
-                covered_positions.update(pos + offset for offset in range(len(seq)))
+            if covered[pos]:
+                continue
+            run = free_run(pos)
+            if run >= length:
+                accepted.append(pos)
+                cover(pos, pos + length)
+            else:
+                retry_length = max(retry_length, run)
+
+        if len(accepted) > 1:
+            selected.append((length, accepted))
+        if retry_length > parent and retry_length >= min_length:
+            heapq.heappush(heap, (-retry_length, first, lb, rb, parent))
+
+    return selected
+
+
+def find_duplicates(seq: list, min_length: int) -> list:
+    sa = build_suffix_array(seq)
+    lcp = build_lcp_array(seq, sa)
+    groups = find_repeated_groups(sa, lcp, min_length)
+    return select_duplicates(sa, groups, len(seq), min_length)
+
+
+def build_suffix_array_vectorized(ids) -> list:
+    """build_suffix_array with each doubling round done as one NumPy lexsort."""
+    n = len(ids)
+    if n == 0:
+        return []
+    rank = ids
+    step = 1
+    while True:
+        second = np.full(n, -1, dtype=np.int64)
+        if step < n:
+            second[:n - step] = rank[step:]
+        sa = np.lexsort((second, rank))
+        sorted_rank = rank[sa]
+        sorted_second = second[sa]
+        changed = np.zeros(n, dtype=np.int64)
+        changed[1:] = (sorted_rank[1:] != sorted_rank[:-1]) | (sorted_second[1:] != sorted_second[:-1])
+        rank = np.empty(n, dtype=np.int64)
+        rank[sa] = np.cumsum(changed)
+        if rank[sa[-1]] == n - 1 or step >= n:
+            return sa.tolist()
+        step <<= 1
+
+
+def find_duplicates_vectorized(seq: list, min_length: int) -> list:
+    """
+    Same result as ``find_duplicates``, for very large files.
+
+    Every ``min_length``-line window is hashed in bulk and ``np.unique``
+    finds the windows that occur more than once. A line outside all of them
+    cannot be part of a duplicate, so only the runs of candidate lines are
+    kept, with a unique separator between runs. The suffix array over what
+    is left is exact, so a hash collision only keeps a few extra lines.
+    """
+    ids = np.asarray(seq, dtype=np.int64)
+    n = len(ids)
+    window_count = n - min_length + 1
+    if window_count < 2:
+        return []
+
+    keys = ids[:window_count].astype(np.uint64)
+    for offset in range(1, min_length):
+        keys = keys * np.uint64(WINDOW_HASH_BASE) + ids[offset:offset + window_count].astype(np.uint64)
+    _, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+    repeated = counts[inverse.reshape(-1)] > 1
+
+    candidate = np.zeros(n, dtype=bool)
+    for offset in range(min_length):
+        candidate[offset:offset + window_count] |= repeated
+    lines = np.flatnonzero(candidate)
+    if len(lines) == 0:
+        return []
+
+    # Separators get ids no line has, so no repeat runs across a gap
+    run_starts = np.flatnonzero(np.diff(lines) != 1) + 1
+    separators = int(ids.max()) + 1 + np.arange(len(run_starts), dtype=np.int64)
+    compressed = np.insert(ids[lines], run_starts, separators)
+    original_line = np.insert(lines, run_starts, -1).tolist()
+
+    sa = build_suffix_array_vectorized(compressed)
+    compressed = compressed.tolist()
+    lcp = build_lcp_array(compressed, sa)
+    groups = find_repeated_groups(sa, lcp, min_length)
+    return [
+        (length, [original_line[pos] for pos in positions])
+        for length, positions in select_duplicates(sa, groups, len(compressed), min_length)
+    ]
+
+
+def get_duplicated_code(source_code: str, vectorized: bool = None) -> list:
+    """
+    ``vectorized`` picks the NumPy scan; by default it is used from
+    DUPLICATE_VECTORIZED_MIN_LINES lines on. Both give the same result, and
+    without NumPy installed the pure Python scan always runs.
+    """
+    lines = source_code.split('\n')
+    normalized_lines = [line.strip() for line in lines]
+    line_count = len(normalized_lines)
+
+    line_ids = {}
+    seq = [line_ids.setdefault(line, len(line_ids)) for line in normalized_lines]
 
-        if len(new_positions) > 1:
-            unique_duplicates.append((seq, new_positions))
+    if vectorized is None:
+        vectorized = line_count >= DUPLICATE_VECTORIZED_MIN_LINES
+    if vectorized and np is not None:
+        unique_duplicates = find_duplicates_vectorized(seq, MIN_SEQUENCE_LENGTH)
+    else:
+        unique_duplicates = find_duplicates(seq, MIN_SEQUENCE_LENGTH)
 
-    # Store the duplicates
+    # Store the duplicates (line numbers are 1-based)
     duplicate_code_details_list = []
-    for seq, positions in unique_duplicates:
-        original_code = "\n".join(seq)
-        start_line = positions[0]
-        end_line = positions[0] + len(seq) - 1
-        duplicates = [{"code":"\n".join(seq), "start_line":pos, "end_line":pos + len(seq) - 1}for pos in positions[1:]]
+    for length, positions in unique_duplicates:
+        code = "\n".join(normalized_lines[positions[0]:positions[0] + length])
+        duplicates = [{"code": code, "start_line": pos + 1, "end_line": pos + length} for pos in positions[1:]]
         duplicate_code_details = {
-            "original_code":original_code,
-            "start_line":start_line,
-            "end_line":end_line,
-            "duplicates":duplicates,
-            "duplicate_count":len(duplicates)
+            "original_code": code,
+            "start_line": positions[0] + 1,
+            "end_line": positions[0] + length,
+            "duplicates": duplicates,
+            "duplicate_count": len(duplicates)
         }
         duplicate_code_details_list.append(duplicate_code_details)
-    return duplicate_code_details_list
\ No newline at end of file
+    return duplicate_code_details_list
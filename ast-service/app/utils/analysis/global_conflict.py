@@ -1,10 +1,91 @@
-from app.utils.visitors.global_visitor import GlobalVariableConflictAnalyzer
+from app.utils.analysis.def_use import get_def_use
+
+# Bindings that assign a value to a name
+ASSIGNMENT_KINDS = ('assign', 'annassign', 'augassign')
+
+
+def _function_name(scope):
+    function = scope.function
+    return function.name if function is not None else None
+
+def analyze_conflicts(table, global_variables: list) -> list:
+    module = table.module
+    declared_in = {}
+    for name, scope, _ in table.global_declarations:
+        declared_in.setdefault(name, [])
+        if scope.name not in declared_in[name]:
+            declared_in[name].append(scope.name)
+
+    # Locals of each function, keyed by function name as the report names them
+    function_locals = {}
+    for scope in table.scopes:
+        if scope.kind == 'function':
+            function_locals.setdefault(scope.name, set()).update(scope.symbols)
+    local_assignments_of = {}
+    for binding in table.bindings:
+        if binding.kind in ASSIGNMENT_KINDS and binding.symbol.scope.kind == 'function':
+            local_assignments_of.setdefault(binding.name, []).append((binding.symbol.scope.name, binding.lineno))
+
+    conflicts_report = []
+    for var in dict.fromkeys(list(global_variables) + [name for name, _, _ in table.global_declarations]):
+        module_symbol = module.symbols.get(var)
+        assignments = []
+        module_assigned = False
+        usages = []
+        if module_symbol is not None:
+            for binding in module_symbol.bindings:
+                if binding.kind not in ASSIGNMENT_KINDS:
+                    continue
+                function_name = _function_name(binding.origin)
+                if binding.origin is module:
+                    module_assigned = True
+                    assignments.append(("module", binding.lineno))
+                elif function_name is not None:
+                    assignments.append((function_name, binding.lineno))
+            for use in module_symbol.uses:
+                function_name = _function_name(use.origin)
+                if function_name is not None:
+                    usages.append((function_name, use.lineno))
+        local_assignments = local_assignments_of.get(var, [])
+
+        conflict_details = {
+            "variable": var,
+            "assignments": assignments,
+            "local_assignments": local_assignments,
+            "usages": usages,
+            "conflicts": [],
+            "warnings": []
+        }
+
+        if len(assignments) + len(local_assignments) > 1:
+            conflict_details["conflicts"].append(
+                f"Multiple assignments to '{var}' detected. Potential conflict!"
+            )
+
+        if not assignments and usages:
+            conflict_details["warnings"].append(
+                f"Variable '{var}' used without assignment."
+            )
+
+        # Reads that reach the global from a function which never declared it
+        for function_name, line in usages:
+            if function_name not in declared_in.get(var, []):
+                conflict_details["conflicts"].append(
+                    f"Potential conflict in function '{function_name}' at line {line}: '{var}' is used without a 'global' declaration."
+                )
+
+        for function_name, locals_in_func in function_locals.items():
+            if var in locals_in_func and function_name not in declared_in.get(var, []) and module_assigned:
+                conflict_details["conflicts"].append(
+                    f"Shadowing issue in function '{function_name}': Local variable '{var}' may shadow the global variable."
+                )
+
+        conflicts_report.append(conflict_details)
+    return conflicts_report
 
 def global_variable_conflicts(code: str, global_variables: list) -> list:
     try:
-        analyzer = GlobalVariableConflictAnalyzer(global_variables)
-        analyzer.visit(code)
-        return analyzer.analyze_conflicts()
+        return analyze_conflicts(get_def_use(code), global_variables)
     except Exception as e:
         print(str(e))
-        return []
\ No newline at end of file
+        return []
@@ -0,0 +1,219 @@
+import ast
+import hashlib
+from app.utils.ast_cache import parse_code, source_lines
+from app.utils.tolerant_parse import parse_tolerant
+from app.utils.visitors.fused_visitor import FusedVisitor
+from app.utils.visitors.function_visitor import FunctionVisitor
+from app.utils.visitors.global_visitor import MagicNumGlobalVisitor
+from app.utils.visitors.conditional_visitor import ConditionComplexityAnalyzer
+from app.utils.visitors.field_visitor import TemporaryFieldAnalyzer
+from app.utils.visitors.unreachable_visitor import UnreachableCodeAnalyzer
+
+# Detectors whose findings for a definition depend only on that definition.
+# Their per-segment state can be reused while the segment's text is unchanged.
+LOCAL_DETECTORS = (
+    'magic_numbers',
+    'long_parameter_list',
+    'overly_complex_condition',
+    'unreachable_code',
+    'temporary_field',
+)
+
+DEFINITION_TYPES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+
+
+def split_segments(parsed_ast) -> list:
+    """
+    Split a module into top-level segments: every function or class
+    (decorators included) on its own, and runs of other statements grouped.
+    Returns (start_line, end_line, nodes) with 1-based inclusive lines.
+    """
+    segments = []
+    for node in parsed_ast.body:
+        start = min([node.lineno] + [d.lineno for d in getattr(node, 'decorator_list', [])])
+        end = node.end_lineno
+        if (not isinstance(node, DEFINITION_TYPES) and segments and
+                not isinstance(segments[-1][2][-1], DEFINITION_TYPES)):
+            segments[-1][1] = end
+            segments[-1][2].append(node)
+        else:
+            segments.append([start, end, [node]])
+    return [tuple(segment) for segment in segments]
+
+
+def segment_hash(lines: list, start: int, end: int) -> str:
+    return hashlib.sha256(''.join(lines[start - 1:end]).encode('utf-8', 'surrogatepass')).hexdigest()
+
+
+def analyze_segment(nodes: list, lines: list, offset: int, detectors: list) -> dict:
+    """
+    Partial detector state for one segment, with line numbers made relative
+    to the segment (``offset`` is the line before its first line).
+    """
+    partial = {}
+    fused = {}
+    if 'long_parameter_list' in detectors:
+        fused['long_parameter_list'] = FunctionVisitor()
+    if 'magic_numbers' in detectors:
+        fused['magic_numbers'] = MagicNumGlobalVisitor()
+    if 'overly_complex_condition' in detectors:
+        fused['overly_complex_condition'] = ConditionComplexityAnalyzer(lines)
+    if 'unreachable_code' in detectors:
+        fused['unreachable_code'] = UnreachableCodeAnalyzer(lines)
+
+    walker = FusedVisitor(fused.values())
+    for node in nodes:
+        walker.visit(node)
+    for name, visitor in fused.items():
+        if visitor in walker.errors:
+            partial[name] = {'error': str(walker.errors[visitor])}
+
+    if 'long_parameter_list' in fused and 'long_parameter_list' not in partial:
+        partial['long_parameter_list'] = [
+            {**details, 'line_number': details['line_number'] - offset}
+            for details in fused['long_parameter_list'].get_function_arguments()
+        ]
+    if 'magic_numbers' in fused and 'magic_numbers' not in partial:
+        partial['magic_numbers'] = [
+            (number, details['count'], details['line_number'] - offset)
+            for number, details in fused['magic_numbers'].magic_numbers.items()
+        ]
+    if 'overly_complex_condition' in fused and 'overly_complex_condition' not in partial:
+        partial['overly_complex_condition'] = [
+            {**condition, 'line_range': (condition['line_range'][0] - offset, condition['line_range'][1] - offset)}
+            for condition in fused['overly_complex_condition'].analyze()
+        ]
+    if 'unreachable_code' in fused and 'unreachable_code' not in partial:
+        partial['unreachable_code'] = [
+            (kind, start - offset, end - offset)
+            for kind, start, end in fused['unreachable_code'].get_unreachable_blocks()
+        ]
+
+    if 'temporary_field' in detectors:
+        try:
+            analyzer = TemporaryFieldAnalyzer()
+            for node in nodes:
+                analyzer.visit(node)
+            partial['temporary_field'] = [
+                (field_name, {
+                    key: {line - offset for line in values} if key.endswith('_lines') else set(values)
+                    for key, values in info.items()
+                })
+                for field_name, info in analyzer.fields.items()
+            ]
+        except Exception as e:
+            partial['temporary_field'] = {'error': str(e)}
+    return partial
+
+
+def scan_segments(code: str, known_hashes: set, detectors: list, tolerant: bool = False) -> dict:
+    """
+    Segment a file and analyse only the segments whose hash is not already
+    known. Returns (hash, offset, partial) per segment in file order, with
+    partial set to None for known segments. With ``tolerant``, a file with
+    syntax errors is segmented from the chunks that still parse.
+    """
+    try:
+        syntax_errors = None
+        if tolerant:
+            parsed_ast, syntax_errors = parse_tolerant(code)
+        else:
+            parsed_ast = parse_code(code)
+        lines = source_lines(code)
+        segments = []
+        for start, end, nodes in split_segments(parsed_ast):
+            key = segment_hash(lines, start, end)
+            offset = start - 1
+            partial = None if key in known_hashes else analyze_segment(nodes, lines, offset, detectors)
+            segments.append((key, offset, partial))
+        return {
+            'segments': segments,
+            'syntax_errors': syntax_errors,
+            'success': True
+        }
+    except Exception as e:
+        return {
+            'success': False,
+            'error': str(e)
+        }
+
+
+def merge_segments(segments: list, detectors: list) -> dict:
+    """
+    Combine per-segment state, in file order, into the same results a single
+    walk of the file would give. ``segments`` holds (offset, partial) pairs.
+    Returns detector name -> (data, error).
+    """
+    results = {}
+    for name in detectors:
+        errors = [partial[name]['error'] for _, partial in segments if isinstance(partial[name], dict)]
+        if errors:
+            results[name] = (None, errors[0])
+            continue
+        states = [(offset, partial[name]) for offset, partial in segments]
+        try:
+            results[name] = (MERGERS[name](states), None)
+        except Exception as e:
+            results[name] = (None, str(e))
+    return results
+
+
+def _merge_magic_numbers(states):
+    visitor = MagicNumGlobalVisitor()
+    for offset, numbers in states:
+        for number, count, line in numbers:
+            if number in visitor.magic_numbers:
+                visitor.magic_numbers[number]['count'] += count
+            else:
+                visitor.magic_numbers[number] = {'count': count, 'line_number': line + offset}
+    return {'magic_numbers': visitor.get_magic_numbers()}
+
+
+def _merge_parameter_list(states):
+    # Same-named functions overwrite in place, as in FunctionVisitor
+    function_arguments = {}
+    for offset, functions in states:
+        for details in functions:
+            function_arguments[details['function_name']] = {**details, 'line_number': details['line_number'] + offset}
+    return {'long_parameter_list': list(function_arguments.values())}
+
+
+def _merge_conditionals(states):
+    return {'conditionals': [
+        {**condition, 'line_range': (condition['line_range'][0] + offset, condition['line_range'][1] + offset)}
+        for offset, conditions in states
+        for condition in conditions
+    ]}
+
+
+def _merge_unreachable(states):
+    return {'unreachable_code': [
+        (kind, start + offset, end + offset)
+        for offset, records in states
+        for kind, start, end in records
+    ]}
+
+
+def _merge_temporary_fields(states):
+    analyzer = TemporaryFieldAnalyzer()
+    for offset, fields in states:
+        for field_name, info in fields:
+            merged = analyzer.fields[field_name]
+            for key, values in info.items():
+                if key.endswith('_lines'):
+                    merged[key].update(line + offset for line in values)
+                else:
+                    merged[key].update(values)
+    try:
+        return {'temporary_fields': analyzer.analyze()}
+    except Exception:
+        return {'temporary_fields': []}
+
+
+MERGERS = {
+    'magic_numbers': _merge_magic_numbers,
+    'long_parameter_list': _merge_parameter_list,
+    'overly_complex_condition': _merge_conditionals,
+    'unreachable_code': _merge_unreachable,
+    'temporary_field': _merge_temporary_fields,
+}
@@ -1,10 +1,25 @@
-import json
-from app.utils.visitors.global_visitor import GlobalVisitor
+import re
+from collections import defaultdict
+from app.utils.analysis.def_use import get_def_use
 
 
+def check_convention(name):
+    if re.match(r'^[a-z_]+$', name):
+        return 'snake_case'
+    elif re.match(r'^[a-z]+[A-Za-z0-9]*$', name):
+        return 'camelCase'
+    elif re.match(r'^[A-Z][a-zA-Z0-9]*$', name):
+        return 'PascalCase'
+    else:
+        return 'UNKNOWN'
+
 def get_naming_convention(parsed_ast:str):
-    visitor = GlobalVisitor()
-    conventions = visitor.get_naming_convention(parsed_ast)
+    conventions = defaultdict(list)
+    # Functions, classes and assigned names; parameters and imports are not the module's own naming
+    for binding in get_def_use(parsed_ast).bindings:
+        if binding.kind in ('parameter', 'import', 'except', 'match'):
+            continue
+        conventions[check_convention(binding.name)].append({"variable": binding.name, "line_number": binding.lineno})
     total = 0
     for key in conventions:
         total += len(conventions[key])
@@ -13,4 +28,4 @@ def get_naming_convention(parsed_ast:str):
     result.append({"type":"snake_case", "total_count":total,"type_count":len(conventions['snake_case']), "vars": conventions['snake_case'] })
     result.append({"type":"camel_case", "total_count":total,"type_count":len(conventions['camelCase']), "vars": conventions['camelCase'] })
     result.append({"type":"pascal_case", "total_count":total,"type_count":len(conventions['PascalCase']), "vars": conventions['PascalCase'] })
-    return result
\ No newline at end of file
+    return result
@@ -0,0 +1,107 @@
+import ast
+from bisect import bisect_right
+from collections import defaultdict
+
+MIN_CLONE_NODES = 12
+
+# Context markers carry no structure worth matching on
+SKIPPED_NODE_TYPES = (ast.expr_context,)
+
+
+def _field_signature(node):
+    """
+    Non-node fields of a node with names and literal values normalised away.
+    Identifiers and strings drop out entirely and literals collapse to their
+    type, so renamed or re-valued copies hash the same.
+    """
+    signature = []
+    for name, value in ast.iter_fields(node):
+        if isinstance(value, ast.AST):
+            continue
+        if isinstance(value, list):
+            if value and not isinstance(value[0], ast.AST):
+                signature.append(len(value))
+            continue
+        if isinstance(node, ast.Constant) and name == 'value':
+            signature.append(type(value).__name__)
+        elif isinstance(value, str):
+            continue
+        else:
+            signature.append(value)
+    return tuple(signature)
+
+
+def hash_subtrees(parsed_ast):
+    """
+    Structural hash and node count of every subtree, in one post-order pass.
+
+    Returns a list of (node, hash, size) in pre-order, so the subtree of the
+    entry at index i spans indices i to i + size - 1.
+    """
+    entries = []
+    child_hashes = []
+    # Entries are (node, parent index, own index once entered)
+    stack = [(parsed_ast, None, None)]
+    while stack:
+        node, parent, index = stack.pop()
+        if index is None:
+            index = len(entries)
+            entries.append((node, None, 0))
+            child_hashes.append([])
+            stack.append((node, parent, index))
+            for child in reversed(list(ast.iter_child_nodes(node))):
+                if not isinstance(child, SKIPPED_NODE_TYPES):
+                    stack.append((child, index, None))
+            continue
+
+        hashes = child_hashes[index]
+        child_hashes[index] = None
+        size = 1 + sum(child_size for _, child_size in hashes)
+        node_hash = hash((type(node).__name__, _field_signature(node), tuple(h for h, _ in hashes)))
+        entries[index] = (node, node_hash, size)
+        if parent is not None:
+            child_hashes[parent].append((node_hash, size))
+    return entries
+
+
+def find_structural_clones(parsed_ast, min_nodes: int = MIN_CLONE_NODES) -> list:
+    entries = hash_subtrees(parsed_ast)
+
+    buckets = defaultdict(list)
+    for index, (node, node_hash, size) in enumerate(entries):
+        if size >= min_nodes and isinstance(node, (ast.stmt, ast.expr)):
+            buckets[(node_hash, size)].append(index)
+
+    # Largest groups first; members inside an already reported clone are skipped
+    groups = sorted(
+        (indices for indices in buckets.values() if len(indices) > 1),
+        key=lambda indices: (-entries[indices[0]][2], indices[0])
+    )
+    reported_starts = []
+    reported_ends = {}
+
+    def is_covered(index):
+        pos = bisect_right(reported_starts, index)
+        return pos > 0 and index < reported_ends[reported_starts[pos - 1]]
+
+    clone_groups = []
+    for indices in groups:
+        members = [index for index in indices if not is_covered(index)]
+        if len(members) < 2:
+            continue
+        size = entries[members[0]][2]
+        for index in members:
+            reported_starts.insert(bisect_right(reported_starts, index), index)
+            reported_ends[index] = index + size
+
+        nodes = [entries[index][0] for index in members]
+        clone_groups.append({
+            'node_type': type(nodes[0]).__name__,
+            'node_count': size,
+            'clones': [
+                {'start_line': node.lineno, 'end_line': node.end_lineno}
+                for node in nodes
+            ],
+            'clone_count': len(nodes)
+        })
+    return clone_groups
@@ -0,0 +1,105 @@
+import ast
+from collections import Counter, defaultdict
+from typing import Dict, List
+
+
+def extract_symbols(parsed_ast) -> dict:
+    """
+    Top-level definitions of a module and every name it refers to.
+
+    Definitions are functions, classes (with their methods as
+    ``Class.method``) and global variables. Usages count loaded names,
+    attribute names and names imported with ``from ... import``, which is
+    how other modules reach a definition.
+    """
+    definitions = []
+    for node in parsed_ast.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            definitions.append({'name': node.name, 'kind': 'function', 'line_number': node.lineno})
+        elif isinstance(node, ast.ClassDef):
+            definitions.append({'name': node.name, 'kind': 'class', 'line_number': node.lineno})
+            for item in node.body:
+                if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    definitions.append({'name': f"{node.name}.{item.name}", 'kind': 'method', 'line_number': item.lineno})
+        elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            for target in targets:
+                if isinstance(target, ast.Name):
+                    definitions.append({'name': target.id, 'kind': 'variable', 'line_number': node.lineno})
+
+    usages = Counter()
+    for node in ast.walk(parsed_ast):
+        if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load):
+            usages[node.id] += 1
+        elif isinstance(node, ast.Attribute) and isinstance(node.ctx, ast.Load):
+            usages[node.attr] += 1
+        elif isinstance(node, ast.ImportFrom):
+            for alias in node.names:
+                usages[alias.name] += 1
+    return {
+        'definitions': definitions,
+        'usages': dict(usages)
+    }
+
+
+class SymbolIndex:
+    """
+    Definitions table and inverted usage index for the files of a project.
+
+    ``usage_index`` maps a name to the files that refer to it and how
+    often, so "is this used outside its own file" is a dictionary lookup no
+    matter how many files are indexed. Files are replaced and removed one
+    at a time.
+    """
+
+    def __init__(self):
+        self.files: Dict[str, dict] = {}
+        self.definitions: Dict[str, Dict[str, dict]] = defaultdict(dict)
+        self.usage_index: Dict[str, Dict[str, int]] = defaultdict(dict)
+
+    def update_file(self, file_path: str, symbols: dict):
+        self.remove_file(file_path)
+        self.files[file_path] = symbols
+        for definition in symbols['definitions']:
+            self.definitions[definition['name']][file_path] = definition
+        for name, count in symbols['usages'].items():
+            self.usage_index[name][file_path] = count
+
+    def remove_file(self, file_path: str):
+        symbols = self.files.pop(file_path, None)
+        if symbols is None:
+            return
+        for definition in symbols['definitions']:
+            self._discard(self.definitions, definition['name'], file_path)
+        for name in symbols['usages']:
+            self._discard(self.usage_index, name, file_path)
+
+    @staticmethod
+    def _discard(index, name, file_path):
+        files = index.get(name)
+        if files is None:
+            return
+        files.pop(file_path, None)
+        if not files:
+            del index[name]
+
+    def used_outside(self, name: str, file_path: str = None) -> bool:
+        files = self.usage_index.get(name)
+        if not files:
+            return False
+        return len(files) > 1 or file_path not in files
+
+    def usages(self, name: str) -> List[dict]:
+        # Methods are referred to by their attribute name
+        short_name = name.rsplit('.', 1)[-1]
+        return [
+            {'file_path': file_path, 'count': count}
+            for file_path, count in sorted(self.usage_index.get(short_name, {}).items())
+        ]
+
+    def stats(self) -> dict:
+        return {
+            'indexed_files': len(self.files),
+            'definitions': sum(len(files) for files in self.definitions.values()),
+            'names': len(self.usage_index)
+        }
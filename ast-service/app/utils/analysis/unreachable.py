@@ -1,11 +1,12 @@
-import ast
-from app.utils.visitors.unreachable_visitor import UnreachableCodeAnalyzer, correct_unreachable_lines, correct_unreachable_unique
+from app.utils.ast_cache import parse_code, source_lines
+from app.utils.visitors.unreachable_visitor import UnreachableCodeAnalyzer
 
 def unreachable_code_analysis(code: str) -> list:
+    # (kind, start_line, end_line) records; the response model turns them into messages
     try:
-        tree = ast.parse(code)
-        analyzer = UnreachableCodeAnalyzer()
+        tree = parse_code(code)
+        analyzer = UnreachableCodeAnalyzer(source_lines(code))
         analyzer.visit(tree)
-        return correct_unreachable_unique(correct_unreachable_lines(analyzer.unreachable_blocks, code))
+        return analyzer.get_unreachable_blocks()
     except Exception as e:
         return []
\ No newline at end of file
@@ -1,6 +1,16 @@
-from app.utils.visitors.function_visitor import FunctionVisitor
+from app.utils.analysis.def_use import get_def_use
 
 def get_unused_variables(parsed_ast:str):
-    visitor = FunctionVisitor()
-    visitor.visit(parsed_ast)
-    return visitor.get_unused_variables()
+    table = get_def_use(parsed_ast)
+    unused_vars = {}
+    for binding in table.bindings:
+        if binding.kind != 'assign' or binding.symbol.uses:
+            continue
+        # Class attributes are read through self / cls rather than by name
+        if binding.symbol.scope.kind == 'class' and table.attribute_loads[binding.name]:
+            continue
+        unused_vars.setdefault(binding.lineno, []).append(binding.name)
+    return [
+        {"variable_name": var, "line_number": lineno}
+        for lineno, var_list in unused_vars.items() for var in var_list
+    ]
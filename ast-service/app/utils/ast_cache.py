@@ -0,0 +1,127 @@
+import ast
+import hashlib
+import io
+import threading
+import time
+from collections import OrderedDict
+from app.service.settings import AST_CACHE_MAX_BYTES
+from app.utils.metrics import parse_seconds, parse_chars
+
+# A parsed module takes roughly 30-40 bytes of memory per byte of source
+AST_BYTES_PER_SOURCE_BYTE = 40
+# Trees that never enter the cache (oversized files, tolerant parses of broken
+# code) keep their derived data this long, enough for one analysis run
+UNCACHED_TREES = 4
+
+
+def source_hash(code: str) -> str:
+    return hashlib.sha256(code.encode('utf-8', 'surrogatepass')).hexdigest()
+
+
+def source_lines(code: str) -> list:
+    # Only \r, \n and \r\n end a line for the tokenizer; str.splitlines()
+    # would also break on form feeds and U+2028 inside string literals
+    return io.StringIO(code, newline='').readlines()
+
+
+class ASTCache:
+    """
+    LRU cache of parsed modules keyed by a hash of their source.
+
+    Cached trees are shared between requests, so visitors must treat them
+    as read-only. Entries are evicted oldest first once the estimated size
+    of all cached trees goes over ``max_bytes``. Data derived from a tree
+    (see ``derived``) lives in the tree's entry and is evicted with it.
+    """
+
+    def __init__(self, max_bytes: int = AST_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.keys = {}
+        self.uncached = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def parse(self, code: str, first_line: int = 1) -> ast.Module:
+        # A chunk of a larger file is parsed with its line numbers shifted to
+        # where it sits, so the same text at another line is its own entry
+        key = source_hash(code) if first_line == 1 else f"{source_hash(code)}:{first_line}"
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        # Parse outside the lock; a SyntaxError simply propagates uncached
+        start = time.perf_counter()
+        parsed_ast = ast.parse(code)
+        parse_seconds.observe(time.perf_counter() - start)
+        parse_chars.observe(len(code))
+        if first_line != 1:
+            ast.increment_lineno(parsed_ast, first_line - 1)
+        size = len(code) * AST_BYTES_PER_SOURCE_BYTE
+        if size > self.max_bytes:
+            return parsed_ast
+
+        with self.lock:
+            if key not in self.entries:
+                self.entries[key] = (parsed_ast, size, {})
+                self.keys[id(parsed_ast)] = key
+                self.total_bytes += size
+                while self.total_bytes > self.max_bytes:
+                    _, (evicted, evicted_size, _) = self.entries.popitem(last=False)
+                    del self.keys[id(evicted)]
+                    self.total_bytes -= evicted_size
+            return self.entries[key][0]
+
+    def _derived_slot(self, parsed_ast) -> dict:
+        # Called with the lock held; ids are only trusted while the tree is held
+        entry = self.entries.get(self.keys.get(id(parsed_ast)))
+        if entry is not None and entry[0] is parsed_ast:
+            return entry[2]
+        held = self.uncached.get(id(parsed_ast))
+        if held is not None and held[0] is parsed_ast:
+            self.uncached.move_to_end(id(parsed_ast))
+            return held[1]
+        self.uncached[id(parsed_ast)] = (parsed_ast, {})
+        while len(self.uncached) > UNCACHED_TREES:
+            self.uncached.popitem(last=False)
+        return self.uncached[id(parsed_ast)][1]
+
+    def derived(self, parsed_ast, name: str, build):
+        """``build(parsed_ast)``, computed once and kept for as long as the tree is."""
+        with self.lock:
+            value = self._derived_slot(parsed_ast).get(name)
+        if value is None:
+            value = build(parsed_ast)
+            with self.lock:
+                value = self._derived_slot(parsed_ast).setdefault(name, value)
+        return value
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.keys.clear()
+            self.uncached.clear()
+            self.total_bytes = 0
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'entries': len(self.entries),
+                'estimated_bytes': self.total_bytes,
+                'max_bytes': self.max_bytes
+            }
+
+
+ast_cache = ASTCache()
+
+
+def parse_code(code: str) -> ast.Module:
+    return ast_cache.parse(code)
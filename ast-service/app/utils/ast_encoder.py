@@ -1,28 +1,104 @@
 import ast
 import json
+from json.encoder import encode_basestring_ascii
 
+# Flush the buffered JSON once it holds this many characters
+CHUNK_SIZE = 64 * 1024
 
-class ASTEncoder(json.JSONEncoder):
-    def default(self, obj):
-        if isinstance(obj, ast.AST):
-            fields = {k: self.default(v) for k, v in ast.iter_fields(obj)}
-            return {
-                '_type': obj.__class__.__name__,
-                **fields
-            }
-        elif isinstance(obj, list):
-            return [self.default(v) for v in obj]
-        elif isinstance(obj, str):
-            return obj
-        elif isinstance(obj, int):
-            return obj
-        elif isinstance(obj, float):
-            return obj
-        elif isinstance(obj, bool):
-            return obj
-        elif obj is None:
-            return obj
-        elif obj is Ellipsis:
-            return "..."
+_RAW = 0
+_VALUE = 1
+
+
+def _scalar(value) -> str:
+    if value is None:
+        return 'null'
+    if value is True:
+        return 'true'
+    if value is False:
+        return 'false'
+    if isinstance(value, str):
+        return encode_basestring_ascii(value)
+    if isinstance(value, int):
+        return int.__repr__(value)
+    if isinstance(value, float):
+        return json.dumps(value)
+    if value is Ellipsis:
+        return '"..."'
+    # bytes and complex constants have no JSON form
+    return encode_basestring_ascii(repr(value))
+
+
+def iter_ast_json(tree, include_attributes: bool = False, chunk_size: int = CHUNK_SIZE):
+    """
+    Encode a tree as compact JSON, yielding it in chunks of about
+    ``chunk_size`` characters. Nodes become ``{"_type": ..., <fields>}``,
+    optionally with their position attributes.
+    The walk keeps its own stack, so deep expressions do not hit the
+    recursion limit and the whole document is never held in memory.
+    """
+    return _iter_stack([(_VALUE, tree)], include_attributes, chunk_size)
+
+
+def iter_module_json(tree: ast.Module, start: int, stop: int,
+                     include_attributes: bool = False, chunk_size: int = CHUNK_SIZE):
+    """
+    The part of ``iter_ast_json(tree)`` that encodes ``tree.body[start:stop]``.
+    The part starting at 0 also opens the module and the one reaching the end
+    closes it, so consecutive parts join into the whole document.
+    """
+    body = tree.body
+    stop = min(stop, len(body))
+    items = []
+    if start == 0:
+        items.append((_RAW, '{"_type":' + encode_basestring_ascii(type(tree).__name__) + ',"body":['))
+    for i in range(start, stop):
+        if i:
+            items.append((_RAW, ','))
+        items.append((_VALUE, body[i]))
+    if stop == len(body):
+        items.append((_RAW, '],"type_ignores":'))
+        items.append((_VALUE, tree.type_ignores))
+        items.append((_RAW, '}'))
+    items.reverse()
+    return _iter_stack(items, include_attributes, chunk_size)
+
+
+def _iter_stack(stack: list, include_attributes: bool, chunk_size: int):
+    buffer = []
+    size = 0
+    while stack:
+        kind, item = stack.pop()
+        if kind == _RAW:
+            piece = item
+        elif isinstance(item, ast.AST):
+            piece = '{"_type":' + encode_basestring_ascii(type(item).__name__)
+            pending = [(_RAW, '}')]
+            names = list(item._fields)
+            if include_attributes:
+                names += item._attributes
+            for name in reversed(names):
+                pending.append((_VALUE, getattr(item, name, None)))
+                pending.append((_RAW, ',' + encode_basestring_ascii(name) + ':'))
+            stack.extend(pending)
+        elif isinstance(item, list):
+            if not item:
+                piece = '[]'
+            else:
+                piece = '['
+                stack.append((_RAW, ']'))
+                for i in range(len(item) - 1, -1, -1):
+                    stack.append((_VALUE, item[i]))
+                    if i:
+                        stack.append((_RAW, ','))
         else:
-            return super().default(obj)
+            piece = _scalar(item)
+
+        buffer.append(piece)
+        size += len(piece)
+        if size >= chunk_size:
+            yield ''.join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield ''.join(buffer)
+
@@ -1,207 +1,207 @@
-import json
-
-def get_function_names_from_ast(ast_json):
-    def traverse(node, current_function=None, in_class=False):
-        if isinstance(node, dict):
-            if node.get('_type') == 'FunctionDef' and not in_class:
-                function_name = node['name']
-                if current_function:
-                    function_names.append(f"{current_function}.{function_name}")
-                else:
-                    function_names.append(function_name)
-                current_function = function_name
-            elif node.get('_type') == 'ClassDef':
-                in_class = True
-            for key, value in node.items():
-                traverse(value, current_function, in_class)
-        elif isinstance(node, list):
-            for item in node:
-                traverse(item, current_function, in_class)
-
-    ast_dict = json.loads(ast_json)
-    function_names = []
-    traverse(ast_dict)
-    return function_names
-
-def get_class_details_from_ast(ast_json):
-    def traverse(node, class_name=None):
-        if isinstance(node, dict):
-            if node.get('_type') == 'ClassDef':
-                class_name = node['name']
-                functions = []
-                variables = []
-                for item in node['body']:
-                    # import pdb; pdb.set_trace()
-                    if item.get('_type') == 'FunctionDef':
-                        functions.append(item['name'])
-                        for sub_item in item['body']:
-                            if sub_item.get('_type') == 'Assign':
-                                for target in sub_item['targets']:
-                                    if isinstance(target, dict) and target.get('_type') == 'Attribute':
-                                        if target['value'].get('_type') == 'Name' and target['value']['id'] == 'self':
-                                            variables.append(target['attr'])
-                class_details.append({
-                    'class_name': class_name,
-                    'functions': functions,
-                    'variables': variables
-                })
-            for key, value in node.items():
-                traverse(value, class_name)
-        elif isinstance(node, list):
-            for item in node:
-                traverse(item, class_name)
-
-    ast_dict = json.loads(ast_json)
-    class_details = []
-    traverse(ast_dict)
-    return class_details
-
-def get_global_variables_from_ast(ast_json):
-    def traverse(node, inside_function=False, inside_conditional=False, inside_class=False):
-        if isinstance(node, dict):
-            node_type = node.get('_type')
-
-            if node_type == 'ClassDef':
-                inside_class = True
-            
-            if node_type in ['FunctionDef', 'If', 'While', 'For']:
-                inside_function = True if node_type == 'FunctionDef' else inside_function
-                inside_conditional = True if node_type in ['If', 'While', 'For'] else inside_conditional
-
-            if node_type == 'Assign' and not inside_function and not inside_conditional and not inside_class:
-                for target in node['targets']:
-                    if isinstance(target, dict) and target.get('_type') == 'Name':
-                        var_name = target['id']
-                        var_type, class_or_func = get_type(node['value'])
-                        global_variables.append({
-                            'variable_name': var_name,
-                            'variable_type': var_type,
-                            'class_or_function': class_or_func
-                        })
-            
-            for key, value in node.items():
-                traverse(value, inside_function, inside_conditional, inside_class)
-        elif isinstance(node, list):
-            for item in node:
-                traverse(item, inside_function, inside_conditional, inside_class)
-
-    def get_type(value_node):
-        if isinstance(value_node, dict):
-            value_type = value_node.get('_type')
-
-            if value_type == 'Constant':
-                return 'constant', ''
-            elif value_type == 'Call':
-                func = value_node['func']
-                if isinstance(func, dict) and func.get('_type') == 'Name':
-                    return 'function_call', func['id']
-            elif value_type == 'List':
-                return 'list', ''
-            elif value_type == 'Dict':
-                return 'dict', ''
-            elif value_type == 'Name':
-                return 'variable', value_node['id'] 
-            elif value_type == 'ClassDef':
-                return 'class_instance', value_node['name']
-
-            return value_type, None
-        return 'unknown', ''
-
-    ast_dict = json.loads(ast_json)
-    global_variables = []
-    traverse(ast_dict)
-    return global_variables
-
-def check_main_block_in_ast(ast_json):
-    def traverse(node):
-        if isinstance(node, dict):
-            if node.get('_type') == 'If':
-                test = node.get('test')
-                if (isinstance(test, dict) and
-                    test.get('_type') == 'Compare' and
-                    test.get('left', {}).get('_type') == 'Name' and
-                    test.get('left', {}).get('id') == '__name__' and
-                    test.get('ops', [{}])[0].get('_type') == 'Eq' and
-                    test.get('comparators', [{}])[0].get('_type') == 'Constant' and
-                    test.get('comparators', [{}])[0].get('value') == '__main__'):
-                    return True
-            for key, value in node.items():
-                if traverse(value):
-                    return True
-        elif isinstance(node, list):
-            for item in node:
-                if traverse(item):
-                    return True
-        return False
-
-    ast_dict = json.loads(ast_json)
-    return traverse(ast_dict)
-
-def get_imports_from_ast(ast_json):
-    def traverse(node):
-        if isinstance(node, dict):
-            if node.get('_type') == 'Import':
-                for alias in node.get('names', []):
-                    if isinstance(alias, dict) and alias.get('_type') == 'alias':
-                        name = alias.get('name')
-                        asname = alias.get('asname')
-                        if asname:
-                            imports["imports"].append({"name": name, "alias": asname, "type": "import"})
-                        else:
-                            imports['imports'].append({"name": name, "alias": None, "type": "import"})
-            elif node.get('_type') == 'ImportFrom':
-                module = node.get('module')
-                level = node.get('level', 0)
-                level_dots = '.' * level
-                for alias in node.get('names', []):
-                    if isinstance(alias, dict) and alias.get('_type') == 'alias':
-                        name = alias.get('name')
-                        asname = alias.get('asname')
-                        if asname:
-                            imports['from'].append({"name": name, "alias": asname, "type": "from", "module": level_dots + module})
-                        else:
-                            imports['from'].append({"name": name, "alias": None, "type": "from", "module": level_dots + module})
-            for key, value in node.items():
-                traverse(value)
-        elif isinstance(node, list):
-            for item in node:
-                traverse(item)
-
-    ast_dict = json.loads(ast_json)
+import ast
+
+STANDALONE_NODE_TYPES = (
+    ast.FunctionDef, ast.ClassDef, ast.Import, ast.ImportFrom,
+    ast.Assign, ast.AnnAssign, ast.AugAssign,
+    ast.Pass, ast.Delete, ast.Global, ast.Nonlocal
+)
+
+METADATA_FIELDS = (
+    'function_names',
+    'class_details',
+    'global_variables',
+    'is_main_block_present',
+    'imports',
+    'is_standalone_file',
+)
+
+
+class ModuleMetadataVisitor(ast.NodeVisitor):
+    """
+    Collects the /analyze-ast metadata (function names, class details,
+    global variables, main block and imports) in a single walk.
+    """
+
+    def __init__(self, fields=METADATA_FIELDS):
+        self.fields = set(fields)
+        self.function_names = []
+        self.class_details = []
+        self.global_variables = []
+        self.imports = {
+            "imports": [],
+            "from": []
+        }
+        self.is_main_block_present = False
+        self.current_function = None
+        self.inside_function = False
+        self.inside_conditional = False
+        self.inside_class = False
+
+    def visit_FunctionDef(self, node):
+        prev_function = self.current_function
+        prev_inside_function = self.inside_function
+
+        # Methods and functions nested in classes are reported through class_details
+        if not self.inside_class:
+            if self.current_function:
+                self.function_names.append(f"{self.current_function}.{node.name}")
+            else:
+                self.function_names.append(node.name)
+            self.current_function = node.name
+
+        self.inside_function = True
+        self.generic_visit(node)
+        self.current_function = prev_function
+        self.inside_function = prev_inside_function
+
+    def visit_ClassDef(self, node):
+        if 'class_details' in self.fields:
+            self.add_class_details(node)
+
+        prev_inside_class = self.inside_class
+        self.inside_class = True
+        self.generic_visit(node)
+        self.inside_class = prev_inside_class
+
+    def add_class_details(self, node):
+        functions = []
+        variables = []
+        for item in node.body:
+            if isinstance(item, ast.FunctionDef):
+                functions.append(item.name)
+                for sub_item in item.body:
+                    if isinstance(sub_item, ast.Assign):
+                        for target in sub_item.targets:
+                            if (isinstance(target, ast.Attribute) and
+                                    isinstance(target.value, ast.Name) and
+                                    target.value.id == 'self'):
+                                variables.append(target.attr)
+        self.class_details.append({
+            'class_name': node.name,
+            'functions': functions,
+            'variables': variables
+        })
+
+    def visit_If(self, node):
+        if self.is_main_check(node.test):
+            self.is_main_block_present = True
+        self.visit_conditional(node)
+
+    def visit_While(self, node):
+        self.visit_conditional(node)
+
+    def visit_For(self, node):
+        self.visit_conditional(node)
+
+    def visit_conditional(self, node):
+        prev_inside_conditional = self.inside_conditional
+        self.inside_conditional = True
+        self.generic_visit(node)
+        self.inside_conditional = prev_inside_conditional
+
+    def visit_Assign(self, node):
+        if ('global_variables' in self.fields and
+                not self.inside_function and not self.inside_conditional and not self.inside_class):
+            for target in node.targets:
+                if isinstance(target, ast.Name):
+                    var_type, class_or_func = self.get_type(node.value)
+                    self.global_variables.append({
+                        'variable_name': target.id,
+                        'variable_type': var_type,
+                        'class_or_function': class_or_func
+                    })
+        self.generic_visit(node)
+
+    def visit_Import(self, node):
+        for alias in node.names:
+            self.imports["imports"].append({"name": alias.name, "alias": alias.asname, "type": "import"})
+        self.generic_visit(node)
+
+    def visit_ImportFrom(self, node):
+        module = '.' * node.level + (node.module or '')
+        for alias in node.names:
+            self.imports["from"].append({"name": alias.name, "alias": alias.asname, "type": "from", "module": module})
+        self.generic_visit(node)
+
+    def is_main_check(self, test):
+        return (isinstance(test, ast.Compare) and
+                isinstance(test.left, ast.Name) and
+                test.left.id == '__name__' and
+                isinstance(test.ops[0], ast.Eq) and
+                isinstance(test.comparators[0], ast.Constant) and
+                test.comparators[0].value == '__main__')
+
+    def get_type(self, value_node):
+        if isinstance(value_node, ast.Constant):
+            return 'constant', ''
+        elif isinstance(value_node, ast.Call) and isinstance(value_node.func, ast.Name):
+            return 'function_call', value_node.func.id
+        elif isinstance(value_node, ast.List):
+            return 'list', ''
+        elif isinstance(value_node, ast.Dict):
+            return 'dict', ''
+        elif isinstance(value_node, ast.Name):
+            return 'variable', value_node.id
+        return value_node.__class__.__name__, None
+
+
+def check_standalone_file(parsed_ast):
+    return any(not isinstance(stmt, STANDALONE_NODE_TYPES) for stmt in parsed_ast.body)
+
+# Fields that hold statements; imports are statements, so nothing else can contain one
+STATEMENT_FIELDS = ('body', 'handlers', 'orelse', 'finalbody', 'cases')
+
+def collect_imports(parsed_ast):
+    # Imports alone need no visitor: walk statement lists only, in source order
     imports = {
         "imports": [],
         "from": []
     }
-    traverse(ast_dict)
-    return imports
-
-def check_standalone_file(ast_json):
-    def traverse(node):
-        if isinstance(node, dict):
-            node_type = node.get('_type')
-            acceptable_node_types = (
-                'FunctionDef', 'ClassDef', 'Import', 'ImportFrom',
-                'Assign', 'AnnAssign', 'AugAssign',
-                'Pass', 'Delete', 'Global', 'Nonlocal'
-            )
-
-            if node_type == 'Module':
-                for stmt in node.get('body', []):
-                    if traverse(stmt):
-                        return True
-                return False
-            elif node_type in acceptable_node_types:
-                return False
-            else:
-                return True
-        elif isinstance(node, list):
-            for item in node:
-                if traverse(item):
-                    return True
-            return False
+    stack = [parsed_ast]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                imports["imports"].append({"name": alias.name, "alias": alias.asname, "type": "import"})
+        elif isinstance(node, ast.ImportFrom):
+            module = '.' * node.level + (node.module or '')
+            for alias in node.names:
+                imports["from"].append({"name": alias.name, "alias": alias.asname, "type": "from", "module": module})
         else:
-            return False
-
-    ast_dict = json.loads(ast_json)
-    return traverse(ast_dict)
+            children = []
+            for field in node._fields:
+                if field in STATEMENT_FIELDS:
+                    children.extend(getattr(node, field))
+            stack.extend(reversed(children))
+    return imports
 
+def extract_module_metadata(parsed_ast, fields=METADATA_FIELDS):
+    """The requested metadata fields only; the walk is skipped when none of them need it."""
+    fields = [field for field in METADATA_FIELDS if field in fields]
+    metadata = {}
+    walked = [field for field in fields if field != 'is_standalone_file']
+    if walked == ['imports']:
+        metadata['imports'] = collect_imports(parsed_ast)
+    elif walked:
+        visitor = ModuleMetadataVisitor(walked)
+        visitor.visit(parsed_ast)
+        for field in walked:
+            metadata[field] = getattr(visitor, field)
+    if 'is_standalone_file' in fields:
+        metadata['is_standalone_file'] = not check_standalone_file(parsed_ast)
+    return {field: metadata[field] for field in fields}
+
+def get_function_names_from_ast(parsed_ast):
+    return extract_module_metadata(parsed_ast, ['function_names'])['function_names']
+
+def get_class_details_from_ast(parsed_ast):
+    return extract_module_metadata(parsed_ast, ['class_details'])['class_details']
+
+def get_global_variables_from_ast(parsed_ast):
+    return extract_module_metadata(parsed_ast, ['global_variables'])['global_variables']
+
+def check_main_block_in_ast(parsed_ast):
+    return extract_module_metadata(parsed_ast, ['is_main_block_present'])['is_main_block_present']
+
+def get_imports_from_ast(parsed_ast):
+    return extract_module_metadata(parsed_ast, ['imports'])['imports']
@@ -0,0 +1,59 @@
+from bisect import bisect_left
+
+
+class _TrieNode:
+    __slots__ = ('children', 'terminal', 'sorted_keys')
+
+    def __init__(self):
+        self.children = {}
+        self.terminal = False
+        self.sorted_keys = None
+
+
+class DottedNameTrie:
+    """
+    Dotted names (``module.Class.method``) stored one component per level,
+    built once from a visitor's used names and then queried per candidate.
+    Lookups walk the candidate's components instead of comparing it with
+    every stored name.
+    """
+
+    def __init__(self, names=()):
+        self.root = _TrieNode()
+        for name in names:
+            self.insert(name)
+
+    def insert(self, name: str):
+        node = self.root
+        for part in name.split('.'):
+            node.sorted_keys = None
+            node = node.children.setdefault(part, _TrieNode())
+        node.terminal = True
+
+    def _find(self, parts):
+        node = self.root
+        for part in parts:
+            node = node.children.get(part)
+            if node is None:
+                return None
+        return node
+
+    def __contains__(self, name: str) -> bool:
+        node = self._find(name.split('.'))
+        return node is not None and node.terminal
+
+    def has_name_or_child(self, name: str) -> bool:
+        """True if ``name`` is stored, or any stored name starts with ``name + '.'``."""
+        return self._find(name.split('.')) is not None
+
+    def has_prefix(self, prefix: str) -> bool:
+        """True if any stored name starts with ``prefix`` (as plain ``str.startswith``)."""
+        *parents, last = prefix.split('.')
+        node = self._find(parents)
+        if node is None:
+            return False
+        # The last component may be cut short, so look for a child key that starts with it
+        if node.sorted_keys is None:
+            node.sorted_keys = sorted(node.children)
+        i = bisect_left(node.sorted_keys, last)
+        return i < len(node.sorted_keys) and node.sorted_keys[i].startswith(last)
@@ -0,0 +1,180 @@
+import functools
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from app.service.settings import RESULT_STORE_PATH, RESULT_STORE_MAX_BYTES
+from app.utils.ast_cache import source_hash
+
+# Rows removed per eviction pass once the store is over its size limit
+EVICTION_BATCH = 64
+
+
+def result_key(code: str, detector: str, version: int, params) -> str:
+    params_json = json.dumps(params, sort_keys=True, default=str)
+    return hashlib.sha256(
+        f"{source_hash(code)}\0{detector}\0{version}\0{params_json}".encode('utf-8', 'surrogatepass')
+    ).hexdigest()
+
+
+class ResultStore:
+    """
+    Detector results in a SQLite file, so work survives restarts and is
+    shared by every worker process.
+
+    Each process opens its own connection on first use. Values are pickled
+    service results. The total size of stored values is kept alongside them,
+    and once it goes over ``max_bytes`` the least recently used rows are
+    deleted. Any database error is treated as a miss so analysis never
+    fails because of the store.
+    """
+
+    def __init__(self, path: str = RESULT_STORE_PATH, max_bytes: int = RESULT_STORE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.conn = None
+        self.pid = None
+        self.lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path)
+
+    def _connect(self):
+        # A connection must not be shared with a forked or spawned child
+        if self.conn is None or self.pid != os.getpid():
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS results (
+                    key TEXT PRIMARY KEY,
+                    detector TEXT NOT NULL,
+                    value BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    last_used REAL NOT NULL
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used)')
+            conn.execute('CREATE TABLE IF NOT EXISTS store_size (id INTEGER PRIMARY KEY CHECK (id = 0), total INTEGER NOT NULL)')
+            conn.execute('INSERT OR IGNORE INTO store_size (id, total) VALUES (0, 0)')
+            self.conn = conn
+            self.pid = os.getpid()
+        return self.conn
+
+    def get(self, key: str):
+        if not self.enabled:
+            return None
+        try:
+            with self.lock:
+                conn = self._connect()
+                row = conn.execute('SELECT value FROM results WHERE key = ?', (key,)).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return None
+                conn.execute('UPDATE results SET last_used = ? WHERE key = ?', (time.time(), key))
+                self.hits += 1
+            return pickle.loads(row[0])
+        except (sqlite3.Error, pickle.UnpicklingError, EOFError) as e:
+            print(f"Result store read failed: {e}")
+            return None
+
+    def put(self, key: str, detector: str, value):
+        if not self.enabled:
+            return
+        try:
+            blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            if len(blob) > self.max_bytes:
+                return
+            with self.lock:
+                conn = self._connect()
+                # One write transaction, so the running total stays exact across processes
+                conn.execute('BEGIN IMMEDIATE')
+                try:
+                    row = conn.execute('SELECT size FROM results WHERE key = ?', (key,)).fetchone()
+                    conn.execute(
+                        'INSERT OR REPLACE INTO results (key, detector, value, size, last_used) VALUES (?, ?, ?, ?, ?)',
+                        (key, detector, blob, len(blob), time.time())
+                    )
+                    total = conn.execute('SELECT total FROM store_size WHERE id = 0').fetchone()[0]
+                    total += len(blob) - (row[0] if row else 0)
+                    total = self._evict(conn, total)
+                    conn.execute('UPDATE store_size SET total = ? WHERE id = 0', (total,))
+                    conn.execute('COMMIT')
+                except BaseException:
+                    conn.execute('ROLLBACK')
+                    raise
+        except (sqlite3.Error, pickle.PicklingError) as e:
+            print(f"Result store write failed: {e}")
+
+    def _evict(self, conn, total: int) -> int:
+        while total > self.max_bytes:
+            rows = conn.execute(
+                'SELECT key, size FROM results ORDER BY last_used LIMIT ?', (EVICTION_BATCH,)
+            ).fetchall()
+            if not rows:
+                return 0
+            for key, size in rows:
+                conn.execute('DELETE FROM results WHERE key = ?', (key,))
+                total -= size
+                if total <= self.max_bytes:
+                    break
+        return total
+
+    def clear(self):
+        if not self.enabled:
+            return
+        with self.lock:
+            conn = self._connect()
+            conn.execute('BEGIN IMMEDIATE')
+            conn.execute('DELETE FROM results')
+            conn.execute('UPDATE store_size SET total = 0 WHERE id = 0')
+            conn.execute('COMMIT')
+
+    def stats(self) -> dict:
+        return {
+            'hits': self.hits,
+            'misses': self.misses
+        }
+
+    def size_stats(self) -> dict:
+        if not self.enabled:
+            return {'entries': 0, 'used_bytes': 0, 'max_bytes': self.max_bytes}
+        with self.lock:
+            conn = self._connect()
+            return {
+                'entries': conn.execute('SELECT COUNT(*) FROM results').fetchone()[0],
+                'used_bytes': conn.execute('SELECT total FROM store_size WHERE id = 0').fetchone()[0],
+                'max_bytes': self.max_bytes
+            }
+
+
+result_store = ResultStore()
+
+
+def cached_result(detector: str, version: int = 1):
+    """
+    Look a service entry point's result up in the result store before
+    running it. The key covers the source, the detector name and version
+    and every other argument. Only successful results are stored; bump
+    ``version`` whenever the detector's output changes.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(code, *args, **kwargs):
+            key = result_key(code, detector, version, [args, kwargs])
+            cached = result_store.get(key)
+            if cached is not None:
+                return cached
+            result = func(code, *args, **kwargs)
+            if isinstance(result, dict) and result.get('success'):
+                result_store.put(key, detector, result)
+            return result
+        return wrapper
+    return decorator
@@ -0,0 +1,121 @@
+import ast
+import io
+import re
+import tokenize
+from app.utils.ast_cache import ast_cache, parse_code, source_lines
+
+# Top-level clauses that carry on the compound statement above them
+CONTINUATION_KEYWORDS = ('else', 'elif', 'except', 'finally')
+# Tokens that only ever start a statement. Seen at column 0 inside an open
+# bracket, they mean the bracket was never closed.
+STATEMENT_TOKENS = ('def', 'class', 'async', 'import', 'from', '@')
+
+_FIRST_WORD = re.compile(r'@|[A-Za-z_]+')
+
+
+def _next_code_line(lines: list, after: int):
+    for row in range(after + 1, len(lines) + 1):
+        text = lines[row - 1]
+        if text[:1] not in ('', ' ', '\t', '\n', '\r', '\f', '#'):
+            return row
+    return None
+
+
+def statement_starts(code: str) -> list:
+    """
+    Lines where a top-level statement starts. The tokenizer keeps strings,
+    brackets and continuation lines together; where it gives up (a bad
+    dedent, an unterminated string, a bracket left open) scanning starts
+    again at the next line of code at column 0.
+    """
+    lines = source_lines(code)
+    starts = []
+    line = 1
+    while line is not None and line <= len(lines):
+        restart = None
+        depth = 0
+        at_line_start = True
+        try:
+            readline = io.StringIO(''.join(lines[line - 1:])).readline
+            for token in tokenize.generate_tokens(readline):
+                if token.type == tokenize.NEWLINE:
+                    at_line_start = True
+                    continue
+                if token.type in (tokenize.NL, tokenize.COMMENT, tokenize.INDENT, tokenize.DEDENT):
+                    continue
+                if token.type == tokenize.ENDMARKER:
+                    break
+                row, col = token.start
+                row += line - 1
+                if col == 0 and at_line_start:
+                    starts.append(row)
+                elif col == 0 and depth and token.string in STATEMENT_TOKENS:
+                    restart = row
+                    break
+                at_line_start = False
+                if token.type == tokenize.OP:
+                    if token.string in '([{':
+                        depth += 1
+                    elif token.string in ')]}':
+                        depth = max(depth - 1, 0)
+        except (tokenize.TokenError, SyntaxError) as e:
+            error_row = e.lineno if isinstance(e, SyntaxError) else e.args[1][0]
+            restart = _next_code_line(lines, (error_row or 1) + line - 1)
+        line = restart
+    return sorted(set(starts))
+
+
+def split_chunks(code: str) -> list:
+    """
+    Split a module into (start_line, end_line) chunks of whole top-level
+    statements, 1-based and inclusive. Decorators stay with what they
+    decorate and else/elif/except/finally with the statement they continue.
+    """
+    lines = source_lines(code)
+    chunks = []
+    decorated = False
+    for start in statement_starts(code):
+        match = _FIRST_WORD.match(lines[start - 1])
+        word = match.group() if match else ''
+        if chunks and (decorated or word in CONTINUATION_KEYWORDS):
+            chunks[-1][1] = start
+        else:
+            chunks.append([start, start])
+        decorated = word == '@'
+    # Code before the first statement (an indented first line) is a chunk of its own
+    first_code = next((row for row, text in enumerate(lines, 1) if text.strip() and not text.lstrip().startswith('#')), None)
+    if first_code is not None and (not chunks or first_code < chunks[0][0]):
+        chunks.insert(0, [first_code, first_code])
+    for i, chunk in enumerate(chunks):
+        chunk[1] = chunks[i + 1][0] - 1 if i + 1 < len(chunks) else len(lines)
+    return [tuple(chunk) for chunk in chunks]
+
+
+def parse_tolerant(code: str):
+    """
+    Parse a module, and if it has syntax errors parse it chunk by chunk
+    instead. Returns a module holding the statements of every chunk that
+    parses, with their real line numbers, and one entry per broken chunk.
+    Chunk trees go through the parse cache, so while a file is being edited
+    only the chunks that changed are parsed again.
+    """
+    try:
+        return parse_code(code), []
+    except (SyntaxError, ValueError):
+        pass
+
+    lines = source_lines(code)
+    body = []
+    syntax_errors = []
+    for start, end in split_chunks(code):
+        try:
+            body.extend(ast_cache.parse(''.join(lines[start - 1:end]), first_line=start).body)
+        except (SyntaxError, ValueError) as e:
+            line_number = getattr(e, 'lineno', None)
+            syntax_errors.append({
+                'start_line': start,
+                'end_line': end,
+                'line_number': line_number + start - 1 if line_number else None,
+                'error': getattr(e, 'msg', None) or str(e)
+            })
+    return ast.Module(body=body, type_ignores=[]), syntax_errors
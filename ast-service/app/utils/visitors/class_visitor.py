@@ -1,5 +1,6 @@
 import ast
 from collections import defaultdict
+from app.utils.name_trie import DottedNameTrie
 
 def track_object_usage(code_ast: str, class_name: str):
     # Parse the code into an AST
@@ -56,6 +57,8 @@ class ClassVisitor(ast.NodeVisitor):
         self.defined_variables = set()
         self.used_variables_count = defaultdict(int) 
         self.class_instances = {}  
+        # variable name -> classes defining it, one entry per class seen so far
+        self.variable_owners = defaultdict(list)
 
     def visit_ClassDef(self, node):
         class_name = node.name
@@ -94,6 +97,8 @@ class ClassVisitor(ast.NodeVisitor):
             'functions': list(class_functions),
             'variables': list(class_variables)
         })
+        for var_name in self.class_details[-1]['variables']:
+            self.variable_owners[var_name].append(class_name)
 
         self.generic_visit(node)
 
@@ -121,10 +126,8 @@ class ClassVisitor(ast.NodeVisitor):
     def visit_Attribute(self, node):
         if isinstance(node.value, ast.Name):
             var_name = node.attr
-            for class_detail in self.class_details:
-                if var_name in class_detail['variables']:
-                    qualified_var = f"{class_detail['class_name']}.{var_name}"
-                    self.used_variables_count[qualified_var] += 1
+            for class_name in self.variable_owners.get(var_name, ()):
+                self.used_variables_count[f"{class_name}.{var_name}"] += 1
         self.generic_visit(node)
 
     def visit_Assign(self, node):
@@ -145,6 +148,8 @@ class ClassVisitor(ast.NodeVisitor):
 
     def find_unutilized_members(self):
         unutilized_details = []
+        instantiated_classes = set(self.class_instances.values())
+        used_functions = DottedNameTrie(self.used_functions)
 
         for class_detail in self.class_details:
             class_name = class_detail['class_name']
@@ -152,12 +157,12 @@ class ClassVisitor(ast.NodeVisitor):
             class_variables = class_detail['variables']
 
             # Check if there is an instance of this class
-            has_instance = any(instance_class == class_name for instance_class in self.class_instances.values())
+            has_instance = class_name in instantiated_classes
 
             unutilized_functions = [
                 fn for fn in class_functions 
                 if not (fn.startswith('__') and fn.endswith('__'))  # Ignore special methods
-                and all(f"{class_name}.{fn}" != used_fn and not used_fn.startswith(f"{class_name}.{fn}") for used_fn in self.used_functions)
+                and not used_functions.has_prefix(f"{class_name}.{fn}")
             ]
 
             unutilized_variables = [
@@ -13,6 +13,7 @@ class TemporaryFieldAnalyzer(ast.NodeVisitor):
         })
         self.current_method = None
         self.in_conditional = False
+        self.parents = []
 
     def visit_ClassDef(self, node):
         """Visit each class and analyze its fields and methods."""
@@ -59,20 +60,19 @@ class TemporaryFieldAnalyzer(ast.NodeVisitor):
         self.generic_visit(node)
 
     def get_parent_lineno(self, node):
-        """Recursively get line number from parent nodes."""
-        parent = getattr(node, 'parent', None)
-        while parent:
+        """Get the line number of the closest ancestor that has one."""
+        for parent in reversed(self.parents):
             lineno = getattr(parent, 'lineno', None)
             if lineno is not None:
                 return lineno
-            parent = getattr(parent, 'parent', None)
         return None
 
     def generic_visit(self, node):
-        """Override generic_visit to set parent nodes."""
+        """Override generic_visit to keep a stack of parent nodes."""
+        self.parents.append(node)
         for child in ast.iter_child_nodes(node):
-            child.parent = node
             self.visit(child)
+        self.parents.pop()
 
     def analyze(self):
         """Analyze the tracked fields to detect temporary fields."""
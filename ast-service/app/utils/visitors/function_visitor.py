@@ -6,8 +6,6 @@ class FunctionVisitor(ast.NodeVisitor):
         self.defined_functions = set()
         self.used_functions = set()
         self.function_arguments = defaultdict(list)
-        self.def_vars = defaultdict(list)
-        self.used_vars = defaultdict(list)
     
     def visit_FunctionDef(self, node):
         function_name = node.name
@@ -33,17 +31,6 @@ class FunctionVisitor(ast.NodeVisitor):
 
         self.generic_visit(node)
     
-    def visit_Assign(self, node):
-        for target in node.targets:
-            if isinstance(target, ast.Name):
-                self.def_vars[node.lineno].append(target.id)
-        self.generic_visit(node)
-
-    def visit_Name(self, node):
-        if isinstance(node.ctx, ast.Load):
-            self.used_vars[node.lineno].append(node.id)
-        self.generic_visit(node)
-
     def get_full_name(self, node):
         if isinstance(node, ast.Attribute):
             return self.get_full_name(node.value) + '.' + node.attr
@@ -65,24 +52,3 @@ class FunctionVisitor(ast.NodeVisitor):
             }
             for details in self.function_arguments.values()
         ]
-    def get_unused_variables(self):
-        unused_vars = {}
-        all_used_vars = set()
-
-        # Collect all used variables from all lines into a set
-        for vars in self.used_vars.values():
-            all_used_vars.update(vars)
-
-        # Check if a variable defined on a line is not in the set of all used variables
-        for lineno, vars in self.def_vars.items():
-            for var in vars:
-                if var not in all_used_vars:
-                    if lineno not in unused_vars:
-                        unused_vars[lineno] = []
-                    unused_vars[lineno].append({"variable": var, "line_number": lineno})
-
-        # Return list of unused variables, flattened from the dictionary
-        return [
-            {"variable_name": var_info["variable"], "line_number": var_info["line_number"]}
-            for var_list in unused_vars.values() for var_info in var_list
-        ]
@@ -0,0 +1,58 @@
+import ast
+
+
+def _skip_children(node):
+    return None
+
+
+class FusedVisitor(ast.NodeVisitor):
+    """
+    Drives several visitors over a tree in a single pre-order walk.
+
+    Every visitor handed in must do its work in its ``visit_<Type>`` methods
+    before calling ``generic_visit``. The fused walk takes over the descent,
+    so each visitor's ``generic_visit`` is silenced for the duration of the
+    walk. A visitor that raises is dropped from the rest of the walk and its
+    exception is kept in ``errors``.
+    """
+
+    def __init__(self, visitors):
+        self.visitors = list(visitors)
+        self.errors = {}
+        self._handlers = {}
+
+    def visit(self, node):
+        for visitor in self.visitors:
+            visitor.generic_visit = _skip_children
+        try:
+            self._walk(node)
+        finally:
+            for visitor in self.visitors:
+                del visitor.generic_visit
+
+    def _walk(self, root):
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            self._dispatch(node)
+            stack.extend(reversed(list(ast.iter_child_nodes(node))))
+
+    def _dispatch(self, node):
+        node_type = type(node)
+        handlers = self._handlers.get(node_type)
+        if handlers is None:
+            method = 'visit_' + node_type.__name__
+            handlers = [
+                (visitor, getattr(visitor, method))
+                for visitor in self.visitors
+                if hasattr(visitor, method)
+            ]
+            self._handlers[node_type] = handlers
+
+        for visitor, handler in handlers:
+            if visitor in self.errors:
+                continue
+            try:
+                handler(node)
+            except Exception as e:
+                self.errors[visitor] = e
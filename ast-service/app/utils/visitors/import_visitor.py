@@ -1,15 +1,30 @@
 import ast
+from collections import defaultdict
 
 class ImportVisitor(ast.NodeVisitor):
     def __init__(self):
         self.imports = {} 
         self.used_imports = set()  
         self.called_attributes = {}  
+        # item alias -> module -> number of items imported from it under that alias
+        self.item_modules = defaultdict(dict)
+
+    def index_item(self, module, alias, delta):
+        modules = self.item_modules[alias]
+        modules[module] = modules.get(module, 0) + delta
+        if not modules[module]:
+            del modules[module]
+
+    def modules_for_item(self, alias):
+        return list(self.item_modules.get(alias, ()))
 
     def visit_Import(self, node):
         for alias in node.names:
             module = alias.name
             asname = alias.asname if alias.asname else alias.name
+            # Replaces any from-import record kept under the same name
+            for item in self.imports.get(asname, {"items": []})["items"]:
+                self.index_item(asname, item["alias"], -1)
             self.imports[asname] = {"original": module, "items": []}
         self.generic_visit(node)
 
@@ -22,6 +37,7 @@ class ImportVisitor(ast.NodeVisitor):
                 item = alias.name
                 asname = alias.asname if alias.asname else alias.name
                 self.imports[module]["items"].append({"alias": asname, "original": item})
+                self.index_item(module, asname, 1)
         self.generic_visit(node)
 
     def visit_Name(self, node):
@@ -29,10 +45,8 @@ class ImportVisitor(ast.NodeVisitor):
             if node.id in self.imports: 
                 self.used_imports.add(node.id)
             else:
-                for module, data in self.imports.items():
-                    for item in data["items"]:
-                        if node.id == item["alias"]:
-                            self.used_imports.add((module, item["alias"]))
+                for module in self.modules_for_item(node.id):
+                    self.used_imports.add((module, node.id))
         self.generic_visit(node)
 
     def visit_Attribute(self, node):
@@ -43,33 +57,27 @@ class ImportVisitor(ast.NodeVisitor):
                 if attr_name not in self.called_attributes.get(var_name, []):
                     self.called_attributes[var_name] = self.called_attributes.get(var_name, []) + [attr_name]
             else:
-                for module, data in self.imports.items():
-                    for item in data["items"]:
-                        if var_name == item["alias"]:
-                            key = (module, item["alias"])
-                            if attr_name not in self.called_attributes.get(key, []):
-                                self.called_attributes[key] = self.called_attributes.get(key, []) + [attr_name]
+                for module in self.modules_for_item(var_name):
+                    key = (module, var_name)
+                    if attr_name not in self.called_attributes.get(key, []):
+                        self.called_attributes[key] = self.called_attributes.get(key, []) + [attr_name]
         elif isinstance(node.value, ast.Call):
             self.visit_Call(node.value) 
             attr_name = node.attr 
             called_obj = node.value.func
             if isinstance(called_obj, ast.Name):
                 func_name = called_obj.id
-                for module, data in self.imports.items():
-                    for item in data["items"]:
-                        if func_name == item["alias"]:
-                            key = (module, item["alias"])
-                            if attr_name not in self.called_attributes.get(key, []):
-                                self.called_attributes[key] = self.called_attributes.get(key, []) + [attr_name]
+                for module in self.modules_for_item(func_name):
+                    key = (module, func_name)
+                    if attr_name not in self.called_attributes.get(key, []):
+                        self.called_attributes[key] = self.called_attributes.get(key, []) + [attr_name]
         self.generic_visit(node)
 
     def visit_Call(self, node):
         if isinstance(node.func, ast.Name):
             func_name = node.func.id
-            for module, data in self.imports.items():
-                for item in data["items"]:
-                    if func_name == item["alias"]:
-                        self.used_imports.add((module, item["alias"]))
+            for module in self.modules_for_item(func_name):
+                self.used_imports.add((module, func_name))
         elif isinstance(node.func, ast.Attribute): 
             self.visit_Attribute(node.func)  
         self.generic_visit(node)
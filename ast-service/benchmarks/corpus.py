@@ -0,0 +1,278 @@
+"""
+Synthetic Python projects for the detector benchmarks.
+
+Run from ast-service/ to write a project to disk:
+
+    python -m benchmarks.corpus --out DIR [--files N] [--lines N] [--depth N]
+                                [--smell-density F] [--fan-out N] [--seed N]
+
+Every module defines functions and classes until it reaches about
+``lines`` lines, with control flow nested up to ``depth`` levels. Each
+function carries a code smell the detectors look for with probability
+``smell_density``: magic numbers, unused variables, long parameter lists,
+unreachable code, complex conditions, copied bodies, inconsistent names,
+dead functions, temporary fields and global reassignments. Every module
+imports functions from ``fan_out`` others. The same arguments always give
+the same project.
+"""
+import argparse
+import ast
+import os
+import random
+
+PACKAGE = 'corpus'
+
+SMELLS = (
+    'magic_number',
+    'unused_variable',
+    'long_parameters',
+    'unreachable',
+    'complex_condition',
+    'duplicate',
+    'naming',
+    'dead_function',
+    'temporary_field',
+    'global_conflict',
+)
+
+MAGIC_NUMBERS = (3.14159, 42, 86400, 1024, 0.0825, 365, 9.81, 65535)
+STDLIB_IMPORTS = ('os', 'json', 're', 'math', 'itertools', 'collections', 'functools', 'datetime')
+
+
+class ModuleWriter:
+    """Writes one module of the project, statement by statement."""
+
+    def __init__(self, rng: random.Random, index: int, imports: list, lines: int, depth: int, smell_density: float):
+        self.rng = rng
+        self.index = index
+        self.imports = imports
+        self.target_lines = lines
+        self.depth = depth
+        self.smell_density = smell_density
+        self.lines = []
+        self.counter = 0
+        self.live_functions = []
+        self.bodies = []
+
+    def emit(self, level: int, text: str):
+        self.lines.append('    ' * level + text)
+
+    def fresh(self, prefix: str) -> str:
+        self.counter += 1
+        return f"{prefix}_{self.counter}"
+
+    def smelly(self) -> bool:
+        return self.rng.random() < self.smell_density
+
+    # -- expressions -------------------------------------------------------
+
+    def number(self, smell: bool) -> str:
+        return repr(self.rng.choice(MAGIC_NUMBERS)) if smell else str(self.rng.choice((0, 1, 2)))
+
+    def expression(self, names: list, smell: bool = False) -> str:
+        left = self.rng.choice(names)
+        kind = self.rng.randrange(4)
+        if kind == 0:
+            return f"{left} + {self.number(smell)}"
+        if kind == 1 and self.imports:
+            module, function = self.rng.choice(self.imports)
+            return f"{function}({left})"
+        if kind == 2:
+            return f"len(str({left})) * {self.number(smell)}"
+        return f"{left} if {left} else {self.number(smell)}"
+
+    def condition(self, names: list, smell: bool = False) -> str:
+        first, second = self.rng.choice(names), self.rng.choice(names)
+        if smell:
+            return (f"{first} > {self.number(False)} and {second} or not {first} and "
+                    f"({second} is None or {first} == {second}) and {first} != {second}")
+        return f"{first} > {second}"
+
+    # -- statements --------------------------------------------------------
+
+    def block(self, level: int, names: list, depth_left: int, statements: int, smells: set):
+        for _ in range(statements):
+            roll = self.rng.random()
+            if depth_left and roll < 0.35:
+                self.compound(level, names, depth_left - 1, smells)
+            elif roll < 0.7:
+                target = self.fresh('value')
+                self.emit(level, f"{target} = {self.expression(names, 'magic_number' in smells)}")
+                names.append(target)
+            else:
+                self.emit(level, f"result.append({self.expression(names)})")
+
+    def compound(self, level: int, names: list, depth_left: int, smells: set):
+        kind = self.rng.randrange(5)
+        inner = list(names)
+        if kind == 0:
+            complex_condition = 'complex_condition' in smells
+            smells.discard('complex_condition')
+            self.emit(level, f"if {self.condition(names, complex_condition)}:")
+            self.block(level + 1, inner, depth_left, 2, smells)
+            self.emit(level, "else:")
+            self.block(level + 1, list(names), depth_left, 1, smells)
+        elif kind == 1:
+            item = self.fresh('item')
+            self.emit(level, f"for {item} in range(len(result) + {self.number(False)}):")
+            inner.append(item)
+            self.block(level + 1, inner, depth_left, 2, smells)
+            if 'unreachable' in smells:
+                smells.discard('unreachable')
+                self.emit(level + 1, "break")
+                self.emit(level + 1, f"result.append({item})")
+        elif kind == 2:
+            counter = self.fresh('counter')
+            self.emit(level, f"{counter} = 0")
+            self.emit(level, f"while {counter} < {self.rng.randint(2, 5)}:")
+            self.emit(level + 1, f"{counter} += 1")
+            inner.append(counter)
+            self.block(level + 1, inner, depth_left, 1, smells)
+        elif kind == 3:
+            error = self.fresh('error')
+            self.emit(level, "try:")
+            self.block(level + 1, inner, depth_left, 2, smells)
+            self.emit(level, f"except (ValueError, TypeError) as {error}:")
+            self.emit(level + 1, f"result.append(str({error}))")
+        else:
+            handle = self.fresh('handle')
+            self.emit(level, f"with open(str({self.rng.choice(names)})) as {handle}:")
+            inner.append(handle)
+            self.block(level + 1, inner, depth_left, 2, smells)
+
+    # -- definitions -------------------------------------------------------
+
+    def choose_smells(self) -> set:
+        return {smell for smell in SMELLS if self.smelly()}
+
+    def function(self, level: int = 0, method: bool = False, smells: set = None):
+        smells = self.choose_smells() if smells is None else smells
+        if 'duplicate' in smells and self.bodies and not method:
+            name = self.fresh(f"process_{self.index}")
+            self.emit(level, f"def {name}(data, options):")
+            self.lines.extend(self.rng.choice(self.bodies))
+            self.live_functions.append(name)
+            return
+
+        first = not method and not self.live_functions and not self.bodies
+        if first:
+            # Other modules import this one, so it is never dead
+            name = f"process_{self.index}_0"
+        elif 'naming' in smells:
+            name = self.fresh(f"processItem{self.index}")
+        else:
+            name = self.fresh(f"process_{self.index}")
+        params = ['data', 'options']
+        if 'long_parameters' in smells:
+            params += ['limit', 'offset', 'verbose', 'retries', 'timeout', 'callback']
+        if method:
+            params = ['self'] + params
+        self.emit(level, f"def {name}({', '.join(params)}):")
+
+        start = len(self.lines)
+        names = [param for param in params if param != 'self']
+        if 'global_conflict' in smells and not method:
+            self.emit(level + 1, f"global registry_{self.index}")
+            self.emit(level + 1, f"registry_{self.index} = {{}}")
+        self.emit(level + 1, "result = []")
+        if 'unused_variable' in smells:
+            self.emit(level + 1, f"{self.fresh('unused')} = {self.expression(names)}")
+        self.block(level + 1, names, self.depth, self.rng.randint(3, 6), smells)
+        self.emit(level + 1, "return result")
+        if 'unreachable' in smells:
+            self.emit(level + 1, f"result.append({self.rng.choice(names)})")
+        if not method:
+            self.bodies.append(self.lines[start:])
+            if first or 'dead_function' not in smells:
+                self.live_functions.append(name)
+
+    def cls(self):
+        smells = self.choose_smells()
+        name = self.fresh(f"Handler{self.index}")
+        self.emit(0, f"class {name}:")
+        self.emit(1, "def __init__(self, value):")
+        self.emit(2, "self.value = value")
+        self.emit(2, f"self.limit = {self.number('magic_number' in smells)}")
+        for _ in range(self.rng.randint(1, 3)):
+            self.emit(0, '')
+            self.function(1, method=True, smells=self.choose_smells())
+        if 'temporary_field' in smells:
+            self.emit(0, '')
+            self.emit(1, "def prepare(self, data):")
+            self.emit(2, "self.scratch = list(data)")
+            self.emit(2, "return len(self.scratch) + self.value")
+        self.emit(0, '')
+        self.emit(0, f"{self.fresh('instance')} = {name}({self.number(False)})")
+
+    def render(self) -> str:
+        self.emit(0, f'"""Generated module {self.index}."""')
+        for module in self.rng.sample(STDLIB_IMPORTS, 3):
+            self.emit(0, f"import {module}")
+        for module, function in self.imports:
+            self.emit(0, f"from {PACKAGE}.{module} import {function}")
+        self.emit(0, '')
+        self.emit(0, f"registry_{self.index} = {{}}")
+        self.emit(0, f"LIMIT_{self.index} = {self.rng.randint(10, 99)}")
+        while len(self.lines) < self.target_lines:
+            self.emit(0, '')
+            if self.bodies and self.rng.random() < 0.25:
+                self.cls()
+            else:
+                self.function()
+        self.emit(0, '')
+        self.emit(0, "def main(data=None, options=None):")
+        for name in self.live_functions:
+            self.emit(1, f"{name}(data, options)")
+        self.emit(0, '')
+        return '\n'.join(self.lines) + '\n'
+
+
+def generate_project(files: int = 20, lines: int = 300, depth: int = 3,
+                     smell_density: float = 0.2, fan_out: int = 3, seed: int = 0) -> dict:
+    """``{path: source}`` for a synthetic project of ``files`` modules."""
+    rng = random.Random(seed)
+    project = {}
+    for index in range(files):
+        others = [other for other in range(files) if other != index]
+        imports = [(f"module_{other}", f"process_{other}_0")
+                   for other in sorted(rng.sample(others, min(fan_out, len(others))))]
+        writer = ModuleWriter(rng, index, imports, lines, depth, smell_density)
+        source = writer.render()
+        # Every module must parse, or the benchmark would time error paths
+        ast.parse(source)
+        project[f"{PACKAGE}/module_{index}.py"] = source
+    return project
+
+
+def add_corpus_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument('--files', type=int)
+    parser.add_argument('--lines', type=int, help="approximate lines per file")
+    parser.add_argument('--depth', type=int, help="deepest nesting of control flow")
+    parser.add_argument('--smell-density', type=float, help="chance of each smell per function, 0 to 1")
+    parser.add_argument('--fan-out', type=int, help="project modules each module imports from")
+    parser.add_argument('--seed', type=int)
+
+
+def corpus_overrides(args) -> dict:
+    keys = ('files', 'lines', 'depth', 'smell_density', 'fan_out', 'seed')
+    return {key: getattr(args, key) for key in keys if getattr(args, key) is not None}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--out', required=True, help="directory to write the project to")
+    add_corpus_arguments(parser)
+    args = parser.parse_args()
+
+    project = generate_project(**corpus_overrides(args))
+    for path, source in project.items():
+        full_path = os.path.join(args.out, path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        with open(full_path, 'w') as f:
+            f.write(source)
+    total = sum(source.count('\n') for source in project.values())
+    print(f"Wrote {len(project)} files, {total} lines, to {args.out}")
+
+
+if __name__ == '__main__':
+    main()
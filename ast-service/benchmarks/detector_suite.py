@@ -0,0 +1,390 @@
+"""
+Detector and refactoring benchmarks over a synthetic project.
+
+Run from ast-service/:
+
+    python -m benchmarks.detector_suite [--profile NAME] [--repeat N] [--only TEXT]
+                                        [--update-baseline] [--tolerance F] [--no-refactor]
+                                        [--files N] [--lines N] [--depth N]
+                                        [--smell-density F] [--fan-out N] [--seed N]
+
+Every entry point in app/service/ast_service.py and in
+refactoring-service/app/service/refactor_service.py is run in process over
+each file of a project from ``benchmarks.corpus``. The parse cache is
+cleared before every run and the result store is switched off, so each run
+parses and analyses from scratch. The best of ``--repeat`` runs is kept.
+The refactoring cases get their input from the detectors' findings.
+
+Each run of a case is paired with a run of a reference workload just
+before it, a plain ``ast.parse`` and walk of every file, and cases are
+compared by the median of their time relative to it. A machine that is
+slower or busier across the board slows the reference by as much as the
+cases, so the comparison still holds; the report shows how fast the
+machine was against the baseline's.
+
+Relative timings are compared with benchmarks/baselines/<profile>.json.
+The run exits with status 1 when a case is slower than its baseline by
+more than its tolerance. ``--update-baseline`` writes the current timings
+instead, keeping any per-case tolerance already in the file; a higher
+``--repeat`` there gives a steadier baseline. Corpus options other than
+the profile's skip the comparison.
+"""
+import argparse
+import ast
+import contextlib
+import gc
+import inspect
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from benchmarks.corpus import generate_project, add_corpus_arguments, corpus_overrides
+from app.service import ast_service
+from app.utils.ast_cache import ast_cache
+from app.utils.result_store import result_store
+from app.utils.analysis.control_flow import cfg_cache
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_DIR = os.path.join(BENCHMARKS_DIR, 'baselines')
+REFACTORING_SERVICE_DIR = os.path.join(os.path.dirname(os.path.dirname(BENCHMARKS_DIR)), 'refactoring-service')
+
+PROFILES = {
+    'small': dict(files=10, lines=200, depth=2, smell_density=0.2, fan_out=2, seed=0),
+    'default': dict(files=20, lines=300, depth=3, smell_density=0.2, fan_out=3, seed=0),
+    'large': dict(files=40, lines=1500, depth=4, smell_density=0.3, fan_out=5, seed=0),
+}
+
+# Allowed slowdown over the baseline before a case fails, as a fraction
+DEFAULT_TOLERANCE = 0.25
+# Slowdowns smaller than this many seconds are timer noise and never fail
+MIN_REGRESSION_SECONDS = 0.005
+
+
+
+def stream_tree(code):
+    result = ast_service.generate_ast(code)
+    head, tail = ast_service.ast_envelope(result)
+    parts = [head]
+    batch = {'next': 0}
+    while batch['next'] is not None:
+        batch = ast_service.ast_json_batch(code, False, batch['next'])
+        parts.append(batch['json'])
+    parts.append(tail)
+    return ''.join(parts)
+
+
+# name -> (function, arguments built from the source and its metadata)
+AST_CASES = {
+    'analyze_all': (ast_service.analyze_all, lambda code, info: (
+        code, None, info['function_names'], info['global_names'])),
+    'analyze_ast': (stream_tree, lambda code, info: (code,)),
+    'analyze_ast_fields': (ast_service.generate_ast, lambda code, info: (
+        code, ['function_names', 'class_details', 'global_variables'])),
+    'temporary_field': (ast_service.check_temporary_field, lambda code, info: (code,)),
+    'unreachable_code': (ast_service.unreachable_code_check, lambda code, info: (code,)),
+    'overly_complex_condition': (ast_service.overly_complex_conditionals_analysis, lambda code, info: (code,)),
+    'global_conflict': (ast_service.global_variable_analysis, lambda code, info: (code, info['global_names'])),
+    'dead_class': (ast_service.dead_class_analysis, lambda code, info: (code, info['class_name'])),
+    'dead_code': (ast_service.deadcode_analysis, lambda code, info: (
+        code, info['function_names'], info['global_names'])),
+    'magic_numbers': (ast_service.magic_num_analysis, lambda code, info: (code,)),
+    'unused_variables': (ast_service.unused_variables_analysis, lambda code, info: (code,)),
+    'naming_convention': (ast_service.naming_convention_analysis, lambda code, info: (code,)),
+    'duplicated_code': (ast_service.duplicated_code_analysis, lambda code, info: (code,)),
+    'structural_clones': (ast_service.structural_clone_analysis, lambda code, info: (code, 12)),
+    'long_parameter_list': (ast_service.parameter_list_analysis, lambda code, info: (code,)),
+}
+
+# Entry points reached through another case
+COVERED_INDIRECTLY = {'ast_json_batch', 'ast_envelope'}
+
+
+def check_coverage():
+    functions = {
+        func for name, func in inspect.getmembers(ast_service, inspect.isfunction)
+        if func.__module__ == ast_service.__name__ and not name.startswith('_')
+    }
+    covered = {inspect.unwrap(func) for func, _ in AST_CASES.values()}
+    missing = sorted(func.__name__ for func in functions
+                     if inspect.unwrap(func) not in covered and func.__name__ not in COVERED_INDIRECTLY)
+    if missing:
+        raise SystemExit(f"No benchmark case for: {', '.join(missing)}")
+
+
+def file_info(code: str) -> dict:
+    metadata = ast_service.generate_ast(code, ['function_names', 'class_details', 'global_variables'])
+    classes = metadata['class_details'] or []
+    return {
+        'function_names': metadata['function_names'],
+        'global_names': [variable['variable_name'] for variable in metadata['global_variables']],
+        'class_name': classes[0]['class_name'] if classes else '',
+    }
+
+
+@contextlib.contextmanager
+def quiet():
+    # Some entry points print their findings; keep the report readable
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def reference_work(code: str):
+    # The least any detector does with a file: parse it and visit every node
+    for _ in ast.walk(ast.parse(code)):
+        pass
+
+
+def clear_caches():
+    ast_cache.clear()
+    cfg_cache.clear()
+
+
+def run_once(func, calls: list) -> float:
+    clear_caches()
+    # Like timeit: a collection landing in one run would swamp the comparison
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for args in calls:
+            result = func(*args)
+            if isinstance(result, dict) and result.get('success') is False:
+                raise SystemExit(f"{func.__name__} failed: {result.get('error')}")
+        return time.perf_counter() - start
+    finally:
+        gc.enable()
+
+
+def time_cases(cases: dict, reference: tuple, repeat: int) -> tuple:
+    """
+    Best seconds and median time relative to ``reference`` over ``repeat``
+    rounds for each ``name: (func, calls)`` case, and the best reference
+    time. A round runs every case once, so a slow spell on the machine
+    costs each case one run instead of costing one case all of them.
+    """
+    best = dict.fromkeys(cases, float('inf'))
+    ratios = {name: [] for name in cases}
+    best_reference = float('inf')
+    for _ in range(repeat):
+        for name, (func, calls) in cases.items():
+            reference_seconds = run_once(*reference)
+            seconds = run_once(func, calls)
+            best_reference = min(best_reference, reference_seconds)
+            best[name] = min(best[name], seconds)
+            ratios[name].append(seconds / reference_seconds)
+    relative = {name: statistics.median(values) for name, values in ratios.items()}
+    return best, relative, best_reference
+
+
+def refactor_calls(project: dict, infos: dict) -> tuple:
+    """
+    Arguments for each refactoring entry point, taken from what the
+    detectors found, and the lines of source each one will be given.
+    """
+    calls = {name: [] for name in ('magic_numbers', 'unused_variables', 'unreachable_code', 'inconsistent_naming', 'dead_code')}
+    lines = dict.fromkeys(calls, 0)
+
+    def add(name, args, code):
+        calls[name].append(args)
+        lines[name] += code.count('\n')
+
+    for path, code in project.items():
+        magic_numbers = ast_service.magic_num_analysis(code)['magic_numbers']
+        if magic_numbers:
+            add('magic_numbers', [code, magic_numbers], code)
+        unused = ast_service.unused_variables_analysis(code)['unused_variables']
+        if unused:
+            add('unused_variables', [[entry['variable_name'] for entry in unused], code], code)
+        unreachable = ast_service.unreachable_code_check(code)['unreachable_code']
+        unreachable_lines = sorted({start for _, start, _ in unreachable})
+        if unreachable_lines:
+            add('unreachable_code', [unreachable_lines, code], code)
+        add('inconsistent_naming', [code, 'snake_case', None], code)
+        dead = ast_service.deadcode_analysis(code, infos[path]['function_names'], infos[path]['global_names'])['function_names']
+        if dead:
+            add('dead_code', [dead[0], 'function', code], code)
+    return calls, lines
+
+
+def run_refactor_cases(calls: dict, sources: list, repeat: int) -> dict:
+    env = dict(os.environ, PYTHONPATH=REFACTORING_SERVICE_DIR)
+    completed = subprocess.run(
+        [sys.executable, os.path.join(BENCHMARKS_DIR, 'refactor_runner.py')],
+        input=json.dumps({'repeat': repeat, 'reference': sources, 'cases': calls}),
+        capture_output=True, text=True, env=env, cwd=REFACTORING_SERVICE_DIR
+    )
+    if completed.returncode != 0:
+        raise SystemExit(f"Refactoring benchmarks failed:\n{completed.stderr or completed.stdout}")
+    return json.loads(completed.stdout)
+
+
+def baseline_path(profile: str) -> str:
+    return os.path.join(BASELINE_DIR, f"{profile}.json")
+
+
+def load_baseline(profile: str):
+    path = baseline_path(profile)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def group(name: str) -> str:
+    # Each process times its own reference: 'ast' here, 'refactor' in the runner
+    return name.split('.', 1)[0]
+
+
+def write_baseline(profile: str, config: dict, repeat: int, timings: dict, relative: dict, references: dict, previous):
+    previous_cases = (previous or {}).get('cases', {})
+    baseline = {
+        'corpus': config,
+        'repeat': repeat,
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'reference_seconds': {name: round(seconds, 6) for name, seconds in sorted(references.items())},
+        'cases': {
+            name: {
+                'seconds': round(seconds, 6),
+                'relative': round(relative[name], 4),
+                'tolerance': previous_cases.get(name, {}).get('tolerance', DEFAULT_TOLERANCE)
+            }
+            for name, seconds in sorted(timings.items())
+        }
+    }
+    os.makedirs(BASELINE_DIR, exist_ok=True)
+    with open(baseline_path(profile), 'w') as f:
+        json.dump(baseline, f, indent=2)
+        f.write('\n')
+
+
+def slower_cases(relative_timings: dict, references: dict, baseline: dict, tolerance_override) -> list:
+    regressions = []
+    for name, relative in relative_timings.items():
+        recorded = baseline['cases'].get(name)
+        if recorded is None:
+            continue
+        tolerance = tolerance_override if tolerance_override is not None else recorded['tolerance']
+        extra_seconds = (relative - recorded['relative']) * references[group(name)]
+        if relative > recorded['relative'] * (1 + tolerance) and extra_seconds > MIN_REGRESSION_SECONDS:
+            regressions.append(name)
+    return regressions
+
+
+def report(timings: dict, relative_timings: dict, references: dict, case_lines: dict, baseline=None, regressions=()):
+    cases = (baseline or {}).get('cases', {})
+    recorded_references = (baseline or {}).get('reference_seconds', {})
+    for name, seconds in references.items():
+        row = f"Reference ({name}): {seconds:.4f}s"
+        if name in recorded_references:
+            row += f", machine {recorded_references[name] / seconds:.2f}x the baseline's speed"
+        print(row)
+    print(f"{'case':<36} {'seconds':>9} {'lines/s':>11} {'relative':>9} {'baseline':>9} {'change':>8}")
+    for name, seconds in timings.items():
+        relative = relative_timings[name]
+        row = f"{name:<36} {seconds:9.4f} {case_lines.get(name, 0) / seconds:11.0f} {relative:9.2f}"
+        recorded = cases.get(name)
+        if recorded is not None:
+            row += f" {recorded['relative']:9.2f} {relative / recorded['relative'] - 1:+8.1%}"
+            if name in regressions:
+                row += "  SLOWER"
+        print(row)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--profile', choices=sorted(PROFILES), default='default')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--only', help="run only the cases whose name contains this text")
+    parser.add_argument('--update-baseline', action='store_true', help="record these timings as the profile's baseline")
+    parser.add_argument('--tolerance', type=float, help="allowed slowdown for every case, overriding the baseline's")
+    parser.add_argument('--no-refactor', action='store_true', help="skip the refactoring-service cases")
+    add_corpus_arguments(parser)
+    args = parser.parse_args()
+
+    check_coverage()
+    # Every run has to do the work; stored results would turn it into a lookup
+    result_store.path = ''
+
+    overrides = corpus_overrides(args)
+    config = {**PROFILES[args.profile], **overrides}
+    project = generate_project(**config)
+    total_lines = sum(code.count('\n') for code in project.values())
+    print(f"Corpus: {len(project)} files, {total_lines} lines ({', '.join(f'{k}={v}' for k, v in config.items())})")
+
+    with quiet():
+        infos = {path: file_info(code) for path, code in project.items()}
+        ast_cases = {
+            f"ast.{name}": (func, [build_args(code, infos[path]) for path, code in project.items()])
+            for name, (func, build_args) in AST_CASES.items()
+            if not args.only or args.only in f"ast.{name}"
+        }
+        refactor_cases, refactor_lines = refactor_calls(project, infos) if not args.no_refactor else ({}, {})
+        refactor_cases = {name: calls for name, calls in refactor_cases.items()
+                          if calls and (not args.only or args.only in f"refactor.{name}")}
+    case_lines = {**dict.fromkeys(ast_cases, total_lines),
+                  **{f"refactor.{name}": lines for name, lines in refactor_lines.items()}}
+
+    sources = list(project.values())
+    reference_case = (reference_work, [(code,) for code in sources])
+
+    def measure(names=None) -> tuple:
+        """Best and relative timings of the selected cases, and each process's reference."""
+        selected = {name: case for name, case in ast_cases.items() if names is None or name in names}
+        refactor = {name: calls for name, calls in refactor_cases.items() if names is None or f"refactor.{name}" in names}
+        references = {}
+        with quiet():
+            timings, relative, references['ast'] = time_cases(selected, reference_case, args.repeat)
+        if refactor:
+            refactor_timings = run_refactor_cases(refactor, sources, args.repeat)
+            references['refactor'] = refactor_timings['reference']
+            timings.update({f"refactor.{name}": seconds for name, seconds in refactor_timings['seconds'].items()})
+            relative.update({f"refactor.{name}": ratio for name, ratio in refactor_timings['relative'].items()})
+        return timings, relative, references
+
+    timings, relative, references = measure()
+    baseline = load_baseline(args.profile)
+    if args.update_baseline:
+        if overrides:
+            raise SystemExit("Baselines are recorded for a profile's own corpus; drop the corpus options")
+        if args.only or args.no_refactor:
+            # Keep the cases this run skipped, scaled to this run's reference
+            # where there is one and to the recorded one otherwise
+            for name, reference in (baseline or {}).get('reference_seconds', {}).items():
+                references.setdefault(name, reference)
+            for name, case in (baseline or {}).get('cases', {}).items():
+                if name not in timings:
+                    timings[name] = case['relative'] * references[group(name)]
+                    relative[name] = case['relative']
+        write_baseline(args.profile, config, args.repeat, timings, relative, references, baseline)
+        report(timings, relative, references, case_lines)
+        print(f"Baseline written to {baseline_path(args.profile)}")
+        return
+
+    if baseline is None or baseline['corpus'] != config:
+        report(timings, relative, references, case_lines)
+        print("No baseline for this corpus; run with --update-baseline to record one")
+        return
+
+    regressions = slower_cases(relative, references, baseline, args.tolerance)
+    if regressions:
+        # A busy spell on the machine can slow one case down; only a
+        # slowdown that shows up again fails the run
+        print(f"Timing {len(regressions)} slower case(s) again")
+        retimed, retimed_relative, _ = measure(regressions)
+        for name in retimed:
+            timings[name] = min(timings[name], retimed[name])
+            relative[name] = min(relative[name], retimed_relative[name])
+        regressions = slower_cases(relative, references, baseline, args.tolerance)
+
+    report(timings, relative, references, case_lines, baseline, regressions)
+    if regressions:
+        raise SystemExit(f"{len(regressions)} case(s) slower than their baseline allows: {', '.join(regressions)}")
+    print("All cases within their baseline tolerance")
+
+
+if __name__ == '__main__':
+    main()
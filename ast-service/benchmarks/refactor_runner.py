@@ -0,0 +1,98 @@
+"""
+Times the refactoring-service entry points for ``benchmarks.detector_suite``.
+
+Both services keep their code in a top-level ``app`` package, so this runs
+in its own interpreter with refactoring-service/ on the path. It reads
+``{"repeat": N, "reference": [source, ...], "cases": {name: [args, ...]}}``
+as JSON on stdin and writes ``{"reference": best_seconds, "seconds":
+{name: best_seconds}, "relative": {name: median_ratio}}`` back on stdout,
+timed the same way as the detector suite's cases.
+"""
+import ast
+import contextlib
+import gc
+import inspect
+import json
+import os
+import statistics
+import sys
+import time
+from app.service import refactor_service
+from app.refactoring_models.refactor_models import MagicNumbersDetails
+
+FUNCTIONS = {
+    'inconsistent_naming': refactor_service.refactor_inconsistent_naming,
+    'magic_numbers': refactor_service.refactor_magic_numbers,
+    'unreachable_code': refactor_service.refactor_unreachable_code,
+    'unused_variables': refactor_service.refactor_unused_variables,
+    'dead_code': refactor_service.refactor_dead_code,
+}
+
+
+def request_arguments(name: str, args: list) -> list:
+    # The routes hand magic numbers over as request models, not dicts
+    if name == 'magic_numbers':
+        code, magic_numbers = args
+        return [code, [MagicNumbersDetails(**entry) for entry in magic_numbers]]
+    return args
+
+
+def check_coverage():
+    functions = {
+        name for name, func in inspect.getmembers(refactor_service, inspect.isfunction)
+        if func.__module__ == refactor_service.__name__ and not name.startswith('_')
+    }
+    missing = sorted(functions - {func.__name__ for func in FUNCTIONS.values()})
+    if missing:
+        raise SystemExit(f"No benchmark case for: {', '.join(missing)}")
+
+
+def reference_work(code: str):
+    for _ in ast.walk(ast.parse(code)):
+        pass
+
+
+def run_once(func, calls: list) -> float:
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for args in calls:
+            result = func(*args)
+            if isinstance(result, dict) and not result.get('success'):
+                raise SystemExit(f"{func.__name__} failed: {result.get('error')}")
+        return time.perf_counter() - start
+    finally:
+        gc.enable()
+
+
+def main():
+    check_coverage()
+    request = json.load(sys.stdin)
+    # Keep anything the transformers print out of the JSON on stdout
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        cases = {
+            name: [request_arguments(name, args) for args in calls]
+            for name, calls in request['cases'].items()
+        }
+        reference_calls = [[code] for code in request['reference']]
+        # Rounds over every case, each run paired with a reference run, as in the detector suite
+        best = dict.fromkeys(cases, float('inf'))
+        ratios = {name: [] for name in cases}
+        best_reference = float('inf')
+        for _ in range(request['repeat']):
+            for name, calls in cases.items():
+                reference_seconds = run_once(reference_work, reference_calls)
+                seconds = run_once(FUNCTIONS[name], calls)
+                best_reference = min(best_reference, reference_seconds)
+                best[name] = min(best[name], seconds)
+                ratios[name].append(seconds / reference_seconds)
+    json.dump({
+        'reference': best_reference,
+        'seconds': best,
+        'relative': {name: statistics.median(values) for name, values in ratios.items()},
+    }, sys.stdout)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+"""
+Dead-code visitor lookups: hash indexes and the used-name trie against the
+previous linear scans.
+
+Run from ast-service/:
+
+    python -m benchmarks.visitor_lookups [--classes N] [--imports N] [--repeat N]
+
+The linear-scan visitors and functions below keep the lookups used before
+they were indexed. Both versions must produce identical results on the
+generated module; the script fails if they differ.
+"""
+import argparse
+import ast
+import time
+from app.utils.visitors.class_visitor import ClassVisitor
+from app.utils.visitors.import_visitor import ImportVisitor
+from app.utils.visitors.function_visitor import FunctionVisitor
+from app.utils.analysis.dead_code import find_unutilized_functions
+from app.utils.name_trie import DottedNameTrie
+
+
+class LinearScanClassVisitor(ClassVisitor):
+    def visit_Attribute(self, node):
+        if isinstance(node.value, ast.Name):
+            var_name = node.attr
+            for class_detail in self.class_details:
+                if var_name in class_detail['variables']:
+                    qualified_var = f"{class_detail['class_name']}.{var_name}"
+                    self.used_variables_count[qualified_var] += 1
+        self.generic_visit(node)
+
+
+class LinearScanImportVisitor(ImportVisitor):
+    def modules_for_item(self, alias):
+        return [
+            module for module, data in self.imports.items()
+            if any(item["alias"] == alias for item in data["items"])
+        ]
+
+
+def linear_unutilized_functions(used_functions, function_names):
+    return [fn for fn in function_names if all(fn != used_fn and not used_fn.startswith(fn + '.') for used_fn in used_functions)]
+
+
+def linear_unused_methods(used_functions, method_names):
+    return [name for name in method_names if not any(used_fn.startswith(name) for used_fn in used_functions)]
+
+
+def trie_unused_methods(used_functions, method_names):
+    used = DottedNameTrie(used_functions)
+    return [name for name in method_names if not used.has_prefix(name)]
+
+
+def generate_module(classes: int, imports: int) -> str:
+    lines = []
+    for i in range(imports):
+        lines.append(f"from package{i}.module import name{i}, helper{i} as alias{i}")
+        lines.append(f"import library{i} as lib{i}")
+    for i in range(classes):
+        lines.append(f"class Model{i}:")
+        lines.append("    def __init__(self):")
+        for j in range(8):
+            lines.append(f"        self.field{i}_{j} = {j}")
+        lines.append(f"    def method{i}(self):")
+        lines.append(f"        return self.field{i}_0 + self.field{i}_1")
+    lines.append("def main():")
+    for i in range(classes):
+        lines.append(f"    obj{i} = Model{i}()")
+        lines.append(f"    obj{i}.method{i}()")
+        lines.append(f"    print(obj{i}.field{i}_2, obj{i}.field{i}_3)")
+    for i in range(imports):
+        lines.append(f"    name{i}(alias{i}.value, lib{i}.run())")
+    return "\n".join(lines) + "\n"
+
+
+def run(visitor_class, parsed_ast, collect):
+    visitor = visitor_class()
+    visitor.visit(parsed_ast)
+    return collect(visitor)
+
+
+def time_visitor(visitor_class, parsed_ast, collect, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run(visitor_class, parsed_ast, collect)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def time_call(func, args, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--classes', type=int, default=400)
+    parser.add_argument('--imports', type=int, default=400)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    parsed_ast = ast.parse(generate_module(args.classes, args.imports))
+    cases = [
+        ('ClassVisitor', LinearScanClassVisitor, ClassVisitor,
+         lambda visitor: (visitor.find_unutilized_members(), dict(visitor.used_variables_count))),
+        ('ImportVisitor', LinearScanImportVisitor, ImportVisitor,
+         lambda visitor: (visitor.get_dead_imports(), visitor.get_used_imports())),
+    ]
+    for name, linear_class, indexed_class, collect in cases:
+        if run(linear_class, parsed_ast, collect) != run(indexed_class, parsed_ast, collect):
+            raise SystemExit(f"{name}: indexed results differ from the linear scan")
+        linear = time_visitor(linear_class, parsed_ast, collect, args.repeat)
+        indexed = time_visitor(indexed_class, parsed_ast, collect, args.repeat)
+        print(f"{name:<22} linear {linear * 1000:9.1f} ms   indexed {indexed * 1000:8.1f} ms   speedup {linear / indexed:6.1f}x")
+
+    used_functions = run(FunctionVisitor, parsed_ast, lambda visitor: visitor.used_functions)
+    function_names = [f"name{i}" for i in range(args.imports)] + [f"unused{i}" for i in range(args.imports)]
+    method_names = [f"Model{i}.method{i}" for i in range(args.classes)] + [f"Model{i}.unused" for i in range(args.classes)]
+    used_methods = used_functions | {f"Model{i}.method{i}" for i in range(0, args.classes, 2)}
+    prefix_cases = [
+        ('unused functions', linear_unutilized_functions, find_unutilized_functions, (used_functions, function_names)),
+        ('unused methods', linear_unused_methods, trie_unused_methods, (used_methods, method_names)),
+    ]
+    for name, linear_func, trie_func, call_args in prefix_cases:
+        if linear_func(*call_args) != trie_func(*call_args):
+            raise SystemExit(f"{name}: trie results differ from the linear scan")
+        linear = time_call(linear_func, call_args, args.repeat)
+        indexed = time_call(trie_func, call_args, args.repeat)
+        print(f"{name:<22} linear {linear * 1000:9.1f} ms   indexed {indexed * 1000:8.1f} ms   speedup {linear / indexed:6.1f}x")
+
+
+if __name__ == '__main__':
+    main()
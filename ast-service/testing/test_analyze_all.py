@@ -0,0 +1,138 @@
+import pytest
+from endpoints_url import BASE_URL
+from pydantic import ValidationError
+import httpx
+from app.main import app
+from app.models.ast_models import AnalyzeAllResponse
+
+
+@pytest.fixture
+def sample_code():
+    return """
+import os
+
+def long_param_fun(a, b, c, d):
+    unused = 5
+    return a + b + c + d
+
+def never_called():
+    return 7
+
+result = long_param_fun(1, 2, 3, 4)
+print(result)
+"""
+
+@pytest.fixture
+def broken_code():
+    return """
+def fun(:
+    return 1
+"""
+
+
+@pytest.mark.asyncio
+async def test_analyze_all(sample_code):
+    url = f"{BASE_URL}/analyze-all"
+    async with httpx.AsyncClient() as client:
+        response = await client.post(url, json={"code": sample_code, "function_names": ["long_param_fun", "never_called"]})
+
+    assert response.status_code == 200
+
+    try:
+        validated_response = AnalyzeAllResponse(**response.json())
+
+        assert validated_response.success is True
+        assert validated_response.error is None
+
+        assert validated_response.unused_variables.data == {
+            'unused_variables': [{'variable_name': 'unused', 'line_number': 5}]
+        }
+        assert validated_response.long_parameter_list.data['long_parameter_list'][0]['function_name'] == 'long_param_fun'
+        assert validated_response.dead_code.data['function_names'] == ['never_called']
+        assert validated_response.dead_code.data['imports']['dead_imports'] == [{'alias': 'os', 'original': 'os', 'items': []}]
+        assert validated_response.duplicated_code.data == {'duplicate_code': []}
+
+    except ValidationError as e:
+        print(f"Response validation failed: {e}")
+        pytest.fail(f"Response validation failed: {e}")
+
+@pytest.mark.asyncio
+async def test_analyze_all_selected_detectors(sample_code):
+    url = f"{BASE_URL}/analyze-all"
+    async with httpx.AsyncClient() as client:
+        response = await client.post(url, json={"code": sample_code, "detectors": ["magic_numbers", "long_parameter_list"]})
+
+    assert response.status_code == 200
+
+    validated_response = AnalyzeAllResponse(**response.json())
+    assert validated_response.success is True
+    assert validated_response.magic_numbers.success is True
+    assert validated_response.long_parameter_list.success is True
+    assert validated_response.dead_code is None
+    assert validated_response.naming_convention is None
+
+@pytest.mark.asyncio
+async def test_analyze_all_unknown_detector(sample_code):
+    url = f"{BASE_URL}/analyze-all"
+    async with httpx.AsyncClient() as client:
+        response = await client.post(url, json={"code": sample_code, "detectors": ["not_a_detector"]})
+
+    assert response.status_code == 200
+
+    validated_response = AnalyzeAllResponse(**response.json())
+    assert validated_response.success is False
+    assert 'not_a_detector' in validated_response.error
+
+@pytest.mark.asyncio
+async def test_analyze_all_syntax_error(broken_code):
+    url = f"{BASE_URL}/analyze-all"
+    async with httpx.AsyncClient() as client:
+        response = await client.post(url, json={"code": broken_code})
+
+    assert response.status_code == 200
+
+    validated_response = AnalyzeAllResponse(**response.json())
+    assert validated_response.success is False
+    assert validated_response.dead_code.success is False
+    assert validated_response.duplicated_code.success is True
+
+@pytest.mark.asyncio
+async def test_analyze_all_tolerant(sample_code):
+    code = sample_code + """
+def half_typed(a, b:
+    return a
+"""
+    url = f"{BASE_URL}/analyze-all"
+    async with httpx.AsyncClient() as client:
+        response = await client.post(url, json={"code": code, "function_names": ["long_param_fun", "never_called"], "tolerant": True})
+
+    assert response.status_code == 200
+
+    validated_response = AnalyzeAllResponse(**response.json())
+    assert validated_response.success is True
+    assert validated_response.unused_variables.data == {
+        'unused_variables': [{'variable_name': 'unused', 'line_number': 5}]
+    }
+    assert validated_response.dead_code.data['function_names'] == ['never_called']
+    assert len(validated_response.syntax_errors) == 1
+    assert validated_response.syntax_errors[0].start_line == 14
+
+@pytest.mark.asyncio
+async def test_analyze_all_tolerant_line_separator_in_string(sample_code):
+    # U+2028 inside a string does not end the line, so no statement is cut in two
+    code = "print('a\u2028b')\n" + sample_code + """
+def half_typed(a, b:
+    return a
+"""
+    url = f"{BASE_URL}/analyze-all"
+    async with httpx.AsyncClient() as client:
+        response = await client.post(url, json={"code": code, "function_names": ["long_param_fun", "never_called"], "tolerant": True})
+
+    validated_response = AnalyzeAllResponse(**response.json())
+    assert validated_response.success is True
+    assert validated_response.unused_variables.data == {
+        'unused_variables': [{'variable_name': 'unused', 'line_number': 6}]
+    }
+    assert validated_response.dead_code.data['function_names'] == ['never_called']
+    assert len(validated_response.syntax_errors) == 1
+    assert validated_response.syntax_errors[0].start_line == 15
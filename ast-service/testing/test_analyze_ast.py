@@ -0,0 +1,102 @@
+import pytest
+from endpoints_url import BASE_URL
+from pydantic import ValidationError
+import httpx
+from app.main import app
+from app.models.ast_models import CodeResponse
+
+
+@pytest.fixture
+def sample_code():
+    return """
+import os
+
+def area(radius):
+    return 3.14 * radius * radius
+
+class Shape:
+    def __init__(self):
+        self.sides = 0
+"""
+
+
+@pytest.mark.asyncio
+async def test_analyze_ast_streams_tree(sample_code):
+    url = f"{BASE_URL}/analyze-ast"
+    async with httpx.AsyncClient() as client:
+        async with client.stream("POST", url, json={"code": sample_code}) as response:
+            assert response.status_code == 200
+            body = b"".join([chunk async for chunk in response.aiter_bytes()])
+
+    try:
+        validated_response = CodeResponse.model_validate_json(body)
+
+        assert validated_response.success is True
+        assert validated_response.function_names == ['area']
+        assert validated_response.ast['_type'] == 'Module'
+        assert [node['_type'] for node in validated_response.ast['body']] == ['Import', 'FunctionDef', 'ClassDef']
+        assert 'lineno' not in validated_response.ast['body'][1]
+
+    except ValidationError as e:
+        print(f"Response validation failed: {e}")
+        pytest.fail(f"Response validation failed: {e}")
+
+@pytest.mark.asyncio
+async def test_analyze_ast_streams_several_batches():
+    # Large enough that the tree is encoded over more than one worker task
+    code = "".join(f"value_{i} = [{i}, '{i}', None]\n" for i in range(20000))
+    url = f"{BASE_URL}/analyze-ast"
+    async with httpx.AsyncClient(timeout=60.0) as client:
+        response = await client.post(url, json={"code": code})
+
+    assert response.status_code == 200
+    body = response.json()['ast']['body']
+    assert len(body) == 20000
+    assert body[-1]['targets'][0]['id'] == 'value_19999'
+
+@pytest.mark.asyncio
+async def test_analyze_ast_positions(sample_code):
+    url = f"{BASE_URL}/analyze-ast"
+    async with httpx.AsyncClient() as client:
+        response = await client.post(url, json={"code": sample_code, "include_positions": True})
+
+    assert response.status_code == 200
+    function = response.json()['ast']['body'][1]
+    assert (function['lineno'], function['end_lineno']) == (4, 5)
+
+@pytest.mark.asyncio
+async def test_analyze_ast_without_tree(sample_code):
+    url = f"{BASE_URL}/analyze-ast"
+    async with httpx.AsyncClient() as client:
+        response = await client.post(url, json={"code": sample_code, "include_ast": False})
+
+    assert response.status_code == 200
+    validated_response = CodeResponse(**response.json())
+    assert validated_response.ast is None
+    assert validated_response.class_details[0]['class_name'] == 'Shape'
+
+@pytest.mark.asyncio
+async def test_analyze_ast_selected_fields(sample_code):
+    url = f"{BASE_URL}/analyze-ast"
+    async with httpx.AsyncClient() as client:
+        response = await client.post(url, json={"code": sample_code, "fields": ["function_names", "imports"]})
+        query_response = await client.post(f"{url}?fields=function_names", json={"code": sample_code})
+
+    assert response.status_code == 200
+    assert response.json() == {
+        'function_names': ['area'],
+        'imports': {'imports': [{'name': 'os', 'alias': None, 'type': 'import'}], 'from': []},
+        'success': True
+    }
+    assert query_response.json() == {'function_names': ['area'], 'success': True}
+
+@pytest.mark.asyncio
+async def test_analyze_ast_unknown_field(sample_code):
+    url = f"{BASE_URL}/analyze-ast"
+    async with httpx.AsyncClient() as client:
+        response = await client.post(url, json={"code": sample_code, "fields": ["function_names", "docstrings"]})
+
+    assert response.status_code == 200
+    validated_response = CodeResponse(**response.json())
+    assert validated_response.success is False
+    assert validated_response.error == "Unknown fields: docstrings"
@@ -0,0 +1,39 @@
+import uuid
+import pytest
+from endpoints_url import BASE_URL
+import httpx
+from app.main import app
+
+
+@pytest.fixture
+def sample_code():
+    # Unique per run so stored results from earlier runs don't skip the parse
+    return f"""# {uuid.uuid4()}
+def area(radius):
+    return 3.14159 * radius * radius * 3.14159 * 3.14159
+
+print(area(2))
+"""
+
+
+@pytest.mark.asyncio
+async def test_repeated_code_hits_cache(sample_code):
+    async with httpx.AsyncClient() as client:
+        before = (await client.get(f"{BASE_URL}/ast-cache/stats")).json()
+        first = await client.post(f"{BASE_URL}/magic-numbers", json={"code": sample_code})
+        second = await client.post(f"{BASE_URL}/unused-variables", json={"code": sample_code})
+        after = (await client.get(f"{BASE_URL}/ast-cache/stats")).json()
+
+    assert first.status_code == 200
+    assert second.status_code == 200
+    assert after['hits'] >= before['hits'] + 1
+    assert after['estimated_bytes'] <= after['max_bytes']
+
+@pytest.mark.asyncio
+async def test_cached_tree_gives_same_result(sample_code):
+    async with httpx.AsyncClient() as client:
+        first = await client.post(f"{BASE_URL}/magic-numbers", json={"code": sample_code})
+        second = await client.post(f"{BASE_URL}/magic-numbers", json={"code": sample_code})
+
+    assert first.json() == second.json()
+    assert first.json()['magic_numbers'] == [{'magic_number': 3.14159, 'line_number': 3}]
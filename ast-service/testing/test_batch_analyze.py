@@ -0,0 +1,56 @@
+import json
+import pytest
+from endpoints_url import BASE_URL
+from pydantic import ValidationError
+import httpx
+from app.main import app
+from app.models.ast_models import BatchFileResult
+
+
+@pytest.fixture
+def project_files():
+    return {
+        "pkg/geometry.py": """
+def area(radius):
+    return 3.14159 * radius * radius * 3.14159 * 3.14159
+""",
+        "pkg/unused.py": """
+def compute():
+    unused = 5
+    return 1
+""",
+        "pkg/broken.py": """
+def fun(:
+    return 1
+"""
+    }
+
+
+@pytest.mark.asyncio
+async def test_batch_analyze_streams_each_file(project_files):
+    url = f"{BASE_URL}/batch-analyze"
+    results = {}
+    async with httpx.AsyncClient() as client:
+        async with client.stream("POST", url, json={"files": project_files, "detectors": ["magic_numbers", "unused_variables"]}) as response:
+            assert response.status_code == 200
+            assert response.headers["content-type"].startswith("application/x-ndjson")
+            async for line in response.aiter_lines():
+                if line:
+                    try:
+                        result = BatchFileResult(**json.loads(line))
+                    except ValidationError as e:
+                        pytest.fail(f"Response validation failed: {e}")
+                    results[result.file_path] = result
+
+    assert set(results) == set(project_files)
+
+    geometry = results["pkg/geometry.py"]
+    assert geometry.success is True
+    assert geometry.magic_numbers.data == {'magic_numbers': [{'magic_number': 3.14159, 'line_number': 3}]}
+
+    unused = results["pkg/unused.py"]
+    assert unused.unused_variables.data == {'unused_variables': [{'variable_name': 'unused', 'line_number': 3}]}
+
+    broken = results["pkg/broken.py"]
+    assert broken.success is False
+    assert broken.magic_numbers.success is False
@@ -0,0 +1,97 @@
+import pytest
+from endpoints_url import BASE_URL
+from pydantic import ValidationError
+import httpx
+from app.main import app
+from app.models.clone_models import CloneIndexResponse, CloneQueryResponse
+
+
+@pytest.fixture
+def project_files():
+    return {
+        "utils/config.py": """
+import os
+
+def load_config(path, default):
+    if not os.path.exists(path):
+        return default
+    with open(path) as handle:
+        data = handle.read().split("\\n")
+    result = {}
+    for line in data:
+        key, value = line.split("=")
+        result[key.strip()] = value.strip()
+    return result
+""",
+        "app/settings.py": """
+SETTINGS_FILE = "settings.ini"
+
+def read_settings(filename, fallback):
+    if not os.path.exists(filename):
+        return fallback
+    with open(filename) as f:
+        lines = f.read().split("\\n")
+    out = {}
+    for l in lines:
+        k, v = l.split("=")
+        out[k.strip()] = v.strip()
+    return out
+""",
+        "app/main.py": """
+def main():
+    print("hello")
+"""
+    }
+
+
+@pytest.mark.asyncio
+async def test_clone_index_query(project_files):
+    async with httpx.AsyncClient() as client:
+        response = await client.post(f"{BASE_URL}/clone-index/files", json={"project": "clone-test", "files": project_files})
+        assert response.status_code == 200
+        validated_index = CloneIndexResponse(**response.json())
+        assert validated_index.success is True
+        assert validated_index.indexed_files == 3
+
+        response = await client.post(f"{BASE_URL}/clone-index/query", json={"project": "clone-test", "file_path": "utils/config.py"})
+
+    assert response.status_code == 200
+
+    try:
+        validated_response = CloneQueryResponse(**response.json())
+
+        assert validated_response.success is True
+        assert [clone.file_path for clone in validated_response.clones] == ["app/settings.py"]
+        match = validated_response.clones[0].matches[0]
+        assert match.start_line == 4
+        assert match.other_start_line == 4
+
+    except ValidationError as e:
+        print(f"Response validation failed: {e}")
+        pytest.fail(f"Response validation failed: {e}")
+
+@pytest.mark.asyncio
+async def test_clone_index_update_and_remove(project_files):
+    async with httpx.AsyncClient() as client:
+        await client.post(f"{BASE_URL}/clone-index/files", json={"project": "clone-update-test", "files": project_files})
+
+        # Replacing the copy with unrelated code drops the match
+        response = await client.post(f"{BASE_URL}/clone-index/query", json={
+            "project": "clone-update-test",
+            "file_path": "app/settings.py",
+            "code": "SETTINGS_FILE = 'settings.ini'\n"
+        })
+        validated_response = CloneQueryResponse(**response.json())
+        assert validated_response.success is True
+        assert validated_response.clones == []
+
+        response = await client.post(f"{BASE_URL}/clone-index/remove", json={"project": "clone-update-test", "file_paths": ["app/main.py"]})
+        validated_index = CloneIndexResponse(**response.json())
+        assert validated_index.success is True
+        assert validated_index.indexed_files == 2
+
+        response = await client.post(f"{BASE_URL}/clone-index/query", json={"project": "clone-update-test", "file_path": "app/main.py"})
+
+    validated_response = CloneQueryResponse(**response.json())
+    assert validated_response.success is False
+    assert "app/main.py" in validated_response.error
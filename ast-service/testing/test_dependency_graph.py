@@ -0,0 +1,135 @@
+import uuid
+import pytest
+from endpoints_url import BASE_URL
+from pydantic import ValidationError
+import httpx
+from app.main import app
+from app.models.dependency_models import DependencyGraphResponse
+
+
+@pytest.fixture
+def project_files():
+    return {
+        "pkg/__init__.py": "",
+        "pkg/models.py": """
+class User:
+    pass
+""",
+        "pkg/views.py": """
+import os
+from .models import User as Account
+
+def show():
+    return Account(), os.getcwd()
+""",
+        "main.py": """
+from pkg import views
+
+views.show()
+"""
+    }
+
+
+@pytest.mark.asyncio
+async def test_dependency_graph_build(project_files):
+    project = f"graph-test-{uuid.uuid4()}"
+    async with httpx.AsyncClient() as client:
+        response = await client.post(f"{BASE_URL}/dependency-graph/files", json={"project": project, "files": project_files})
+
+    assert response.status_code == 200
+
+    try:
+        validated_response = DependencyGraphResponse(**response.json())
+
+        assert validated_response.success is True
+        assert sorted(validated_response.graph) == sorted(project_files)
+
+        views = {node.name: node for node in validated_response.graph["pkg/views.py"].dependencies}
+        assert views["os"].valid is False
+        assert views["pkg/models.py"].valid is True
+        assert views["pkg/models.py"].weight[0].alias == "Account"
+        assert views["main.py"].weight[0].source == "Exporting"
+
+        models = validated_response.graph["pkg/models.py"].dependencies
+        assert [(node.name, node.weight[0].name, node.weight[0].source) for node in models] == [("pkg/views.py", "User", "Exporting")]
+
+    except ValidationError as e:
+        print(f"Response validation failed: {e}")
+        pytest.fail(f"Response validation failed: {e}")
+
+@pytest.mark.asyncio
+async def test_dependency_graph_update(project_files):
+    project = f"graph-update-test-{uuid.uuid4()}"
+    async with httpx.AsyncClient() as client:
+        await client.post(f"{BASE_URL}/dependency-graph/files", json={"project": project, "files": project_files})
+
+        # Only the edited file and the nodes its imports touch come back
+        response = await client.post(f"{BASE_URL}/dependency-graph/files", json={
+            "project": project,
+            "files": {"main.py": "from pkg.models import User\n"},
+            "full_graph": False
+        })
+        validated_response = DependencyGraphResponse(**response.json())
+        assert validated_response.success is True
+        assert validated_response.updated_files == ["main.py", "pkg/models.py", "pkg/views.py"]
+        assert [node.name for node in validated_response.graph["main.py"].dependencies] == ["pkg/models.py"]
+
+        response = await client.post(f"{BASE_URL}/dependency-graph/files", json={"project": project, "removed": ["pkg/models.py"]})
+
+    validated_response = DependencyGraphResponse(**response.json())
+    assert validated_response.success is True
+    assert "pkg/models.py" not in validated_response.graph
+    main = validated_response.graph["main.py"].dependencies
+    assert [(node.name, node.valid) for node in main] == [("pkg.models", False)]
+
+@pytest.mark.asyncio
+async def test_dependency_graph_new_file_relinks_only_its_importers(project_files):
+    project = f"graph-relink-test-{uuid.uuid4()}"
+    async with httpx.AsyncClient() as client:
+        await client.post(f"{BASE_URL}/dependency-graph/files", json={"project": project, "files": project_files})
+
+        response = await client.post(f"{BASE_URL}/dependency-graph/files", json={
+            "project": project, "files": {"pkg/extra.py": "x = 1\n"}
+        })
+        validated_response = DependencyGraphResponse(**response.json())
+        assert validated_response.updated_files == ["pkg/extra.py"]
+
+        # Only main.py imports something named ``os``, so only it is relinked
+        response = await client.post(f"{BASE_URL}/dependency-graph/files", json={
+            "project": project, "files": {"pkg/os.py": "x = 1\n"}
+        })
+
+    validated_response = DependencyGraphResponse(**response.json())
+    assert validated_response.updated_files == ["pkg/os.py", "pkg/views.py"]
+    views = {node.name: node for node in validated_response.graph["pkg/views.py"].dependencies}
+    assert views["pkg/os.py"].valid is True
+
+@pytest.mark.asyncio
+async def test_dependency_graph_seeded_from_stored_graph(project_files):
+    async with httpx.AsyncClient() as client:
+        response = await client.post(f"{BASE_URL}/dependency-graph/files", json={
+            "project": f"graph-stored-{uuid.uuid4()}", "files": project_files, "full_graph": True
+        })
+        stored = response.json()["graph"]
+
+        # A service that lost its state asks for the stored graph instead of starting empty
+        project = f"graph-seed-test-{uuid.uuid4()}"
+        edit = {"project": project, "files": {"main.py": "from pkg.models import User\n"}, "require_seed": True}
+        response = await client.post(f"{BASE_URL}/dependency-graph/files", json=edit)
+        validated_response = DependencyGraphResponse(**response.json())
+        assert validated_response.success is False
+        assert validated_response.needs_seed is True
+
+        response = await client.post(f"{BASE_URL}/dependency-graph/files", json={**edit, "seed": stored})
+        validated_response = DependencyGraphResponse(**response.json())
+        assert validated_response.success is True
+        assert validated_response.updated_files == ["main.py", "pkg/models.py", "pkg/views.py"]
+
+        response = await client.get(f"{BASE_URL}/dependency-graph/{project}")
+
+    graph = DependencyGraphResponse(**response.json()).graph
+    assert sorted(graph) == sorted(project_files)
+    views = {node.name: node for node in graph["pkg/views.py"].dependencies}
+    assert views["pkg/models.py"].valid is True
+    assert "main.py" not in views
+    assert [node.name for node in graph["main.py"].dependencies] == ["pkg/models.py"]
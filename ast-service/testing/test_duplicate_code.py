@@ -1,8 +1,12 @@
 import pytest
 from endpoints_url import BASE_URL
 from pydantic import ValidationError
+import random
 import httpx
 from app.models.ast_models import DuplicateCodeResponse
+from app.utils.analysis.duplicate_code import (
+    MIN_SEQUENCE_LENGTH, find_duplicates, find_duplicates_vectorized, get_duplicated_code
+)
 
 @pytest.fixture
 def sample_duplicate_code():
@@ -174,4 +178,38 @@ async def test_2_duplicate_code(sample_duplicate_code2, duplicate_code_response_
             
     except ValidationError as e:
         print(f"Response validation failed: {e}")
-        pytest.fail(f"Response validation failed: {e}")
\ No newline at end of file
+        pytest.fail(f"Response validation failed: {e}")
+
+@pytest.mark.asyncio
+async def test_vectorized_duplicate_code(sample_duplicate_code, duplicate_code_response):
+    # Same result whether the NumPy scan runs or is not installed
+    url = f"{BASE_URL}/duplicated-code"
+    async with httpx.AsyncClient() as client:
+        response = await client.post(url, json={"code": sample_duplicate_code, "vectorized": True})
+
+    assert response.status_code == 200
+
+    try:
+        validated_response = DuplicateCodeResponse(**response.json())
+        assert validated_response.dict() == duplicate_code_response
+
+    except ValidationError as e:
+        print(f"Response validation failed: {e}")
+        pytest.fail(f"Response validation failed: {e}")
+
+
+def test_vectorized_scan_matches_python_scan(sample_duplicate_code):
+    # The server may not have NumPy; compare the two scans in process instead
+    pytest.importorskip("numpy")
+    rng = random.Random(0)
+    sequences = [
+        [],
+        list(range(10)),
+        [1, 2, 3, 4] * 6,
+        [rng.randrange(4) for _ in range(500)],
+        [rng.randrange(40) for _ in range(2000)],
+    ]
+    for seq in sequences:
+        assert find_duplicates_vectorized(seq, MIN_SEQUENCE_LENGTH) == find_duplicates(seq, MIN_SEQUENCE_LENGTH)
+    assert get_duplicated_code(sample_duplicate_code, vectorized=True) == \
+        get_duplicated_code(sample_duplicate_code, vectorized=False)
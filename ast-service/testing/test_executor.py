@@ -0,0 +1,93 @@
+import asyncio
+import os
+import time
+import pytest
+import pytest_asyncio
+from app.service.executor import AnalysisExecutor
+
+
+# Run in the worker processes, so they have to be importable from there
+def nap(seconds, value):
+    time.sleep(seconds)
+    return value
+
+
+def crash():
+    os._exit(1)
+
+
+@pytest_asyncio.fixture
+async def executor():
+    # One worker, so every task in a test lands on the same process
+    executor = AnalysisExecutor(workers=1, timeout=1.0, max_queued=1)
+    await executor.start()
+    yield executor
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_runs_in_worker(executor):
+    result = await executor.run(os.getpid)
+    assert result != os.getpid()
+
+
+@pytest.mark.asyncio
+async def test_timeout_replaces_worker(executor):
+    worker = executor.pools[0]
+    result = await executor.run(nap, 5, 'late', timeout=0.5)
+
+    assert result == {'success': False, 'error': "Analysis timed out after 0.5s"}
+    assert executor.pools[0] is not worker
+    assert await executor.run(nap, 0, 'next') == 'next'
+
+
+@pytest.mark.asyncio
+async def test_timeout_does_not_count_queued_time(executor):
+    # The second task waits for the first before its own 1 s starts
+    first, second = await asyncio.gather(
+        executor.run(nap, 0.7, 'first'),
+        executor.run(nap, 0.7, 'second')
+    )
+    assert (first, second) == ('first', 'second')
+
+
+@pytest.mark.asyncio
+async def test_dead_worker_is_replaced(executor):
+    worker = executor.pools[0]
+    result = await executor.run(crash)
+
+    assert result == {'success': False, 'error': "Analysis worker stopped unexpectedly"}
+    assert executor.pools[0] is not worker
+    assert await executor.run(nap, 0, 'next') == 'next'
+
+
+@pytest.mark.asyncio
+async def test_full_queue_refuses_work(executor):
+    # One task running and one waiting fill a worker with max_queued=1
+    results = await asyncio.gather(
+        executor.run(nap, 0.3, 'running'),
+        executor.run(nap, 0, 'queued'),
+        executor.run(nap, 0, 'refused')
+    )
+    assert results == [
+        'running',
+        'queued',
+        {'success': False, 'error': "Analysis queue is full; try again later"}
+    ]
+    assert executor.load == [0]
+
+
+@pytest.mark.asyncio
+async def test_task_on_replaced_worker_is_retried(executor):
+    # A worker replaced under a running task breaks its pool; the task is
+    # run again on the new worker instead of failing
+    start = time.monotonic()
+    task = asyncio.ensure_future(executor.run(nap, 0.5, 'retried'))
+    await asyncio.sleep(0.2)
+    worker = executor.pools[0]
+    executor._replace(0, worker)
+
+    assert await task == 'retried'
+    # The full nap ran again after the replacement
+    assert time.monotonic() - start >= 0.7
+    assert executor.pools[0] is not worker
@@ -159,4 +159,115 @@ async def test_2_conflict_code(sample_conflict_code2, conflict_code_response_2):
         assert validated_response.dict() == conflict_code_response_2
             
     except ValidationError as e:
-        pytest.fail(f"Response validation failed: {e}")
\ No newline at end of file
+        pytest.fail(f"Response validation failed: {e}")
+
+@pytest.fixture
+def sample_same_name_in_two_functions():
+    return """
+total = 0
+
+def first():
+    total = 1
+    return total
+
+def second():
+    total = 2
+    return total
+"""
+
+@pytest.fixture
+def sample_class_attribute():
+    return """
+level = 1
+
+class Config:
+    level = 3
+"""
+
+@pytest.fixture
+def sample_global_statement():
+    return """
+counter = 0
+
+def bump():
+    global counter
+    counter += 1
+"""
+
+@pytest.fixture
+def sample_comprehension_variable():
+    return """
+item = None
+
+def names(items):
+    return [item.name for item in items]
+"""
+
+
+async def post_global_conflict(code, global_variables):
+    url = f"{BASE_URL}/global-conflict"
+    async with httpx.AsyncClient() as client:
+        response = await client.post(url, json={"code": code, "global_variables": global_variables})
+    assert response.status_code == 200
+
+    try:
+        validated_response = VariableConflictResponse(**response.json())
+    except ValidationError as e:
+        pytest.fail(f"Response validation failed: {e}")
+    assert validated_response.success is True
+    assert validated_response.error is None
+    return validated_response.dict()['conflicts_report']
+
+
+@pytest.mark.asyncio
+async def test_same_name_in_two_functions(sample_same_name_in_two_functions):
+    report = await post_global_conflict(sample_same_name_in_two_functions, ['total'])
+    assert report == [{
+        'variable': 'total',
+        'assignments': [('module', 2)],
+        'local_assignments': [('first', 5), ('second', 9)],
+        'usages': [],
+        'conflicts': ["Multiple assignments to 'total' detected. Potential conflict!",
+                      "Shadowing issue in function 'first': Local variable 'total' may shadow the global variable.",
+                      "Shadowing issue in function 'second': Local variable 'total' may shadow the global variable."],
+        'warnings': []
+    }]
+
+@pytest.mark.asyncio
+async def test_class_attribute_does_not_shadow(sample_class_attribute):
+    # A class body is its own namespace, not a function shadowing the global
+    report = await post_global_conflict(sample_class_attribute, ['level'])
+    assert report == [{
+        'variable': 'level',
+        'assignments': [('module', 2)],
+        'local_assignments': [],
+        'usages': [],
+        'conflicts': [],
+        'warnings': []
+    }]
+
+@pytest.mark.asyncio
+async def test_global_statement_assignment(sample_global_statement):
+    # `global counter; counter += 1` both reads and assigns the global
+    report = await post_global_conflict(sample_global_statement, ['counter'])
+    assert report == [{
+        'variable': 'counter',
+        'assignments': [('module', 2), ('bump', 6)],
+        'local_assignments': [],
+        'usages': [('bump', 6)],
+        'conflicts': ["Multiple assignments to 'counter' detected. Potential conflict!"],
+        'warnings': []
+    }]
+
+@pytest.mark.asyncio
+async def test_comprehension_variable_does_not_shadow(sample_comprehension_variable):
+    # The comprehension's `item` is local to the comprehension
+    report = await post_global_conflict(sample_comprehension_variable, ['item'])
+    assert report == [{
+        'variable': 'item',
+        'assignments': [('module', 2)],
+        'local_assignments': [],
+        'usages': [],
+        'conflicts': [],
+        'warnings': []
+    }]
@@ -0,0 +1,114 @@
+import asyncio
+import uuid
+import pytest
+from endpoints_url import BASE_URL
+from pydantic import ValidationError
+import httpx
+from app.main import app
+from app.models.ast_models import IncrementalAnalysisResponse
+
+
+@pytest.fixture
+def original_code():
+    return """
+def area(radius):
+    return 3.14159 * radius * radius * 3.14159 * 3.14159
+
+def long_param_fun(a, b, c, d):
+    if a > 1 and b > 2 or c > 3 and d > 4:
+        return a
+    return b
+"""
+
+@pytest.fixture
+def edited_code():
+    # A new function at the top shifts every existing definition down two lines
+    return """
+def helper():
+    return 0
+
+def area(radius):
+    return 3.14159 * radius * radius * 3.14159 * 3.14159
+
+def long_param_fun(a, b, c, d):
+    if a > 1 and b > 2 or c > 3 and d > 4:
+        return a
+    return b
+"""
+
+
+@pytest.mark.asyncio
+async def test_incremental_reuses_unchanged_definitions(original_code, edited_code):
+    url = f"{BASE_URL}/analyze-incremental"
+    # The service keeps state per file path, so use a fresh one each run
+    file_path = f"incremental/{uuid.uuid4()}.py"
+    async with httpx.AsyncClient() as client:
+        first = await client.post(url, json={"file_path": file_path, "code": original_code})
+        second = await client.post(url, json={"file_path": file_path, "code": edited_code})
+
+    assert first.status_code == 200
+    assert second.status_code == 200
+
+    try:
+        first_response = IncrementalAnalysisResponse(**first.json())
+        second_response = IncrementalAnalysisResponse(**second.json())
+
+        assert first_response.success is True
+        assert first_response.analyzed_segments == 2
+        assert first_response.magic_numbers.data == {'magic_numbers': [{'magic_number': 3.14159, 'line_number': 3}]}
+
+        assert second_response.success is True
+        assert second_response.analyzed_segments == 1
+        assert second_response.reused_segments == 2
+        # Cached findings come back with their lines moved
+        assert second_response.magic_numbers.data == {'magic_numbers': [{'magic_number': 3.14159, 'line_number': 6}]}
+        assert second_response.long_parameter_list.data['long_parameter_list'][-1]['line_number'] == 8
+        assert second_response.overly_complex_condition.data['conditionals'][0]['line_range'] == [9, 10]
+
+    except ValidationError as e:
+        print(f"Response validation failed: {e}")
+        pytest.fail(f"Response validation failed: {e}")
+
+@pytest.mark.asyncio
+async def test_incremental_rejects_whole_file_detectors(original_code):
+    url = f"{BASE_URL}/analyze-incremental"
+    async with httpx.AsyncClient() as client:
+        response = await client.post(url, json={"file_path": "incremental/other.py", "code": original_code, "detectors": ["dead_code"]})
+
+    validated_response = IncrementalAnalysisResponse(**response.json())
+    assert validated_response.success is False
+    assert 'dead_code' in validated_response.error
+
+
+@pytest.mark.asyncio
+async def test_incremental_concurrent_edits_of_one_file(original_code, edited_code):
+    url = f"{BASE_URL}/analyze-incremental"
+    file_path = f"incremental/{uuid.uuid4()}.py"
+    async with httpx.AsyncClient() as client:
+        # Alternating versions replace each other's segments between requests
+        responses = await asyncio.gather(*(
+            client.post(url, json={"file_path": file_path, "code": edited_code if i % 2 else original_code})
+            for i in range(20)
+        ))
+
+    for i, response in enumerate(responses):
+        assert response.status_code == 200
+        validated_response = IncrementalAnalysisResponse(**response.json())
+        assert validated_response.success is True
+        line_number = 6 if i % 2 else 3
+        assert validated_response.magic_numbers.data == {'magic_numbers': [{'magic_number': 3.14159, 'line_number': line_number}]}
+
+
+@pytest.mark.asyncio
+async def test_incremental_line_separator_inside_string():
+    # U+2028 is not a line break for the tokenizer, so later lines keep their numbers
+    code = "label = 'a\u2028b'\n\ndef check(a, b, c, d):\n    if a > 1 and b > 2 or c > 3 and d > 4:\n        return a\n    return b\n"
+    async with httpx.AsyncClient() as client:
+        response = await client.post(f"{BASE_URL}/analyze-incremental",
+                                     json={"file_path": f"incremental/{uuid.uuid4()}.py", "code": code})
+
+    validated_response = IncrementalAnalysisResponse(**response.json())
+    assert validated_response.success is True
+    conditional = validated_response.overly_complex_condition.data['conditionals'][0]
+    assert conditional['line_range'] == [4, 5]
+    assert conditional['code_block'].startswith("    if a > 1")
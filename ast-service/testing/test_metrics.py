@@ -0,0 +1,53 @@
+import re
+import uuid
+import pytest
+from endpoints_url import BASE_URL
+import httpx
+from app.main import app
+
+
+@pytest.fixture
+def sample_code():
+    # Unique per run so the parse is not answered from the stored results
+    return f"""# {uuid.uuid4()}
+def area(radius):
+    unused = 1
+    return 3.14159 * radius * radius
+"""
+
+
+def metric_value(text, name, labels=''):
+    match = re.search(rf'^{re.escape(name + labels)} (\S+)$', text, re.M)
+    return float(match.group(1)) if match else 0.0
+
+
+@pytest.mark.asyncio
+async def test_metrics_count_detector_calls(sample_code):
+    async with httpx.AsyncClient() as client:
+        before = (await client.get(f"{BASE_URL}/metrics")).text
+        response = await client.post(f"{BASE_URL}/unused-variables", json={"code": sample_code})
+        after = await client.get(f"{BASE_URL}/metrics")
+
+    assert response.status_code == 200
+    assert after.status_code == 200
+    assert after.headers['content-type'].startswith('text/plain')
+
+    calls = 'detector_calls_total'
+    labels = '{detector="unused_variables",outcome="success"}'
+    assert metric_value(after.text, calls, labels) == metric_value(before, calls, labels) + 1
+    assert metric_value(after.text, 'ast_parse_duration_seconds_count') >= metric_value(before, 'ast_parse_duration_seconds_count') + 1
+    assert '# TYPE detector_duration_seconds histogram' in after.text
+    assert 'detector_duration_seconds_bucket{detector="unused_variables",le="+Inf"}' in after.text
+    assert 'http_request_duration_seconds_count{method="POST",route="/unused-variables",status="200"}' in after.text
+
+
+@pytest.mark.asyncio
+async def test_metrics_histogram_buckets_are_cumulative():
+    async with httpx.AsyncClient() as client:
+        await client.post(f"{BASE_URL}/magic-numbers", json={"code": "x = 42\n"})
+        text = (await client.get(f"{BASE_URL}/metrics")).text
+
+    buckets = [float(value) for value in re.findall(
+        r'^detector_duration_seconds_bucket\{detector="magic_numbers",le="[^"]+"\} (\S+)$', text, re.M)]
+    assert buckets == sorted(buckets)
+    assert buckets[-1] == metric_value(text, 'detector_duration_seconds_count', '{detector="magic_numbers"}')
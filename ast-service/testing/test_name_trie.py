@@ -0,0 +1,56 @@
+import pytest
+from app.utils.name_trie import DottedNameTrie
+
+
+@pytest.fixture
+def used_names():
+    return ['A.foo.bar', 'A.baz', 'helper', 'B..hidden', '.leading', 'trailing.']
+
+
+def test_stored_names(used_names):
+    trie = DottedNameTrie(used_names)
+    for name in used_names:
+        assert name in trie
+    assert 'A.foo' not in trie
+    assert 'A' not in trie
+
+
+def test_parent_of_stored_name_counts_as_used(used_names):
+    trie = DottedNameTrie(used_names)
+    assert trie.has_name_or_child('A.foo.bar')
+    assert trie.has_name_or_child('A.foo')
+    assert trie.has_name_or_child('A')
+    assert not trie.has_name_or_child('A.foo.bar.baz')
+
+
+def test_partial_component_does_not_match(used_names):
+    trie = DottedNameTrie(used_names)
+    assert 'A.fo' not in trie
+    assert not trie.has_name_or_child('A.fo')
+    assert not trie.has_name_or_child('help')
+
+
+def test_has_prefix_is_plain_startswith(used_names):
+    # Methods keep the str.startswith rule they had before the trie
+    trie = DottedNameTrie(used_names)
+    assert trie.has_prefix('A.fo')
+    assert not trie.has_prefix('A.fx')
+    assert not trie.has_prefix('C')
+
+
+def test_empty_components(used_names):
+    trie = DottedNameTrie(used_names)
+    assert trie.has_name_or_child('B.')
+    assert trie.has_name_or_child('')
+    assert 'trailing' not in trie
+    assert not trie.has_name_or_child('B.hidden')
+    assert not DottedNameTrie().has_prefix('')
+
+    candidates = ['', '.', 'A', 'A.', 'A..', 'A.f', 'A.foo', 'A.foo.', 'B', 'B.', 'B..', 'B..h',
+                  '.l', '.leading', 'trailing', 'trailing.', 'trailing..', 'h', 'x']
+    for candidate in candidates:
+        assert (candidate in trie) == (candidate in used_names), candidate
+        assert trie.has_name_or_child(candidate) == any(
+            name == candidate or name.startswith(candidate + '.') for name in used_names
+        ), candidate
+        assert trie.has_prefix(candidate) == any(name.startswith(candidate) for name in used_names), candidate
@@ -0,0 +1,42 @@
+import uuid
+import pytest
+from endpoints_url import BASE_URL
+import httpx
+from app.main import app
+
+
+@pytest.fixture
+def sample_code():
+    return f"""# {uuid.uuid4()}
+def total(values, factor, offset, scale):
+    return sum(values) * 1.5 + 1.5 * factor + 1.5
+"""
+
+
+@pytest.mark.asyncio
+async def test_repeated_request_reads_stored_result(sample_code):
+    async with httpx.AsyncClient() as client:
+        before = (await client.get(f"{BASE_URL}/result-store/stats")).json()
+        first = await client.post(f"{BASE_URL}/parameter-list", json={"code": sample_code})
+        second = await client.post(f"{BASE_URL}/parameter-list", json={"code": sample_code})
+        after = (await client.get(f"{BASE_URL}/result-store/stats")).json()
+
+    assert first.status_code == 200
+    assert first.json() == second.json()
+    assert first.json()['long_parameter_list'][0]['long_parameter'] is True
+    assert after['hits'] >= before['hits'] + 1
+    assert after['entries'] >= 1
+    assert after['used_bytes'] <= after['max_bytes']
+
+@pytest.mark.asyncio
+async def test_failed_result_is_not_stored():
+    broken_code = f"# {uuid.uuid4()}\ndef fun(:\n"
+    async with httpx.AsyncClient() as client:
+        first = await client.post(f"{BASE_URL}/magic-numbers", json={"code": broken_code})
+        before = (await client.get(f"{BASE_URL}/result-store/stats")).json()
+        second = await client.post(f"{BASE_URL}/magic-numbers", json={"code": broken_code})
+        after = (await client.get(f"{BASE_URL}/result-store/stats")).json()
+
+    assert first.json()['success'] is False
+    assert second.json()['success'] is False
+    assert after['hits'] == before['hits']
@@ -0,0 +1,78 @@
+import gzip
+import json
+import uuid
+import pytest
+from endpoints_url import BASE_URL
+import httpx
+
+
+@pytest.fixture
+def sample_code():
+    # Unique per run so the result is not answered from the stored results
+    return f"""# {uuid.uuid4()}
+def area(radius):
+    unused = 1
+    return 3.14159 * radius * radius
+"""
+
+
+@pytest.mark.asyncio
+async def test_gzip_json_body(sample_code):
+    code = sample_code + "\ndef circumference(radius):\n    return 2 * 3.14159 * radius\n\ndef half_turn():\n    return 3.14159\n"
+    body = gzip.compress(json.dumps({"code": code}).encode())
+    async with httpx.AsyncClient() as client:
+        response = await client.post(f"{BASE_URL}/magic-numbers", content=body, headers={
+            "Content-Type": "application/json",
+            "Content-Encoding": "gzip"
+        })
+
+    assert response.status_code == 200
+    assert response.json()["magic_numbers"] == [{"magic_number": 3.14159, "line_number": 4}]
+
+
+@pytest.mark.asyncio
+async def test_raw_python_body(sample_code):
+    async with httpx.AsyncClient() as client:
+        response = await client.post(f"{BASE_URL}/unused-variables", content=sample_code.encode(), headers={
+            "Content-Type": "text/x-python"
+        })
+
+    assert response.status_code == 200
+    assert [entry["variable_name"] for entry in response.json()["unused_variables"]] == ["unused"]
+
+
+@pytest.mark.asyncio
+async def test_gzip_raw_python_body_with_query_fields(sample_code):
+    async with httpx.AsyncClient() as client:
+        response = await client.post(
+            f"{BASE_URL}/dead-code",
+            params={"function_names": ["area"], "global_variables": []},
+            content=gzip.compress(sample_code.encode()),
+            headers={"Content-Type": "text/x-python", "Content-Encoding": "gzip"}
+        )
+
+    assert response.status_code == 200
+    assert response.json()["function_names"] == ["area"]
+
+
+@pytest.mark.asyncio
+async def test_invalid_gzip_body():
+    async with httpx.AsyncClient() as client:
+        response = await client.post(f"{BASE_URL}/magic-numbers", content=b"not gzip", headers={
+            "Content-Type": "application/json",
+            "Content-Encoding": "gzip"
+        })
+
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_large_response_is_gzipped(sample_code):
+    code = sample_code + "\n".join(f"def copy_{i}(data):\n    total = data + 1\n    return total * 2\n" for i in range(50))
+    async with httpx.AsyncClient() as client:
+        response = await client.post(f"{BASE_URL}/duplicated-code", json={"code": code},
+                                     headers={"Accept-Encoding": "gzip"})
+
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.json()["success"] is True
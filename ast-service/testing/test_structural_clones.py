@@ -0,0 +1,75 @@
+import pytest
+from endpoints_url import BASE_URL
+from pydantic import ValidationError
+import httpx
+from app.models.ast_models import StructuralCloneResponse
+
+@pytest.fixture
+def renamed_clone_code():
+    return """
+def total_price(items, tax):
+    result = 0
+    for item in items:
+        if item.price > 10:
+            result += item.price * tax
+    return result
+
+def sum_weights(boxes, factor):
+    acc = 0
+    for box in boxes:
+        if box.weight > 99:
+            acc += box.weight * factor
+    return acc
+
+print(total_price([], 2))
+"""
+
+@pytest.fixture
+def no_clone_code():
+    return """
+def total_price(items, tax):
+    result = 0
+    for item in items:
+        result += item.price * tax
+    return result
+
+def describe(box):
+    return f"{box.name}: {box.weight}"
+"""
+
+
+@pytest.mark.asyncio
+async def test_renamed_clone(renamed_clone_code):
+    url = f"{BASE_URL}/structural-clones"
+    async with httpx.AsyncClient() as client:
+        response = await client.post(url, json={"code": renamed_clone_code})
+
+    assert response.status_code == 200
+
+    try:
+        validated_response = StructuralCloneResponse(**response.json())
+
+        assert validated_response.success is True
+        assert validated_response.error is None
+        # Nested copies of the loop and condition are folded into the function clone
+        assert len(validated_response.structural_clones) == 1
+        clone_group = validated_response.structural_clones[0]
+        assert clone_group.node_type == 'FunctionDef'
+        assert clone_group.clone_count == 2
+        assert [(clone.start_line, clone.end_line) for clone in clone_group.clones] == [(2, 7), (9, 14)]
+
+    except ValidationError as e:
+        print(f"Response validation failed: {e}")
+        pytest.fail(f"Response validation failed: {e}")
+
+@pytest.mark.asyncio
+async def test_no_structural_clone(no_clone_code):
+    url = f"{BASE_URL}/structural-clones"
+    async with httpx.AsyncClient() as client:
+        response = await client.post(url, json={"code": no_clone_code})
+
+    assert response.status_code == 200
+
+    validated_response = StructuralCloneResponse(**response.json())
+    assert validated_response.success is True
+    assert validated_response.structural_clones == []
@@ -0,0 +1,120 @@
+import uuid
+import pytest
+from endpoints_url import BASE_URL
+from pydantic import ValidationError
+import httpx
+from app.main import app
+from app.models.ast_models import DeadCodeResponse
+from app.models.symbol_models import SymbolIndexResponse, SymbolUsageResponse
+
+
+@pytest.fixture
+def project_files():
+    return {
+        "app/handlers.py": """
+from utils.helpers import format_name
+
+def handle(user):
+    return format_name(user)
+""",
+        "app/cli.py": """
+import utils.helpers
+
+def run():
+    helper = utils.helpers.Helper()
+    print(helper.describe(), utils.helpers.DEFAULT_NAME)
+"""
+    }
+
+
+@pytest.fixture
+def helpers_code():
+    return """
+DEFAULT_NAME = "anonymous"
+UNUSED_NAME = "nobody"
+
+def format_name(user):
+    return user.title()
+
+def unused_helper():
+    return None
+
+class Helper:
+    def describe(self):
+        return "helper"
+
+    def forgotten(self):
+        return None
+"""
+
+
+@pytest.mark.asyncio
+async def test_symbol_index_usages(project_files):
+    project = f"symbol-test-{uuid.uuid4()}"
+    async with httpx.AsyncClient() as client:
+        response = await client.post(f"{BASE_URL}/symbol-index/files", json={"project": project, "files": project_files})
+        assert response.status_code == 200
+        validated_index = SymbolIndexResponse(**response.json())
+        assert validated_index.success is True
+        assert validated_index.indexed_files == 2
+
+        response = await client.post(f"{BASE_URL}/symbol-index/usages", json={"project": project, "name": "format_name"})
+
+    assert response.status_code == 200
+
+    try:
+        validated_response = SymbolUsageResponse(**response.json())
+
+        assert validated_response.success is True
+        assert [usage.file_path for usage in validated_response.usages] == ["app/handlers.py"]
+        assert validated_response.usages[0].count == 2
+
+    except ValidationError as e:
+        print(f"Response validation failed: {e}")
+        pytest.fail(f"Response validation failed: {e}")
+
+@pytest.mark.asyncio
+async def test_dead_code_across_project(project_files, helpers_code):
+    project = f"symbol-dead-code-test-{uuid.uuid4()}"
+    async with httpx.AsyncClient() as client:
+        await client.post(f"{BASE_URL}/symbol-index/files", json={"project": project, "files": project_files})
+
+        response = await client.post(f"{BASE_URL}/dead-code", json={
+            "code": helpers_code,
+            "function_names": ["format_name", "unused_helper"],
+            "global_variables": ["DEFAULT_NAME", "UNUSED_NAME"],
+            "project": project,
+            "file_path": "utils/helpers.py"
+        })
+
+    assert response.status_code == 200
+
+    try:
+        validated_response = DeadCodeResponse(**response.json())
+
+        assert validated_response.success is True
+        assert validated_response.function_names == ["unused_helper"]
+        assert validated_response.global_variables == ["UNUSED_NAME"]
+        assert validated_response.class_details[0]["has_instance"] is True
+        assert validated_response.class_details[0]["unutilized_functions"] == ["forgotten"]
+
+    except ValidationError as e:
+        print(f"Response validation failed: {e}")
+        pytest.fail(f"Response validation failed: {e}")
+
+@pytest.mark.asyncio
+async def test_symbol_index_remove(project_files):
+    project = f"symbol-remove-test-{uuid.uuid4()}"
+    async with httpx.AsyncClient() as client:
+        await client.post(f"{BASE_URL}/symbol-index/files", json={"project": project, "files": project_files})
+
+        response = await client.post(f"{BASE_URL}/symbol-index/remove", json={"project": project, "file_paths": ["app/handlers.py"]})
+        validated_index = SymbolIndexResponse(**response.json())
+        assert validated_index.success is True
+        assert validated_index.indexed_files == 1
+
+        response = await client.post(f"{BASE_URL}/symbol-index/usages", json={"project": project, "name": "format_name"})
+
+    validated_response = SymbolUsageResponse(**response.json())
+    assert validated_response.success is True
+    assert validated_response.usages == []
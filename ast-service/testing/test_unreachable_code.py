@@ -156,4 +156,85 @@ async def test_2_unreachable_code(sample_unreachable_code2, unreachable_code_res
     
     except ValidationError as e:
         print(f"Response validation failed: {e}")
-        pytest.fail(f"Response validation failed: {e}")
\ No newline at end of file
+        pytest.fail(f"Response validation failed: {e}")
+
+@pytest.fixture
+def sample_loop_unreachable_code():
+    return """
+def drain(queue):
+    for item in queue:
+        if item is None:
+            break
+            print("After break")
+    while True:
+        try:
+            queue.pop()
+        finally:
+            return queue
+    print("After the loop")
+"""
+
+
+@pytest.fixture
+def loop_unreachable_code_response():
+    return {
+        'unreachable_code': [
+                "Unreachable code at line 6",
+                "Unreachable code at line 12"
+        ],
+        'success': True,
+        'error': None
+    }
+
+
+@pytest.mark.asyncio
+async def test_loop_unreachable_code(sample_loop_unreachable_code, loop_unreachable_code_response):
+
+    url = f"{BASE_URL}/unreachable-code"
+    async with httpx.AsyncClient() as client:
+        response = await client.post(url, json={"code": sample_loop_unreachable_code})
+    assert response.status_code == 200
+
+    try:
+        response_data = response.json()
+        validated_response = UnreachableResponse(**response_data)
+
+        assert validated_response.success is True
+        assert validated_response.error is None
+
+        loop_unreachable_code_response = UnreachableResponse(**loop_unreachable_code_response)
+        assert validated_response == loop_unreachable_code_response
+
+    except ValidationError as e:
+        print(f"Response validation failed: {e}")
+        pytest.fail(f"Response validation failed: {e}")
+
+
+@pytest.mark.parametrize("code, expected", [
+    ("def f():\n    while True:\n        pass\n    else:\n        a = 1\n", ["Unreachable 'else' block at line 5"]),
+    ("def f(x):\n    if x:\n        a = 1\n    elif True:\n        a = 2\n    else:\n        a = 3\n        b = 4\n",
+     ["Unreachable 'else' block at line 7"]),
+    ("def f():\n    if False:\n        a = 1\n        b = 2\n    return 3\n", ["Unreachable 'if' block at line 2"]),
+    ("def f():\n    for x in []:\n        a = 1\n    return 3\n", ["Unreachable 'for' block at line 2"]),
+    ("def f(x):\n    return 1\n    if x:\n        a = 1\n    else:\n        b = 2\n", ["Unreachable 'if' block at line 3"]),
+])
+@pytest.mark.asyncio
+async def test_one_record_per_dead_block(code, expected):
+    async with httpx.AsyncClient() as client:
+        response = await client.post(f"{BASE_URL}/unreachable-code", json={"code": code})
+
+    assert response.status_code == 200
+    assert response.json()["unreachable_code"] == expected
+
+
+@pytest.mark.asyncio
+async def test_form_feed_does_not_share_cached_findings():
+    # A form feed does not end a line, so these functions differ in the cache
+    looping = "x = 1\x0c\ndef f():\n    while True:\n        pass\n    y = 2\n"
+    breaking = "x = 1\x0c\ndef f():\n    while True:\n        pass\n        break\n"
+    async with httpx.AsyncClient() as client:
+        first = await client.post(f"{BASE_URL}/unreachable-code", json={"code": looping})
+        second = await client.post(f"{BASE_URL}/unreachable-code", json={"code": breaking})
+
+    assert first.json()["unreachable_code"] == ["Unreachable code at line 5"]
+    assert second.json()["unreachable_code"] == []
@@ -159,3 +159,96 @@ async def test_dead_conditional(sample_dead_conditional, no_dead_variable_respon
 
     except ValidationError as e:
         pytest.fail(f"Response validation failed: {e}")
+
+
+@pytest.fixture
+def sample_same_name_in_two_functions():
+    return """
+def first():
+    total = 1
+    return total
+
+def second():
+    total = 2
+"""
+
+@pytest.fixture
+def sample_class_attributes():
+    return """
+class Config:
+    debug = False
+    level = 3
+
+    def show(self):
+        unused_local = 1
+        return self.level
+"""
+
+@pytest.fixture
+def sample_global_and_nonlocal():
+    return """
+counter = 0
+
+def bump():
+    global counter
+    counter += 1
+
+def outer():
+    step = 0
+    def inner():
+        nonlocal step
+        step += 1
+    inner()
+"""
+
+@pytest.fixture
+def sample_comprehension_variables():
+    return """
+def squares(values):
+    result = [v * v for v in values]
+    pairs = {k: 0 for k in values}
+    return result
+"""
+
+
+async def post_unused_variables(code):
+    url = f"{BASE_URL}/unused-variables"
+    async with httpx.AsyncClient() as client:
+        response = await client.post(url, json={"code": code})
+    assert response.status_code == 200
+
+    try:
+        validated_response = UnusedVariablesResponse(**response.json())
+    except ValidationError as e:
+        pytest.fail(f"Response validation failed: {e}")
+    assert validated_response.success is True
+    assert validated_response.error is None
+    return validated_response.unused_variables
+
+
+@pytest.mark.asyncio
+async def test_same_name_in_two_functions(sample_same_name_in_two_functions):
+    # The use in first() does not cover the separate variable in second()
+    unused = await post_unused_variables(sample_same_name_in_two_functions)
+    assert unused == [UnusedVariablesDetails(variable_name="total", line_number=7)]
+
+@pytest.mark.asyncio
+async def test_class_attributes(sample_class_attributes):
+    # An attribute read through self counts as a use; one never read does not
+    unused = await post_unused_variables(sample_class_attributes)
+    assert unused == [
+        UnusedVariablesDetails(variable_name="debug", line_number=3),
+        UnusedVariablesDetails(variable_name="unused_local", line_number=7),
+    ]
+
+@pytest.mark.asyncio
+async def test_global_and_nonlocal(sample_global_and_nonlocal):
+    # Augmented assignments through global/nonlocal read the outer variable
+    unused = await post_unused_variables(sample_global_and_nonlocal)
+    assert unused == []
+
+@pytest.mark.asyncio
+async def test_comprehension_variables(sample_comprehension_variables):
+    # Comprehension targets are used by their own element expression
+    unused = await post_unused_variables(sample_comprehension_variables)
+    assert unused == [UnusedVariablesDetails(variable_name="pairs", line_number=4)]
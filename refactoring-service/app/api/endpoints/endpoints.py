@@ -16,6 +16,7 @@ from app.service.refactor_service import (
     refactor_unused_variables,
     refactor_dead_code
 )
+from app.service.executor import run_refactor
 
 refactor_router = APIRouter()
 
@@ -23,7 +24,7 @@ refactor_router = APIRouter()
 
 @refactor_router.post("/unreachable-code", response_model=RefactorResponse)
 async def unreachable_code(request: UnreachableCodeRequest):
-    result = refactor_unreachable_code(request.unreachable_code_lines, request.code)
+    result = await run_refactor(refactor_unreachable_code, request.unreachable_code_lines, request.code)
     if result is None:
         raise HTTPException(status_code=400, detail="Invalid code")
     elif result.get('success') is False:
@@ -34,7 +35,7 @@ async def unreachable_code(request: UnreachableCodeRequest):
 @refactor_router.post("/magic-numbers", response_model=RefactorResponse)
 async def magic_numbers(request: MagicNumberRefactorRequest):
     
-    result = refactor_magic_numbers(request.code, request.magic_numbers)
+    result = await run_refactor(refactor_magic_numbers, request.code, request.magic_numbers)
     if result is None:
         raise HTTPException(status_code=400, detail="Invalid code")
     elif result.get('success') is False:
@@ -44,7 +45,7 @@ async def magic_numbers(request: MagicNumberRefactorRequest):
     
 @refactor_router.post("/unused-variables", response_model=RefactorResponse)
 async def unused_variables(request: UnusedVariablesRefactorRequest):
-    result = refactor_unused_variables(request.unused_variables, request.code)
+    result = await run_refactor(refactor_unused_variables, request.unused_variables, request.code)
     
     if result is None:
         raise HTTPException(status_code=400, detail="Invalid code")
@@ -56,7 +57,7 @@ async def unused_variables(request: UnusedVariablesRefactorRequest):
 
 @refactor_router.post("/naming-convention", response_model=RefactorResponse)
 async def naming_convention(request: InconsistentNamingRefactorRequest):
-    result = refactor_inconsistent_naming(request.code, request.target_convention, request.dependencies)
+    result = await run_refactor(refactor_inconsistent_naming, request.code, request.target_convention, request.dependencies)
   
     if result is None:
         raise HTTPException(status_code=400, detail="Invalid code")
@@ -66,7 +67,7 @@ async def naming_convention(request: InconsistentNamingRefactorRequest):
 
 @refactor_router.post("/dead-code", response_model=RefactorResponse)
 async def dead_code(request: DeadCodeRefactorRequest):
-    result = refactor_dead_code(request.entity_name, request.entity_type, request.code)
+    result = await run_refactor(refactor_dead_code, request.entity_name, request.entity_type, request.code)
     if result is None:
         raise HTTPException(status_code=400, detail="Invalid code")
     elif result.get('success') is False:
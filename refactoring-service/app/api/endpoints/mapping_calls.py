@@ -7,12 +7,14 @@ from app.refactoring_models.refactor_models import (
 from app.service.mapping_service import (
     apply_llm_patch
 )
+from app.service.executor import run_refactor
 
 calls_router = APIRouter()
 
 @calls_router.post("/long_parameter_list", response_model=MappingResponse)
 async def long_parameter(request: PartialMappingRequest):
-    result = apply_llm_patch(
+    result = await run_refactor(
+        apply_llm_patch,
         request.original_code,
         request.refactored_code,
         request.name
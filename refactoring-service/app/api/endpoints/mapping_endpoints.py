@@ -10,26 +10,27 @@ from app.service.mapping_service import (
     map_function,
     map_orginal_code
 )
+from app.service.executor import run_refactor
 
 mapping_router = APIRouter()
 
 @mapping_router.post("/god_object", response_model=MappingResponse)
 async def god_object(request: PartialMappingRequest):
-    result = map_class(request.original_code, request.name, request.refactored_code)
+    result = await run_refactor(map_class, request.original_code, request.name, request.refactored_code)
     if result.get('success') is False:
         raise HTTPException(status_code=400, detail=result.get('error'))
     return result
 
 @mapping_router.post("/long_function", response_model=MappingResponse)
 async def long_function(request: PartialMappingRequest):
-    result = map_function(request.original_code, request.name, request.refactored_code)
+    result = await run_refactor(map_function, request.original_code, request.name, request.refactored_code)
     if result.get('success') is False:
         raise HTTPException(status_code=400, detail=result.get('error'))
     return result
 
 @mapping_router.post("/temporary_field", response_model=MappingResponse)
 async def temporary_field(request: CompleteMappingRequest):
-    result = map_orginal_code(request.refactored_code)
+    result = await run_refactor(map_orginal_code, request.refactored_code)
     if result.get('success') is False:
         print("ERROR: ", result.get('error'))
         raise HTTPException(status_code=400, detail=result.get('error'))
@@ -37,21 +38,21 @@ async def temporary_field(request: CompleteMappingRequest):
 
 @mapping_router.post("/duplicate_code", response_model=MappingResponse)
 async def duplicate_code(request: CompleteMappingRequest):
-    result = map_orginal_code(request.refactored_code)
+    result = await run_refactor(map_orginal_code, request.refactored_code)
     if result.get('success') is False:
         raise HTTPException(status_code=400, detail=result.get('error'))
     return result
 
 @mapping_router.post("/conditionals", response_model=MappingResponse)
 async def conditionals(request: CompleteMappingRequest):
-    result = map_orginal_code(request.refactored_code)
+    result = await run_refactor(map_orginal_code, request.refactored_code)
     if result.get('success') is False:
         raise HTTPException(status_code=400, detail=result.get('error'))
     return result
 
 @mapping_router.post("/global_conflict", response_model=MappingResponse)
 async def global_conflict(request: CompleteMappingRequest):
-    result = map_orginal_code(request.refactored_code)
+    result = await run_refactor(map_orginal_code, request.refactored_code)
     if result.get('success') is False:
         raise HTTPException(status_code=400, detail=result.get('error'))
     return result
@@ -59,28 +60,28 @@ async def global_conflict(request: CompleteMappingRequest):
 
 @mapping_router.post("/feature_envy", response_model=MappingResponse)
 async def feature_envy(request: PartialMappingRequest):
-    result = map_function(request.original_code, request.name, request.refactored_code)
+    result = await run_refactor(map_function, request.original_code, request.name, request.refactored_code)
     if result.get('success') is False:
         raise HTTPException(status_code=400, detail=result.get('error'))
     return result
 
 @mapping_router.post("/switch_statement_abuser", response_model=MappingResponse)
 async def switch_statement(request: PartialMappingRequest):
-    result = map_function(request.original_code, request.name, request.refactored_code)
+    result = await run_refactor(map_function, request.original_code, request.name, request.refactored_code)
     if result.get('success') is False:
         raise HTTPException(status_code=400, detail=result.get('error'))
     return result
 
 @mapping_router.post("/excessive_flags", response_model=MappingResponse)
 async def excessive_flags(request: PartialMappingRequest):
-    result = map_function(request.original_code, request.name, request.refactored_code)
+    result = await run_refactor(map_function, request.original_code, request.name, request.refactored_code)
     if result.get('success') is False:
         raise HTTPException(status_code=400, detail=result.get('error'))
     return result
 
 @mapping_router.post("/long_parameter_list", response_model=MappingResponse)
 async def long_parameter(request: PartialMappingRequest):
-    result = map_function(request.original_code, request.name, request.refactored_code)
+    result = await run_refactor(map_function, request.original_code, request.name, request.refactored_code)
     if result.get('success') is False:
         raise HTTPException(status_code=400, detail=result.get('error'))
     return result
\ No newline at end of file
@@ -1,12 +1,32 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from app.api.endpoints import endpoints, task_forwarding, mapping_endpoints, mapping_calls
+from app.service.executor import refactor_executor
+from app.utils.metrics import registry, MetricsMiddleware
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Start the refactoring workers before taking traffic so no request pays for the spawn
+    await refactor_executor.start()
+    yield
+    refactor_executor.shutdown()
+
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(MetricsMiddleware)
 
 @app.get("/")
 def health_check():
     return {"status": "ok"}
 
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    # Prometheus text format, worker processes included
+    return PlainTextResponse(
+        registry.render(*refactor_executor.metric_snapshots()),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
 app.include_router(endpoints.refactor_router)
 app.include_router(task_forwarding.forwarding_router)
 app.include_router(mapping_endpoints.mapping_router, prefix="/mapping")
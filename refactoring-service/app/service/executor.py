@@ -0,0 +1,152 @@
+import asyncio
+import multiprocessing
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from app.service.settings import REFACTOR_WORKERS, REFACTOR_TASK_TIMEOUT, REFACTOR_MAX_QUEUED
+from app.utils.metrics import registry
+
+
+def _warm_up():
+    # Import the transformers once per worker instead of on its first task
+    import app.service.refactor_service  # noqa: F401
+    import app.service.mapping_service  # noqa: F401
+
+
+def _ping():
+    return True
+
+
+def _run_task(func, args):
+    return func(*args), registry.snapshot()
+
+
+class RefactorExecutor:
+    """
+    Runs CPU-bound refactoring functions in warm worker processes.
+
+    Each worker is its own single-process pool, so a task that overruns its
+    timeout can be stopped by replacing just that worker. Service functions
+    are expected to return the usual result dict; timeouts and crashed
+    workers are reported in the same shape.
+
+    Tasks wait their turn for a worker before their timeout starts; once
+    ``max_queued`` are waiting, further tasks are refused.
+    """
+
+    def __init__(self, workers: int = REFACTOR_WORKERS, timeout: float = REFACTOR_TASK_TIMEOUT, max_queued: int = REFACTOR_MAX_QUEUED):
+        self.workers = max(workers, 0)
+        self.timeout = timeout
+        self.max_queued = max_queued
+        self.pools = []
+        # Tasks running or waiting on each worker, and the lock a task holds while it runs
+        self.load = []
+        self.slots = []
+        self.retired = weakref.WeakSet()
+        # Latest metrics reported by each worker
+        self.worker_metrics = {}
+        # Metrics of workers that were replaced, so totals never go backwards
+        self.retired_metrics = {}
+
+    def _new_pool(self):
+        return ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_warm_up
+        )
+
+    def _ensure_pools(self):
+        if not self.pools:
+            self.pools = [self._new_pool() for _ in range(self.workers)]
+            self.load = [0] * self.workers
+            self.slots = [asyncio.Lock() for _ in range(self.workers)]
+
+    async def start(self):
+        if self.workers == 0:
+            return
+        self._ensure_pools()
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(pool, _ping) for pool in self.pools))
+
+    def shutdown(self):
+        for pool in self.pools:
+            pool.shutdown(wait=False, cancel_futures=True)
+        self.pools = []
+        self.load = []
+        self.slots = []
+
+    def _replace(self, idx, pool):
+        if idx >= len(self.pools) or self.pools[idx] is not pool:
+            return
+        self.pools[idx] = self._new_pool()
+        self.retired.add(pool)
+        metrics = self.worker_metrics.pop(idx, None)
+        if metrics is not None:
+            self.retired_metrics = registry.merge(self.retired_metrics, metrics)
+        # A stuck task cannot be cancelled, only its process stopped
+        for process in list((pool._processes or {}).values()):
+            process.terminate()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    async def run(self, func, *args, timeout: float = None):
+        if self.workers == 0:
+            return func(*args)
+
+        self._ensure_pools()
+        if sum(self.load) >= self.workers + self.max_queued:
+            return {
+                'success': False,
+                'error': "Refactoring queue is full; try again later"
+            }
+        timeout = timeout or self.timeout
+        loop = asyncio.get_running_loop()
+        # shutdown() swaps these lists out; keep counting on the ones we started with
+        load, slots = self.load, self.slots
+        for _ in range(2):
+            idx = min(range(self.workers), key=load.__getitem__)
+            load[idx] += 1
+            try:
+                # Wait for the worker out here, so the timeout only counts this
+                # task's own run and never the tasks queued ahead of it
+                async with slots[idx]:
+                    if self.slots is not slots:
+                        break
+                    pool = self.pools[idx]
+                    result, metrics = await asyncio.wait_for(
+                        loop.run_in_executor(pool, _run_task, func, args),
+                        timeout
+                    )
+                self.worker_metrics[idx] = metrics
+                return result
+            except asyncio.TimeoutError:
+                self._replace(idx, pool)
+                return {
+                    'success': False,
+                    'error': f"Refactoring timed out after {timeout:g}s"
+                }
+            except BrokenProcessPool:
+                if pool in self.retired:
+                    # Submitted just before its worker was replaced; try once more
+                    continue
+                self._replace(idx, pool)
+                return {
+                    'success': False,
+                    'error': "Refactoring worker stopped unexpectedly"
+                }
+            finally:
+                load[idx] -= 1
+        return {
+            'success': False,
+            'error': "Refactoring worker stopped unexpectedly"
+        }
+
+    def metric_snapshots(self) -> list:
+        # Rendered on top of this process's own metrics
+        return list(self.worker_metrics.values()) + [self.retired_metrics]
+
+
+refactor_executor = RefactorExecutor()
+
+
+async def run_refactor(func, *args, timeout: float = None):
+    return await refactor_executor.run(func, *args, timeout=timeout)
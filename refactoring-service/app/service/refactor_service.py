@@ -3,8 +3,10 @@ from app.utils.Analysis.magic_number_refactor import magic_numbers_refactor
 from app.utils.Analysis.unreachable_code_refactor import unreachable_code_refactor
 from app.utils.Analysis.unused_variables_refactor import unused_variables_refactor
 from app.utils.Analysis.dead_code_refactor import dead_code_refactor
+from app.utils.metrics import instrumented
 
 
+@instrumented('inconsistent_naming')
 def refactor_inconsistent_naming(code, target_convention="", dependencies=None):
     try: 
         code,dependencies = inconsistent_naming_refactor(code, target_convention, dependencies)
@@ -19,6 +21,7 @@ def refactor_inconsistent_naming(code, target_convention="", dependencies=None):
             "error": str(e)
         }
 
+@instrumented('magic_numbers')
 def refactor_magic_numbers(code, magic_numbers):
     try:
         return {
@@ -31,6 +34,7 @@ def refactor_magic_numbers(code, magic_numbers):
             "error": str(e)
         }
 
+@instrumented('unreachable_code', code_arg=1)
 def refactor_unreachable_code(unreachable, code):
     try:
         return {
@@ -43,6 +47,7 @@ def refactor_unreachable_code(unreachable, code):
             "error": str(e)
         }
 
+@instrumented('unused_variables', code_arg=1)
 def refactor_unused_variables(unused_variables, code):
     try:
         return {
@@ -55,6 +60,7 @@ def refactor_unused_variables(unused_variables, code):
             "error": str(e)
         }
         
+@instrumented('dead_code', code_arg=2)
 def refactor_dead_code(entity_name, entity_type, code):
     try:
         return {
@@ -0,0 +1,8 @@
+import os
+
+# Worker processes for CPU-bound refactoring; 0 runs everything on the event loop
+REFACTOR_WORKERS = int(os.getenv('REFACTOR_WORKERS', os.cpu_count() or 1))
+# Seconds a single refactoring task may run before its worker is replaced
+REFACTOR_TASK_TIMEOUT = float(os.getenv('REFACTOR_TASK_TIMEOUT', 60))
+# Tasks that may wait for a busy worker; further tasks are refused rather than queued
+REFACTOR_MAX_QUEUED = int(os.getenv('REFACTOR_MAX_QUEUED', 256))
@@ -0,0 +1,33 @@
+import re
+import pytest
+from endpoints_url import REFACTOR_SERVICE_URL
+import httpx
+
+
+def metric_value(text, name, labels=''):
+    match = re.search(rf'^{re.escape(name + labels)} (\S+)$', text, re.M)
+    return float(match.group(1)) if match else 0.0
+
+
+@pytest.mark.asyncio
+async def test_metrics_count_transformer_calls():
+    """Test that a refactoring call shows up in the Prometheus metrics."""
+    async with httpx.AsyncClient() as client:
+        before = (await client.get(f"{REFACTOR_SERVICE_URL}/metrics")).text
+        response = await client.post(f"{REFACTOR_SERVICE_URL}/magic-numbers", json={
+            "code": "def area(radius):\n    return 3.14159 * radius * radius\n",
+            "magic_numbers": [
+                {"magic_number": 3.14159, "line_number": 2}
+            ]
+        })
+        after = await client.get(f"{REFACTOR_SERVICE_URL}/metrics")
+
+    assert response.status_code == 200
+    assert after.status_code == 200
+    assert after.headers['content-type'].startswith('text/plain')
+
+    labels = '{transformer="magic_numbers",outcome="success"}'
+    assert metric_value(after.text, 'transformer_calls_total', labels) == metric_value(before, 'transformer_calls_total', labels) + 1
+    assert '# TYPE transformer_duration_seconds histogram' in after.text
+    assert 'transformer_output_size_characters_count{transformer="magic_numbers"}' in after.text
+    assert 'http_request_duration_seconds_count{method="POST",route="/magic-numbers",status="200"}' in after.text
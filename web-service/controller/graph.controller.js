@@ -39,6 +39,40 @@ const graphController = {
     }
   },
 
+  // Merge changed nodes into the stored graph and drop removed files, leaving the rest as stored
+  patchGraph: async (req, res) => {
+    try {
+      const { projectTitle, graphData = {}, removed = [] } = req.body;
+
+      if (!projectTitle) {
+        return res.status(400).json({ status: "error", message: 'Project title is required' });
+      }
+
+      let project = await Project.findOne({ title: projectTitle });
+      if (!project) {
+        project = await Project.create({ title: projectTitle });
+      }
+      let existingGraph = await Graph.findOne({ projectId: project._id });
+      if (!existingGraph) {
+        await Graph.create({ graphData: graphData, projectId: project._id });
+        return res.status(201).json({ status: "success", message: 'Graph created successfully'});
+      }
+
+      const merged = { ...(existingGraph.graphData || {}) };
+      for (const fileName of removed) {
+        delete merged[fileName];
+      }
+      Object.assign(merged, graphData);
+      existingGraph.graphData = merged;
+      existingGraph.markModified('graphData');
+      await existingGraph.save();
+      res.status(201).json({ status: "success", message: 'Graph updated successfully'});
+    } catch (error) {
+      console.log(error);
+      return res.status(500).json({ status: "error", message: 'Internal server error', error: error.message });
+    }
+  },
+
   // Fetch the dependency graphData for a project using the project title as a parameter
   getGraph: async (req, res) => {
     try {
@@ -129,19 +129,21 @@ projectFileDataSchema.statics.updateFileData = async function(projectId, fileDat
       }
       
       if (file.ast !== undefined) {
-        if (typeof file.ast !== 'string') {
+        // /analyze-ast returns the tree as a JSON object; it is stored as a string
+        const ast = file.ast !== null && typeof file.ast === 'object' ? JSON.stringify(file.ast) : file.ast;
+        if (typeof ast !== 'string') {
           throw new Error(`Invalid AST format for file: ${fileName}`);
         }
         
         // Validate AST is valid JSON if provided
-        if (file.ast.trim()) {
+        if (ast.trim()) {
           try {
-            JSON.parse(file.ast);
+            JSON.parse(ast);
           } catch (astError) {
             console.warn(`Invalid AST JSON for file ${fileName}, storing as-is:`, astError.message);
           }
         }
-        filteredFile.ast = file.ast;
+        filteredFile.ast = ast;
       }
 
       if (file.language !== undefined) {
@@ -4,6 +4,7 @@ const { vscodeAuth } = require('../middleware/auth.middleware');
 const router = express.Router();
 
 router.post('/add-or-update', graphController.createOrUpdateGraph);
+router.post('/patch', graphController.patchGraph);
 router.get('/get/:projectId', graphController.getGraph);
 router.delete('/delete/:projectId', graphController.deleteGraph);
 